@@ -0,0 +1,49 @@
+"""Compares the runtime of mesarcade's force_layout with networkx's spring_layout.
+
+Usage:
+    python benchmarks/layout_benchmark.py [--sizes 1000 10000 100000] [--max-spring-nodes 20000]
+"""
+
+import argparse
+import time
+
+import networkx as nx
+
+import mesarcade as mesar
+
+
+def time_layout(layout, graph):
+    start = time.perf_counter()
+    layout(graph, seed=42)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--avg-degree", type=float, default=3)
+    parser.add_argument(
+        "--max-spring-nodes",
+        type=int,
+        default=20_000,
+        help="Skip spring_layout for larger graphs, as it gets very slow.",
+    )
+    args = parser.parse_args()
+
+    print(f"{'nodes':>10} {'edges':>10} {'force_layout':>14} {'spring_layout':>14}")
+    for num_nodes in args.sizes:
+        graph = nx.fast_gnp_random_graph(num_nodes, args.avg_degree / num_nodes, seed=42)
+
+        force_time = time_layout(mesar.force_layout, graph)
+        if num_nodes <= args.max_spring_nodes:
+            spring_time = f"{time_layout(nx.spring_layout, graph):13.2f}s"
+        else:
+            spring_time = f"{'skipped':>14}"
+
+        print(
+            f"{num_nodes:>10} {graph.number_of_edges():>10} {force_time:13.2f}s {spring_time}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -17,6 +17,9 @@ from .artist import (
 from .history_plot import ModelHistoryPlot
 from .space_plot import GridSpacePlot, ContinuousSpacePlot, NetworkPlot
 from .value_display import ValueDisplay
+from .utils import get_attribute_array
+from .layout import force_layout
+from .recorder import FrameRecorder
 
 __all__ = [
     "Canvas",
@@ -32,4 +35,7 @@ __all__ = [
     "NetworkCellArtists",
     "NetworkAgentArtists",
     "NetworkPlot",
+    "get_attribute_array",
+    "force_layout",
+    "FrameRecorder",
 ]
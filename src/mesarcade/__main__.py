@@ -0,0 +1,123 @@
+"""Command line interface of mesarcade.
+
+Runs the canvases of an unchanged visualization script as batch jobs without
+an event loop, e.g.:
+
+    python -m mesarcade run examples/schelling.py --steps 10000 --headless
+"""
+
+from __future__ import annotations
+
+import argparse
+import ast
+import os
+import runpy
+import subprocess
+import sys
+
+
+def parse_param(text: str) -> tuple[str, object]:
+    name, separator, value = text.partition("=")
+    if not separator:
+        raise argparse.ArgumentTypeError(f"Expected NAME=VALUE, got {text!r}.")
+    try:
+        return name, ast.literal_eval(value)
+    except (ValueError, SyntaxError):
+        # anything that is not a python literal is a string
+        return name, value
+
+
+def get_headless_error() -> str | None:
+    """Returns why arcade cannot be imported in headless mode, or None if it can.
+
+    On Linux, arcade.gui imports pyglet.input, which requires the X11 window module
+    that pyglet does not load in headless mode, e.g. in pyglet 2.1.19.
+    """
+    result = subprocess.run(
+        [sys.executable, "-c", "import arcade.gui"],
+        env={**os.environ, "ARCADE_HEADLESS": "1"},
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode == 0:
+        return None
+    lines = result.stderr.strip().splitlines()
+    return lines[-1] if lines else f"exit code {result.returncode}"
+
+
+def main(argv: list[str] | None = None) -> None:
+    argv = sys.argv[1:] if argv is None else argv
+
+    parser = argparse.ArgumentParser(prog="python -m mesarcade")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    run_parser = subparsers.add_parser(
+        "run", help="Run the canvases of a script without an event loop."
+    )
+    run_parser.add_argument("script", help="Script that creates and shows a Canvas.")
+    run_parser.add_argument("--steps", type=int, required=True, help="Number of model steps.")
+    run_parser.add_argument(
+        "--render-every",
+        type=int,
+        default=None,
+        help="Steps between offscreen renderings. By default, nothing is rendered.",
+    )
+    run_parser.add_argument(
+        "--param",
+        type=parse_param,
+        action="append",
+        default=[],
+        metavar="NAME=VALUE",
+        help="Model parameter that overrides the script, can be repeated.",
+    )
+    run_parser.add_argument(
+        "--export-dir",
+        default=None,
+        help="Directory in which the history of every ModelHistoryPlot is saved as .npz file.",
+    )
+    run_parser.add_argument("--headless", action="store_true", help="Run without a display.")
+    args = parser.parse_args(argv)
+
+    if args.headless and os.environ.get("ARCADE_HEADLESS") != "1":
+        # fail with a clear message instead of an import error in the fresh interpreter
+        error = get_headless_error()
+        if error is not None:
+            parser.error(f"arcade cannot run headless with the installed pyglet: {error}")
+
+        # arcade has already been imported with this package, so the headless
+        # mode requires a fresh interpreter
+        os.environ["ARCADE_HEADLESS"] = "1"
+        os.execv(sys.executable, [sys.executable, "-m", "mesarcade", *argv])
+
+    from mesarcade.canvas import batch_mode
+    from mesarcade.history_plot import ModelHistoryPlot
+
+    sys.argv = [args.script]
+    with batch_mode(
+        steps=args.steps,
+        render_every=args.render_every,
+        params=dict(args.param) or None,
+    ) as runs:
+        runpy.run_path(args.script, run_name="__main__")
+
+    if not runs:
+        parser.error(f"{args.script} did not show a Canvas.")
+
+    if args.export_dir is not None:
+        os.makedirs(args.export_dir, exist_ok=True)
+
+    for i, (canvas, seconds) in enumerate(runs):
+        steps_per_second = args.steps / seconds if seconds > 0 else float("inf")
+        print(f"canvas {i}: {args.steps} steps in {seconds:.2f} s ({steps_per_second:.1f}/s)")
+
+        if args.export_dir is not None:
+            for j, figure in enumerate(canvas.renderer.figures):
+                if isinstance(figure, ModelHistoryPlot):
+                    path = os.path.join(args.export_dir, f"canvas_{i}_plot_{j}.npz")
+                    figure.export_history(path)
+                    print(f"saved {path}")
+
+        canvas.window.close()
+
+
+if __name__ == "__main__":
+    main()
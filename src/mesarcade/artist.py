@@ -1,26 +1,34 @@
 from __future__ import annotations
 
 import math
+import os
 from typing import TYPE_CHECKING, Any, Callable, Literal
 
 import arcade
-import matplotlib
-import matplotlib.colors
 import networkx as nx
+import numpy as np
 
-from mesarcade.utils import parse_color
+from mesarcade.colormap import ColorMap
+from mesarcade.gpu import InstancedShapeList, RasterImage, TriangleBatch, create_line_quads
+from mesarcade.layout import get_layout, start_layout_job
+from mesarcade.utils import get_attribute_getter, parse_color
 
 if TYPE_CHECKING:
     import mesa
 
+    from mesarcade.population import PopulationChanges
+
 # Type alias for color values
 Color = str | tuple[int, int, int] | tuple[int, int, int, int] | list[int] | None
 
 
 class Artist:
+    # backends that can be passed as `backend`
+    supported_backends = ("sprites", "arrays")
+
     def __init__(
         self,
-        get_xy_position: Callable[[Any], tuple[float, float]],
+        get_xy_position: str | Callable[[Any], tuple[float, float]],
         color: Color = "black",
         color_attribute: str | Callable[[Any], Any] | None = None,
         color_map: str | dict[Any, Color] | None = "bwr",
@@ -28,12 +36,13 @@ class Artist:
         color_vmax: float | None = None,
         shape: Literal["rect", "circle"] = "rect",
         size: float = 1,
-        filter_entities: Callable[[Any], bool] = lambda entity: True,
+        filter_entities: Callable[[Any], bool] | None = None,
         jitter: bool = False,
         dynamic_color: bool = True,
         dynamic_position: bool = True,
         dynamic_population: bool = True,
         get_population: Callable[[mesa.Model], Any] = lambda model: None,
+        backend: Literal["sprites", "arrays"] = "sprites",
     ) -> None:
         self.color = parse_color(color=color)
         self.color_attribute = color_attribute
@@ -48,12 +57,23 @@ class Artist:
         self.jitter = jitter
         self.size = size
         self.get_population = get_population
-        self.get_xy_position = get_xy_position
+        self.backend = backend
+
+        if self.backend not in self.supported_backends:
+            raise ValueError(f"`backend` must be one of {self.supported_backends}.")
+
+        # attribute names are resolved once into fast attrgetters
+        self.get_xy_position = get_attribute_getter(get_xy_position)
+        if self.color_attribute is not None:
+            self.get_color_key = get_attribute_getter(self.color_attribute)
 
         self.assert_correct_color_input()
         if self.color_attribute is not None:
-            self.color_dict = {}
-            self.fill_color_dict()
+            self.colormap = ColorMap(
+                color_map=self.color_map,
+                vmin=self.color_vmin,
+                vmax=self.color_vmax,
+            )
 
     def set_size(self):
         self.width = self.figure.cell_width * self.size
@@ -65,10 +85,25 @@ class Artist:
         self.model = self.renderer.model
         self.population = self.get_population(self.renderer.model)
 
+        # without a filter, births and deaths of agents can be received as events,
+        # as long as mesa itself keeps the population in step with the model
+        self.population_changes: PopulationChanges | None = None
+        if (
+            self.dynamic_population
+            and self.filter_entities is None
+            and self.renderer.population_tracker.tracks(self.population)
+        ):
+            self.population_changes = self.renderer.population_tracker.subscribe()
+
         self.setup2()
 
         self.set_size()
-        self.setup_sprites()
+        if self.backend == "arrays":
+            self.setup_arrays()
+        elif self.backend == "raster":
+            self.setup_raster()
+        else:
+            self.setup_sprites()
 
     def scale_x(self, x):
         pass
@@ -80,23 +115,9 @@ class Artist:
         pass
 
     def draw(self):
+        # either an arcade.SpriteList or an InstancedShapeList
         self.sprite_list.draw()
 
-    def fill_color_dict(self):
-        if isinstance(self.color_map, str):
-            norm = matplotlib.colors.Normalize(vmin=self.color_vmin, vmax=self.color_vmax)
-            cmap = matplotlib.colormaps[self.color_map]
-            for color_value in range(self.color_vmin - 100, self.color_vmax + 101):
-                rgb = tuple(int(255 * c) for c in cmap(norm(color_value))[0:3])
-                self.color_dict[color_value] = rgb
-
-        elif isinstance(self.color_map, dict):
-            self.color_dict = {
-                key: parse_color(color=color) for key, color in self.color_map.items()
-            }
-        else:
-            raise ValueError("`color_map` must be a str or a dict.")
-
     def assert_correct_color_input(self):
         if self.color_attribute is None:
             assert self.color is not None
@@ -117,17 +138,49 @@ class Artist:
         sprite.center_x = x
         sprite.center_y = y
 
+        # remember the unscaled position to detect changes later on
+        sprite.mesar_xy_position = (xy_position[0], xy_position[1])
+
     def set_sprite_color(self, entity, sprite):
         if self.color_attribute is None:
             sprite.color = self.color
         else:
-            # get color attribute value with getattr()
-            if isinstance(self.color_attribute, str):
-                color_attribute_value = getattr(entity, self.color_attribute)
-            # get it with a lambda
-            else:
-                color_attribute_value = self.color_attribute(entity)
-            sprite.color = self.color_dict[color_attribute_value]
+            color_key = self.get_color_key(entity)
+            sprite.color = self.colormap(color_key)
+
+            # remember the color key to detect changes later on
+            sprite.mesar_color_key = color_key
+
+    def update_sprite_color(self, entity, sprite) -> bool:
+        """Updates the color of a sprite if the color key of its entity has changed.
+
+        Returns:
+            True if the sprite was touched, False otherwise.
+        """
+        # a fixed color never changes
+        if self.color_attribute is None:
+            return False
+
+        color_key = self.get_color_key(entity)
+        if color_key == sprite.mesar_color_key:
+            return False
+
+        sprite.color = self.colormap(color_key)
+        sprite.mesar_color_key = color_key
+        return True
+
+    def update_sprite_position(self, entity, sprite) -> bool:
+        """Updates the position of a sprite if the position of its entity has changed.
+
+        Returns:
+            True if the sprite was touched, False otherwise.
+        """
+        xy_position = self.get_xy_position(entity)
+        if (xy_position[0], xy_position[1]) == sprite.mesar_xy_position:
+            return False
+
+        self.set_sprite_position(xy_position=xy_position, sprite=sprite)
+        return True
 
     def add_sprite(self, entity):
         sprite = self.create_sprite(entity=entity)
@@ -140,6 +193,7 @@ class Artist:
         self.sprite_dict = {}
         for entity in self.selected_entities:
             self.add_sprite(entity=entity)
+        self.num_updated_sprites = len(self.sprite_dict)
 
     def create_sprite(self, entity):
         if self.shape == "rect":
@@ -165,56 +219,203 @@ class Artist:
         return sprite
 
     def select_entities(self) -> list:
+        if self.filter_entities is None:
+            return list(self.population)
         return [entity for entity in self.population if self.filter_entities(entity)]
 
+    def get_population_changes(self, entities_with_sprite) -> tuple:
+        """Returns the entities that need a new sprite and those whose sprite can be removed.
+
+        If the agents are tracked by events, the work is proportional to the number
+        of births and deaths. Otherwise the whole population is compared with the
+        entities that already have a sprite.
+        """
+        if self.population_changes is not None:
+            # fast path: nothing has happened since the last update
+            if not self.population_changes:
+                return [], []
+
+            added, removed = self.population_changes.pop()
+            add_list = [
+                entity
+                for entity in added
+                if entity in self.population and entity not in entities_with_sprite
+            ]
+            remove_list = [entity for entity in removed if entity in entities_with_sprite]
+            return add_list, remove_list
+
+        # get all relevant entities
+        self.selected_entities = self.select_entities()
+        updated_entities = set(self.selected_entities)
+
+        # get all entities that were added previously
+        entities_with_sprite = set(entities_with_sprite)
+
+        # entities which need a sprite and entities whose sprites can be removed
+        return updated_entities - entities_with_sprite, entities_with_sprite - updated_entities
+
+    def sample(self):
+        # artists only read the model when the figure is updated
+        pass
+
+    def poll(self):
+        pass
+
     def update(self):
-        # TODO: use dirty_color and dirty_position to update only specific entity sprites
+        if self.backend == "arrays":
+            self.update_arrays()
+            return
+
+        if self.backend == "raster":
+            self.update_raster()
+            return
+
+        # number of sprites that had to be touched during this update
+        self.num_updated_sprites = 0
 
         # if the set of entities is not fixed during the simulation
         if self.dynamic_population:
-            # get all relevant entities
-            self.selected_entities = self.select_entities()
-            updated_entities = set(self.selected_entities)
+            add_list, remove_list = self.get_population_changes(self.sprite_dict)
 
-            # get all entities that were added previously
-            entities_with_sprite = set(self.sprite_dict)
+            # remove the sprites of those entities
+            for entity in remove_list:
+                sprite = self.sprite_dict.pop(entity)
+                self.sprite_list.remove(sprite)
 
-            # get all entities which need a sprite
-            add_list = updated_entities - entities_with_sprite
+            # update the sprites of the remaining entities
+            self.update_sprites()
 
-            # add sprites for those entities
+            # add sprites for the new entities (they are up to date already)
             for entity in add_list:
                 self.add_sprite(entity=entity)
+            self.num_updated_sprites += len(add_list)
 
-            # get all entities whose sprites can be removed
-            remove_list = entities_with_sprite - updated_entities
+        else:
+            self.update_sprites()
 
-            # remove the sprites of those entities
-            for entity in remove_list:
-                sprite = self.sprite_dict.pop(entity)
-                self.sprite_list.remove(sprite)
+    def update_sprites(self):
+        """Touches only those sprites whose color key or position has changed."""
 
         # if both colors and positions change during the simulation
         if self.dynamic_color and self.dynamic_position:
             for entity, sprite in self.sprite_dict.items():
-                self.set_sprite_color(entity=entity, sprite=sprite)
-                self.set_sprite_position(
-                    xy_position=self.get_xy_position(entity),
-                    sprite=sprite,
-                )
+                color_updated = self.update_sprite_color(entity=entity, sprite=sprite)
+                position_updated = self.update_sprite_position(entity=entity, sprite=sprite)
+                if color_updated or position_updated:
+                    self.num_updated_sprites += 1
 
         # if only the colors can change
         elif self.dynamic_color:
             for entity, sprite in self.sprite_dict.items():
-                self.set_sprite_color(entity=entity, sprite=sprite)
+                if self.update_sprite_color(entity=entity, sprite=sprite):
+                    self.num_updated_sprites += 1
 
         # if only the positions can change
         elif self.dynamic_position:
             for entity, sprite in self.sprite_dict.items():
-                self.set_sprite_position(
-                    xy_position=self.get_xy_position(entity),
-                    sprite=sprite,
+                if self.update_sprite_position(entity=entity, sprite=sprite):
+                    self.num_updated_sprites += 1
+
+    def refresh_positions(self):
+        """Moves all sprites to the current positions of their entities.
+
+        Used if positions have changed independently of the `dynamic_position` setting.
+        """
+        if self.backend == "arrays":
+            self.sprite_list.update_positions(self.get_scaled_positions(self.entity_list))
+        else:
+            for entity, sprite in self.sprite_dict.items():
+                self.update_sprite_position(entity=entity, sprite=sprite)
+
+    def get_rgba_colors(self, entities) -> np.ndarray:
+        """Returns the RGBA colors of the given entities as an (n, 4) array."""
+        if self.color_attribute is None:
+            return np.tile(np.array(self.color, dtype=np.uint8), (len(entities), 1))
+
+        return self.colormap.map(list(map(self.get_color_key, entities)))
+
+    def get_scaled_positions(self, entities) -> np.ndarray:
+        """Returns the scaled positions of the given entities as an (n, 2) array."""
+        xy_positions = list(map(self.get_xy_position, entities))
+        xy_positions = np.array(xy_positions, dtype=np.float64).reshape(-1, 2)
+        return np.column_stack(
+            (self.scale_x(xy_positions[:, 0]), self.scale_y(xy_positions[:, 1]))
+        )
+
+    def setup_arrays(self):
+        self.selected_entities = self.select_entities()
+        self.sprite_list = InstancedShapeList(
+            shape=self.shape,
+            width=max(1, self.width),
+            height=max(1, self.height),
+        )
+
+        # row of the arrays -> entity and vice versa
+        self.entity_list = []
+        self.entity_index = {}
+
+        self.add_instances(entities=self.selected_entities)
+        self.num_updated_sprites = len(self.entity_list)
+
+    def add_instances(self, entities):
+        entities = list(entities)
+
+        offsets = None
+        if self.jitter:
+            offsets = [
+                (
+                    (self.model.random.random() - 0.5) * self.figure.cell_width,
+                    (self.model.random.random() - 0.5) * self.figure.cell_height,
                 )
+                for _ in entities
+            ]
+
+        for entity in entities:
+            self.entity_index[entity] = len(self.entity_list)
+            self.entity_list.append(entity)
+
+        self.sprite_list.extend(
+            positions=self.get_scaled_positions(entities),
+            colors=self.get_rgba_colors(entities),
+            offsets=offsets,
+        )
+
+    def remove_instance(self, entity):
+        # the last row is moved into the gap of the removed row
+        row = self.entity_index.pop(entity)
+        last_entity = self.entity_list.pop()
+        if last_entity is not entity:
+            self.entity_list[row] = last_entity
+            self.entity_index[last_entity] = row
+        self.sprite_list.remove(row)
+
+    def update_arrays(self):
+        """Array-backed counterpart of the sprite update."""
+        add_list = []
+
+        # if the set of entities is not fixed during the simulation
+        if self.dynamic_population:
+            add_list, remove_list = self.get_population_changes(self.entity_index)
+            for entity in remove_list:
+                self.remove_instance(entity=entity)
+
+        # compare the new values with the stored ones for all rows at once
+        changed = np.zeros(len(self.entity_list), dtype=bool)
+
+        if self.dynamic_color and self.color_attribute is not None:
+            changed |= self.sprite_list.update_colors(self.get_rgba_colors(self.entity_list))
+
+        if self.dynamic_position:
+            changed |= self.sprite_list.update_positions(
+                self.get_scaled_positions(self.entity_list)
+            )
+
+        self.num_updated_sprites = int(np.count_nonzero(changed))
+
+        # add the new entities (they are up to date already)
+        if add_list:
+            self.add_instances(entities=add_list)
+            self.num_updated_sprites += len(add_list)
 
 
 class CellAgentArtists(Artist):
@@ -231,13 +432,17 @@ class CellAgentArtists(Artist):
         color_vmax: Maximum value for colormap normalization.
         shape: Entity shape, either "rect" or "circle".
         size: Size multiplier relative to cell size. Defaults to 1.
-        filter_entities: Callable to filter which agents are displayed.
+        filter_entities: Optional callable to filter which agents are displayed.
         jitter: If True, adds random offset to prevent overlap.
         dynamic_color: If True, updates colors each frame.
         dynamic_position: If True, updates positions each frame.
         dynamic_population: If True, handles agents being added/removed.
         get_population: Callable returning the agent collection from model.
-        get_xy_position: Callable returning (x, y) position for an agent.
+        get_xy_position: Attribute name (dotted paths are allowed) or callable
+            returning the (x, y) position of an agent.
+        backend: "sprites" creates one arcade sprite per agent. "arrays" keeps
+            all agents in numpy arrays that are drawn with a single instanced
+            draw call, which scales to much larger populations.
     """
 
     def __init__(
@@ -249,15 +454,14 @@ class CellAgentArtists(Artist):
         color_vmax: float | None = None,
         shape: Literal["rect", "circle"] = "circle",
         size: float = 1,
-        filter_entities: Callable[[Any], bool] = lambda entity: True,
+        filter_entities: Callable[[Any], bool] | None = None,
         jitter: bool = False,
         dynamic_color: bool = True,
         dynamic_position: bool = True,
         dynamic_population: bool = True,
         get_population: Callable[[mesa.Model], Any] = lambda model: model.agents,
-        get_xy_position: Callable[[Any], tuple[float, float]] = lambda agent: (
-            agent.cell.coordinate
-        ),
+        get_xy_position: str | Callable[[Any], tuple[float, float]] = "cell.coordinate",
+        backend: Literal["sprites", "arrays"] = "sprites",
     ) -> None:
         super().__init__(
             get_xy_position=get_xy_position,
@@ -274,6 +478,7 @@ class CellAgentArtists(Artist):
             dynamic_position=dynamic_position,
             dynamic_population=dynamic_population,
             get_population=get_population,
+            backend=backend,
         )
 
     def scale_x(self, x):
@@ -297,15 +502,24 @@ class CellArtists(Artist):
         color_vmax: Maximum value for colormap normalization.
         shape: Cell shape, either "rect" or "circle".
         size: Size multiplier relative to cell size. Defaults to 1.
-        filter_entities: Callable to filter which cells are displayed.
+        filter_entities: Optional callable to filter which cells are displayed.
         jitter: If True, adds random offset to cell positions.
         dynamic_color: If True, updates colors each frame.
         dynamic_position: If True, updates positions each frame.
         dynamic_population: If True, handles cells being added/removed.
         get_population: Callable returning the cell collection from model.
-        get_xy_position: Callable returning (x, y) position for a cell.
+        get_xy_position: Attribute name (dotted paths are allowed) or callable
+            returning the (x, y) position of a cell.
+        backend: "sprites" creates one arcade sprite per cell. "arrays" keeps
+            all cells in numpy arrays that are drawn with a single instanced
+            draw call, which scales to much larger grids. "raster" draws the
+            whole grid as a single image that spans the plot. It is the
+            fastest option for very large grids, but ignores shape, size and
+            jitter. Filtered cells stay transparent.
     """
 
+    supported_backends = ("sprites", "arrays", "raster")
+
     def __init__(
         self,
         color: Color = "grey",
@@ -315,13 +529,14 @@ class CellArtists(Artist):
         color_vmax: float | None = None,
         shape: Literal["rect", "circle"] = "rect",
         size: float = 1,
-        filter_entities: Callable[[Any], bool] = lambda entity: True,
+        filter_entities: Callable[[Any], bool] | None = None,
         jitter: bool = False,
         dynamic_color: bool = True,
         dynamic_position: bool = False,
         dynamic_population: bool = True,
         get_population: Callable[[mesa.Model], Any] = lambda model: model.grid,
-        get_xy_position: Callable[[Any], tuple[float, float]] = lambda cell: cell.coordinate,
+        get_xy_position: str | Callable[[Any], tuple[float, float]] = "coordinate",
+        backend: Literal["sprites", "arrays", "raster"] = "sprites",
     ) -> None:
         super().__init__(
             get_xy_position=get_xy_position,
@@ -338,6 +553,7 @@ class CellArtists(Artist):
             dynamic_position=dynamic_position,
             dynamic_population=dynamic_population,
             get_population=get_population,
+            backend=backend,
         )
 
     def scale_x(self, x):
@@ -346,6 +562,59 @@ class CellArtists(Artist):
     def scale_y(self, y):
         return y * self.figure.cell_height + self.figure.y + self.figure.cell_height / 2
 
+    def setup_raster(self):
+        self.sprite_list = RasterImage(
+            width=int(self.figure.space_width),
+            height=int(self.figure.space_height),
+        )
+
+        # all cells and their pixel coordinates in the image
+        self.raster_cells = list(self.population)
+        xy_positions = list(map(self.get_xy_position, self.raster_cells))
+        xy_positions = np.array(xy_positions, dtype=np.intp).reshape(-1, 2)
+        self.raster_x = xy_positions[:, 0]
+        self.raster_y = xy_positions[:, 1]
+
+        self.update_raster_image()
+
+    def update_raster(self):
+        self.num_updated_sprites = 0
+        # the cells are fixed, only their colors and whether they pass the filter can change
+        filter_can_change = self.dynamic_population and self.filter_entities is not None
+        if self.dynamic_color or filter_can_change:
+            self.update_raster_image()
+
+    def update_raster_image(self):
+        colors = self.get_rgba_colors(self.raster_cells)
+
+        # filtered cells are fully transparent
+        if self.filter_entities is not None:
+            visible = np.fromiter(
+                map(self.filter_entities, self.raster_cells),
+                dtype=bool,
+                count=len(self.raster_cells),
+            )
+            colors[~visible] = 0
+
+        # write only the pixels that have changed
+        image = self.sprite_list.image
+        changed = np.any(image[self.raster_y, self.raster_x] != colors, axis=1)
+        self.num_updated_sprites = int(np.count_nonzero(changed))
+        if self.num_updated_sprites > 0:
+            image[self.raster_y[changed], self.raster_x[changed]] = colors[changed]
+            self.sprite_list.dirty = True
+
+    def draw(self):
+        if self.backend == "raster":
+            self.sprite_list.draw(
+                x=self.figure.x,
+                y=self.figure.y,
+                width=self.figure.width,
+                height=self.figure.height,
+            )
+        else:
+            super().draw()
+
 
 class ContinuousSpaceAgentArtists(Artist):
     """Renders agents in a continuous space.
@@ -361,13 +630,17 @@ class ContinuousSpaceAgentArtists(Artist):
         color_vmax: Maximum value for colormap normalization.
         shape: Agent shape, either "rect" or "circle".
         size: Size multiplier for agent sprites. Defaults to 2.
-        filter_entities: Callable to filter which agents are displayed.
+        filter_entities: Optional callable to filter which agents are displayed.
         jitter: If True, adds random offset to prevent overlap.
         dynamic_color: If True, updates colors each frame.
         dynamic_position: If True, updates positions each frame.
         dynamic_population: If True, handles agents being added/removed.
         get_population: Callable returning the agent collection from model.
-        get_xy_position: Callable returning (x, y) position for an agent.
+        get_xy_position: Attribute name (dotted paths are allowed) or callable
+            returning the (x, y) position of an agent.
+        backend: "sprites" creates one arcade sprite per agent. "arrays" keeps
+            all agents in numpy arrays that are drawn with a single instanced
+            draw call, which scales to much larger populations.
     """
 
     def __init__(
@@ -379,13 +652,14 @@ class ContinuousSpaceAgentArtists(Artist):
         color_vmax: float | None = None,
         shape: Literal["rect", "circle"] = "circle",
         size: float = 2,
-        filter_entities: Callable[[Any], bool] = lambda entity: True,
+        filter_entities: Callable[[Any], bool] | None = None,
         jitter: bool = False,
         dynamic_color: bool = True,
         dynamic_position: bool = True,
         dynamic_population: bool = True,
         get_population: Callable[[mesa.Model], Any] = lambda model: model.agents,
-        get_xy_position: Callable[[Any], tuple[float, float]] = lambda agent: agent.position,
+        get_xy_position: str | Callable[[Any], tuple[float, float]] = "position",
+        backend: Literal["sprites", "arrays"] = "sprites",
     ) -> None:
         super().__init__(
             get_xy_position=get_xy_position,
@@ -402,6 +676,7 @@ class ContinuousSpaceAgentArtists(Artist):
             dynamic_position=dynamic_position,
             dynamic_population=dynamic_population,
             get_population=get_population,
+            backend=backend,
         )
 
     def scale_x(self, x):
@@ -414,7 +689,9 @@ class ContinuousSpaceAgentArtists(Artist):
 class NetworkCellArtists(Artist):
     """Renders nodes and edges of a network graph.
 
-    Visualizes cells as nodes in a network layout.
+    Visualizes cells as nodes in a network layout. The edges are built once
+    and drawn with a single draw call, see `dynamic_graph` for graphs whose
+    edges change. The layout of the nodes is not recomputed.
 
     Args:
         color: Default color for all nodes. Used when color_attribute is None.
@@ -424,14 +701,29 @@ class NetworkCellArtists(Artist):
         color_vmax: Maximum value for colormap normalization.
         shape: Node shape, either "rect" or "circle".
         size: Size multiplier for node sprites. Defaults to 2.
-        filter_entities: Callable to filter which nodes are displayed.
+        filter_entities: Optional callable to filter which nodes are displayed.
         jitter: If True, adds random offset to node positions.
         dynamic_color: If True, updates colors each frame.
         dynamic_position: If True, updates positions each frame.
         dynamic_population: If True, handles nodes being added/removed.
         networkx_layout: Layout function from networkx (e.g., spring_layout).
+        layout_cache_dir: Optional directory in which computed layouts are
+            stored, so that later sessions can reuse them. Layouts are always
+            shared between artists and resets within a session.
+        background_layout: If True, the layout is computed in a worker process.
+            The nodes start at random positions and move towards the final
+            layout while the simulation can already run. Requires a picklable
+            layout function, e.g. a module-level function instead of a lambda.
+        dynamic_graph: If True, the edges are rebuilt whenever the edges of the
+            graph change, including rewiring that keeps the number of edges.
+            Detecting a change is linear in the number of edges, so the edges
+            of the default static graph are only built once.
         get_population: Callable returning the cell collection from model.
-        get_xy_position: Callable returning (x, y) position for a cell.
+        get_xy_position: Attribute name (dotted paths are allowed) or callable
+            returning the (x, y) position of a cell.
+        backend: "sprites" creates one arcade sprite per cell. "arrays" keeps
+            all cells in numpy arrays that are drawn with a single instanced
+            draw call, which scales to much larger grids.
     """
 
     def __init__(
@@ -443,16 +735,20 @@ class NetworkCellArtists(Artist):
         color_vmax: float | None = None,
         shape: Literal["rect", "circle"] = "circle",
         size: float = 2,
-        filter_entities: Callable[[Any], bool] = lambda entity: True,
+        filter_entities: Callable[[Any], bool] | None = None,
         jitter: bool = False,
         dynamic_color: bool = True,
         dynamic_position: bool = True,
         dynamic_population: bool = True,
         networkx_layout: Callable[..., dict[Any, Any]] = nx.spring_layout,
+        layout_cache_dir: str | os.PathLike | None = None,
+        background_layout: bool = False,
+        dynamic_graph: bool = False,
         get_population: Callable[[mesa.Model], Any] = lambda model: model.grid,
-        get_xy_position: Callable[[Any], tuple[float, float]] = lambda cell: (
-            cell._MESARCADE_NETWORK_POSITION
+        get_xy_position: str | Callable[[Any], tuple[float, float]] = (
+            "_MESARCADE_NETWORK_POSITION"
         ),
+        backend: Literal["sprites", "arrays"] = "sprites",
     ) -> None:
         super().__init__(
             get_xy_position=get_xy_position,
@@ -469,18 +765,32 @@ class NetworkCellArtists(Artist):
             dynamic_position=dynamic_position,
             dynamic_population=dynamic_population,
             get_population=get_population,
+            backend=backend,
         )
         self.networkx_layout = networkx_layout
+        self.layout_cache_dir = layout_cache_dir
+        self.background_layout = background_layout
+        self.dynamic_graph = dynamic_graph
 
     def _get_node_positions(self):
-        self.layout_positions = self.networkx_layout(self.model.grid.G)
+        self.layout_job = None
+        if self.background_layout:
+            self.layout_job = start_layout_job(
+                graph=self.model.grid.G,
+                layout=self.networkx_layout,
+                cache_dir=self.layout_cache_dir,
+            )
 
-        self.max_x_node_position = max(
-            [abs(self.layout_positions[i][0]) for i in self.layout_positions]
-        )
-        self.max_y_node_position = max(
-            [abs(self.layout_positions[i][1]) for i in self.layout_positions]
-        )
+        # the layout is still being computed in the background
+        if self.layout_job is not None:
+            self.layout_version = self.layout_job.version
+            self.layout_positions = self.layout_job.get_positions()
+        else:
+            self.layout_positions = get_layout(
+                graph=self.model.grid.G,
+                layout=self.networkx_layout,
+                cache_dir=self.layout_cache_dir,
+            )
 
         self.node_size = max(
             10 / math.log10(len(self.layout_positions)) * self.figure.width / 400,
@@ -490,6 +800,16 @@ class NetworkCellArtists(Artist):
         self.figure.cell_width = self.node_size
         self.figure.cell_height = self.node_size
 
+        self._set_node_positions()
+
+    def _set_node_positions(self):
+        self.max_x_node_position = max(
+            [abs(self.layout_positions[i][0]) for i in self.layout_positions]
+        )
+        self.max_y_node_position = max(
+            [abs(self.layout_positions[i][1]) for i in self.layout_positions]
+        )
+
         for i, cell in enumerate(self.model.grid):
             cell._MESARCADE_NETWORK_POSITION = self.layout_positions[i]
             cell._MESARCADE_NETWORK_POSITION[0] /= self.max_x_node_position
@@ -497,6 +817,76 @@ class NetworkCellArtists(Artist):
 
     def setup2(self):
         self._get_node_positions()
+        self.setup_edges()
+
+    def get_graph_fingerprint(self) -> tuple[int, int, int]:
+        """Returns a value that changes whenever nodes or edges are added, removed or rewired.
+
+        Comparing the edge sets is linear in the number of edges, so it is only
+        done for a dynamic graph.
+        """
+        graph = self.model.grid.G
+        return graph.number_of_nodes(), graph.number_of_edges(), hash(frozenset(graph.edges()))
+
+    def setup_edges(self):
+        """Finds the nodes of all edges once, so that they can be moved with the nodes."""
+        graph = self.model.grid.G
+        if self.dynamic_graph:
+            self.graph_fingerprint = self.get_graph_fingerprint()
+
+        self.nodes = list(graph.nodes())
+        node_index = {node: i for i, node in enumerate(self.nodes)}
+        self.edge_nodes = np.array(
+            [(node_index[u], node_index[v]) for u, v in graph.edges()], dtype=np.intp
+        ).reshape(-1, 2)
+
+        self.edge_batch = TriangleBatch(color=arcade.color.BLACK)
+        self.set_edge_positions()
+
+    def set_edge_positions(self):
+        """Writes the quads of all edges at the current node positions into the vertex buffer."""
+        if len(self.edge_nodes) == 0:
+            return
+
+        # scaled positions of all nodes
+        node_positions = np.array([self.layout_positions[node] for node in self.nodes])
+        node_positions = np.column_stack(
+            (self.scale_x(node_positions[:, 0]), self.scale_y(node_positions[:, 1]))
+        )
+
+        points = create_line_quads(
+            start=node_positions[self.edge_nodes[:, 0]],
+            end=node_positions[self.edge_nodes[:, 1]],
+            line_width=max(1, self.node_size / 5),
+        )
+        self.edge_batch.set_vertices(points)
+
+    def update(self):
+        # rebuild the edges only if the graph has changed
+        if self.dynamic_graph and self.get_graph_fingerprint() != self.graph_fingerprint:
+            self.setup_edges()
+        super().update()
+
+    def poll(self):
+        # the layout also progresses while the simulation is paused
+        if self.layout_job is not None:
+            self.update_layout()
+
+    def update_layout(self):
+        """Moves nodes and edges to the latest positions of the background layout."""
+        self.layout_job.poll()
+        if self.layout_job.version == self.layout_version:
+            return
+
+        self.layout_version = self.layout_job.version
+        self.layout_positions = self.layout_job.get_positions()
+        self._set_node_positions()
+        # the edges keep their nodes, only their vertices are overwritten
+        self.set_edge_positions()
+        self.refresh_positions()
+
+        if self.layout_job.done:
+            self.layout_job = None
 
     def scale_x(self, x):
         return x * self.figure.width / 2.15 + self.figure.x + self.figure.width / 2
@@ -505,21 +895,8 @@ class NetworkCellArtists(Artist):
         return y * self.figure.height / 2.15 + self.figure.y + self.figure.height / 2
 
     def draw(self):
-        edges = self.model.grid.G.edges()
-        for u, v in edges:
-            node_u_pos = self.layout_positions[u]
-            node_v_pos = self.layout_positions[v]
-
-            node_u_pos = [self.scale_x(node_u_pos[0]), self.scale_y(node_u_pos[1])]
-            node_v_pos = [self.scale_x(node_v_pos[0]), self.scale_y(node_v_pos[1])]
-
-            arcade.draw_line_strip(
-                [node_u_pos, node_v_pos],
-                color=arcade.color.BLACK,
-                line_width=max(1, self.node_size / 5),
-            )
-
-        self.sprite_list.draw()
+        self.edge_batch.draw()
+        super().draw()
 
 
 class NetworkAgentArtists(NetworkCellArtists):
@@ -535,14 +912,29 @@ class NetworkAgentArtists(NetworkCellArtists):
         color_vmax: Maximum value for colormap normalization.
         shape: Agent shape, either "rect" or "circle".
         size: Size multiplier for agent sprites. Defaults to 2.
-        filter_entities: Callable to filter which agents are displayed.
+        filter_entities: Optional callable to filter which agents are displayed.
         jitter: If True, adds random offset to prevent overlap.
         dynamic_color: If True, updates colors each frame.
         dynamic_position: If True, updates positions each frame.
         dynamic_population: If True, handles agents being added/removed.
         networkx_layout: Layout function from networkx (e.g., spring_layout).
+        layout_cache_dir: Optional directory in which computed layouts are
+            stored, so that later sessions can reuse them. Layouts are always
+            shared between artists and resets within a session.
+        background_layout: If True, the layout is computed in a worker process.
+            The nodes start at random positions and move towards the final
+            layout while the simulation can already run. Requires a picklable
+            layout function, e.g. a module-level function instead of a lambda.
+        dynamic_graph: If True, the edges are rebuilt whenever the edges of the
+            graph change, including rewiring that keeps the number of edges.
+            Detecting a change is linear in the number of edges, so the edges
+            of the default static graph are only built once.
         get_population: Callable returning the agent collection from model.
-        get_xy_position: Callable returning (x, y) position for an agent.
+        get_xy_position: Attribute name (dotted paths are allowed) or callable
+            returning the (x, y) position of an agent.
+        backend: "sprites" creates one arcade sprite per agent. "arrays" keeps
+            all agents in numpy arrays that are drawn with a single instanced
+            draw call, which scales to much larger populations.
     """
 
     def __init__(
@@ -554,16 +946,20 @@ class NetworkAgentArtists(NetworkCellArtists):
         color_vmax: float | None = None,
         shape: Literal["rect", "circle"] = "circle",
         size: float = 2,
-        filter_entities: Callable[[Any], bool] = lambda entity: True,
+        filter_entities: Callable[[Any], bool] | None = None,
         jitter: bool = False,
         dynamic_color: bool = True,
         dynamic_position: bool = True,
         dynamic_population: bool = True,
         networkx_layout: Callable[..., dict[Any, Any]] = nx.spring_layout,
+        layout_cache_dir: str | os.PathLike | None = None,
+        background_layout: bool = False,
+        dynamic_graph: bool = False,
         get_population: Callable[[mesa.Model], Any] = lambda model: model.agents,
-        get_xy_position: Callable[[Any], tuple[float, float]] = lambda agent: (
-            agent.cell._MESARCADE_NETWORK_POSITION
+        get_xy_position: str | Callable[[Any], tuple[float, float]] = (
+            "cell._MESARCADE_NETWORK_POSITION"
         ),
+        backend: Literal["sprites", "arrays"] = "sprites",
     ) -> None:
         super().__init__(
             get_xy_position=get_xy_position,
@@ -580,5 +976,9 @@ class NetworkAgentArtists(NetworkCellArtists):
             dynamic_position=dynamic_position,
             dynamic_population=dynamic_population,
             get_population=get_population,
+            backend=backend,
         )
         self.networkx_layout = networkx_layout
+        self.layout_cache_dir = layout_cache_dir
+        self.background_layout = background_layout
+        self.dynamic_graph = dynamic_graph
@@ -40,18 +40,24 @@ class PlayButton(BigButton):
         self.text = "Play" if not self.renderer.play else "Pause"
 
     def on_click(self, event):
-        self.renderer.update_value_displays(force_update=True)
+        self.renderer.run_with_model(self.force_value_display_update)
         self.renderer.play = not self.renderer.play
         self.get_text()
 
+    def force_value_display_update(self):
+        self.renderer.update_value_displays(force_update=True)
+
 
 class StepButton(BigButton):
     def setup(self):
         self.text = "Step"
 
     def on_click(self, event):
-        self.renderer.model.step()
-        self.renderer.tick += 1
+        # with a worker thread, the step is run between two of its steps
+        self.renderer.run_with_model(self.step)
+
+    def step(self):
+        self.renderer.step_model()
         self.renderer.update_figures()
         self.renderer.update_value_displays(force_update=True)
 
@@ -61,6 +67,9 @@ class ResetButton(BigButton):
         self.text = "Reset"
 
     def on_click(self, event):
+        self.renderer.run_with_model(self.reset)
+
+    def reset(self):
         self.renderer.setup_model()
         self.renderer.update_value_displays(force_update=True)
 
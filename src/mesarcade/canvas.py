@@ -1,10 +1,13 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+import time
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any, Iterator
 
 import arcade
 import mesa
 
+from mesarcade.recorder import FrameRecorder
 from mesarcade.renderer import Renderer
 
 if TYPE_CHECKING:
@@ -12,12 +15,41 @@ if TYPE_CHECKING:
     from mesarcade.controller import NumController, CatController
     from mesarcade.value_display import ValueDisplay
 
+# settings of the batch run started by the command line interface, see batch_mode()
+_batch_settings: dict[str, Any] | None = None
+
+# canvases run in batch mode and their run times in seconds
+_batch_runs: list[tuple[Canvas, float]] = []
+
+
+@contextmanager
+def batch_mode(
+    steps: int,
+    render_every: int | None = None,
+    params: dict[str, Any] | None = None,
+) -> Iterator[list[tuple[Canvas, float]]]:
+    """Turns every Canvas.show() into a call of Canvas.run() with the given arguments.
+
+    This allows to run unchanged visualization scripts as batch jobs.
+
+    Yields:
+        A list that receives each canvas that was run and its run time in seconds.
+    """
+    global _batch_settings
+    _batch_settings = {"steps": steps, "render_every": render_every, "params": params}
+    _batch_runs.clear()
+    try:
+        yield _batch_runs
+    finally:
+        _batch_settings = None
+
 
 class Canvas:
     """The main GUI window for visualizing mesa agent-based models.
 
     Creates an interactive window that displays plots, controls, and value
-    displays for a mesa simulation. Call show() to start the visualization.
+    displays for a mesa simulation. Call show() to start the visualization,
+    or run() to run the same configuration as a batch job without an event loop.
 
     Args:
         model_class: The mesa model class to instantiate and visualize.
@@ -35,6 +67,24 @@ class Canvas:
         target_fps: Target frames per second for animation. Defaults to 40.
         rendering_step: Number of simulation steps between visual updates.
             Defaults to 1.
+        step_in_background: If True, the model is stepped as fast as possible
+            in a worker thread, so that slow steps do not block the window.
+            The figures show the latest completed step at the target FPS.
+            Controller changes and resets are applied between two steps.
+            Defaults to False.
+        adaptive_steps: If True, the number of steps per frame is adapted to
+            the measured step, update and draw times, so that as many steps
+            as possible are run at a steady frame rate. Figures are updated
+            less often if they would slow down the simulation. Replaces the
+            rendering step slider. Cannot be combined with
+            `step_in_background`. Defaults to False.
+        recorder: Optional FrameRecorder that records every drawn frame to
+            disk. The recording is finished when the window is closed or
+            after Canvas.run(). Defaults to None.
+        profile: If True, rolling timings of the model step and of each figure,
+            artist, value display and the UI manager are measured and shown
+            in an overlay that is toggled with the P key. The timings are
+            also returned by get_timings(). Defaults to False.
     """
 
     def __init__(
@@ -48,8 +98,17 @@ class Canvas:
         window_title: str = "mesarcade",
         target_fps: int = 40,
         rendering_step: int = 1,
+        step_in_background: bool = False,
+        adaptive_steps: bool = False,
+        recorder: FrameRecorder | None = None,
+        profile: bool = False,
         _visible: bool = True,
     ) -> None:
+        if step_in_background and adaptive_steps:
+            raise ValueError(
+                "The arguments step_in_background and adaptive_steps cannot be combined."
+            )
+
         window_height = int(window_width * 0.6)
 
         if not arcade.timings_enabled():
@@ -62,7 +121,7 @@ class Canvas:
             title=window_title,
             resizable=False,
             antialiasing=False,
-            visible=_visible,
+            visible=_visible and _batch_settings is None,
         )
 
         # the arcade view object
@@ -76,21 +135,89 @@ class Canvas:
             target_fps=target_fps,
             rendering_step=rendering_step,
             parameter_dict=params,
+            step_in_background=step_in_background,
+            adaptive_steps=adaptive_steps,
+            recorder=recorder,
+            profile=profile,
         )
 
-    def _setup(self):
-        # setup the renderer
-        self.renderer.setup()
-
-        # initialize the mesa model
-        self.renderer.setup_model()
+    def _setup(self, start_worker: bool = True):
+        # setup the renderer, which also creates the mesa model
+        self.renderer.setup(start_worker=start_worker)
 
         # initialize arcade window
         self.window.show_view(new_view=self.renderer)
 
+    def run(
+        self,
+        steps: int,
+        render_every: int | None = None,
+        params: dict[str, Any] | None = None,
+    ) -> mesa.Model:
+        """Runs the simulation without an event loop, e.g. as a batch job on a server.
+
+        A fresh model is created and stepped as fast as possible. The figures
+        record their data in every step, so e.g. the histories of all plots are
+        complete, but nothing is drawn unless `render_every` is given. Set the
+        environment variable ARCADE_HEADLESS=1 before importing mesarcade to run
+        without a display.
+
+        Args:
+            steps: Number of model steps.
+            render_every: Optional number of steps between updates of the figures
+                and value displays, which are then also drawn offscreen.
+            params: Optional model parameters that override the parameters of the
+                canvas and the initial values of the controllers.
+
+        Returns:
+            The model after the last step.
+        """
+        if params is not None:
+            self.renderer.parameter_dict.update(params)
+            for controller in self.renderer.controllers:
+                if controller.parameter_name in params:
+                    controller.parameter_value = params[controller.parameter_name]
+
+        # the model is stepped in this loop, so no worker thread is needed
+        self._setup(start_worker=False)
+        renderer = self.renderer
+
+        for step in range(1, steps + 1):
+            renderer.step_model()
+            if render_every is not None and step % render_every == 0:
+                renderer.update_figures()
+                renderer.update_value_displays(force_update=True)
+                renderer.on_draw()
+
+        if renderer.recorder is not None:
+            renderer.recorder.stop()
+
+        return renderer.model
+
+    def get_timings(self) -> dict[str, dict[str, float]]:
+        """Returns the rolling timings of the model and the visualization.
+
+        Only available if the canvas was created with `profile=True`.
+
+        Returns:
+            Dictionary that maps component names, e.g. "model.step" or
+            "GridSpacePlot 1.draw", to the mean, max and last duration in
+            milliseconds over the most recent measurements.
+        """
+        if not self.renderer.profiler.enabled:
+            raise RuntimeError("Create the canvas with profile=True to measure timings.")
+        return self.renderer.profiler.get_timings()
+
     def show(self) -> None:
         """Renders the canvas."""
 
+        # scripts that are run by the command line interface are run as batch jobs
+        if _batch_settings is not None:
+            start = time.perf_counter()
+            self.run(**_batch_settings)
+            _batch_runs.append((self, time.perf_counter() - start))
+            return
+
         # setup everything
         self._setup()
 
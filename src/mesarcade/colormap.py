@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import math
+from typing import Any
+
+import matplotlib
+import matplotlib.colors
+import numpy as np
+
+from mesarcade.utils import parse_color
+
+# largest range of integer keys that is stored as a dense lookup table
+MAX_DENSE_KEY_RANGE = 2**16
+
+
+class ColorMap:
+    """Maps attribute values to RGBA colors using a precomputed lookup table.
+
+    A string color map is sampled once into an (num_colors, 4) table. Values are
+    normalized between vmin and vmax, clipped and mapped to the nearest entry, so
+    arbitrary ints and floats are supported. NaN values are transparent.
+
+    A dict color map is categorical. Integer keys are stored as a dense table
+    indexed by the key, any other hashable keys are translated to table rows
+    with a single dict lookup per value. Unknown keys raise a KeyError.
+
+    Args:
+        color_map: Matplotlib colormap name or dict mapping values to colors.
+        vmin: Value mapped to the lowest color of a string color map.
+        vmax: Value mapped to the highest color of a string color map.
+        num_colors: Number of entries of the lookup table of a string color map.
+    """
+
+    def __init__(
+        self,
+        color_map: str | dict[Any, Any],
+        vmin: float | None = None,
+        vmax: float | None = None,
+        num_colors: int = 256,
+    ) -> None:
+        if isinstance(color_map, str):
+            cmap = matplotlib.colormaps[color_map]
+            self.lut = (cmap(np.linspace(0, 1, num_colors)) * 255).astype(np.uint8)
+            self.vmin = vmin
+            self.vmax = vmax
+            self.categorical = False
+
+            # factor that maps a value from [vmin, vmax] to a row of the table
+            value_range = vmax - vmin
+            self.scale = (num_colors - 1) / value_range if value_range > 0 else 0
+
+        elif isinstance(color_map, dict):
+            colors = [parse_color(color=color) for color in color_map.values()]
+            self.lut = np.array(colors, dtype=np.uint8).reshape(-1, 4)
+            self.key_index = {key: i for i, key in enumerate(color_map)}
+            self.color_dict = {key: color for key, color in zip(color_map, colors)}
+            self.categorical = True
+
+            # integer keys get a dense table where the row is found by subtraction
+            self.dense_rows = None
+            int_keys = [
+                key for key in color_map if isinstance(key, int) and not isinstance(key, bool)
+            ]
+            if int_keys and len(int_keys) == len(color_map):
+                self.min_key = min(int_keys)
+                key_range = max(int_keys) - self.min_key + 1
+                if key_range <= MAX_DENSE_KEY_RANGE:
+                    # -1 marks integers without a color
+                    self.dense_rows = np.full(key_range, -1, dtype=np.intp)
+                    for key in int_keys:
+                        self.dense_rows[key - self.min_key] = self.key_index[key]
+
+        else:
+            raise ValueError("`color_map` must be a str or a dict.")
+
+    def __call__(self, value) -> tuple[int, int, int, int]:
+        """Returns the color of a single value."""
+        if self.categorical:
+            return self.color_dict[value]
+
+        if value is None or math.isnan(value):
+            return (0, 0, 0, 0)
+
+        row = round((value - self.vmin) * self.scale)
+        row = min(max(row, 0), len(self.lut) - 1)
+        return tuple(self.lut[row].tolist())
+
+    def map(self, values) -> np.ndarray:
+        """Returns the colors of all values as an (n, 4) uint8 array."""
+        if self.categorical:
+            return self.lut[self._get_rows(values)]
+
+        values = np.asarray(values, dtype=np.float64).ravel()
+        rows = np.rint((values - self.vmin) * self.scale)
+        nan_values = np.isnan(rows)
+        rows[nan_values] = 0
+        rows = np.clip(rows, 0, len(self.lut) - 1).astype(np.intp)
+
+        colors = self.lut[rows]
+        colors[nan_values] = 0
+        return colors
+
+    def _get_rows(self, values) -> np.ndarray:
+        if self.dense_rows is not None:
+            int_values = np.asarray(values)
+            if int_values.dtype.kind in "iu":
+                positions = int_values.ravel() - self.min_key
+                in_range = (positions >= 0) & (positions < len(self.dense_rows))
+                rows = np.full(len(positions), -1, dtype=np.intp)
+                rows[in_range] = self.dense_rows[positions[in_range]]
+                if (rows < 0).any():
+                    raise KeyError(int_values.ravel()[np.argmax(rows < 0)].item())
+                return rows
+
+        if isinstance(values, np.ndarray):
+            values = values.tolist()
+        return np.fromiter(map(self.key_index.__getitem__, values), dtype=np.intp)
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from functools import partial
 from typing import Any
 
 import arcade
@@ -25,12 +26,14 @@ def get_current_parameter_value(parameter_name, target_object, renderer):
 
 
 def set_new_parameter_value(parameter_name, new_value, target_object, renderer, controller):
+    # only called through renderer.run_with_model, so the model is not changed during a step
     if hasattr(target_object, parameter_name):
         setattr(
             target_object,
             parameter_name,
             new_value,
         )
+        renderer.metrics.clear()
     controller.parameter_value = new_value
     renderer.parameter_dict[parameter_name] = new_value
 
@@ -171,6 +174,10 @@ class ControllerButton(SmallButton):
         self.text = "+" if self.increase else "-"
 
     def on_click(self, event):
+        # the current value is read from the model
+        self.renderer.run_with_model(self.change_parameter_value)
+
+    def change_parameter_value(self):
         if self.parameter_name not in ["target_fps", "rendering_step"]:
             self.controller_buttons.target_object = self.renderer.model
 
@@ -298,16 +305,18 @@ class CatControllerButtons(_ControllerButtons):
         )
 
     def on_dropdown_change(self, dropdown_event):
+        self.renderer.run_with_model(partial(self.set_parameter_value, dropdown_event.new_value))
+
+    def set_parameter_value(self, new_parameter_value):
         if self.parameter_name != "target_fps":
             self.target_object = self.renderer.model
 
-        new_parameter_value = dropdown_event.new_value
-
         setattr(
             self.target_object,
             self.parameter_name,
             new_parameter_value,
         )
+        self.renderer.metrics.clear()
         self.controller.parameter_value = new_parameter_value
         self.renderer.parameter_dict[self.parameter_name] = new_parameter_value
         self.update()
@@ -433,10 +442,12 @@ class NumControllerButtons(_ControllerButtons):
         self.slider.value = self.current_value
 
     def on_slider_change(self, slider_event):
+        self.renderer.run_with_model(partial(self.set_parameter_value, slider_event.new_value))
+
+    def set_parameter_value(self, new_parameter_value):
         if self.parameter_name != "target_fps":
             self.target_object = self.renderer.model
 
-        new_parameter_value = slider_event.new_value
         new_parameter_value = round_parameter_value(new_parameter_value, self.controller.step)
 
         set_new_parameter_value(
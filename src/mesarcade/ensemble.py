@@ -0,0 +1,215 @@
+from __future__ import annotations
+
+import inspect
+import os
+import pickle
+import queue
+import time
+from typing import TYPE_CHECKING, Any, Callable
+
+import numpy as np
+
+from mesarcade.utils import get_attribute_getter, get_process_context
+
+if TYPE_CHECKING:
+    import mesa
+
+# seconds between two messages of a worker
+SEND_INTERVAL = 0.1
+
+
+def _run_replicates(
+    model_class,
+    parameter_dicts,
+    replicate_ids,
+    metrics,
+    from_datacollector,
+    sample_step,
+    target_tick,
+    result_queue,
+):
+    """Runs in a worker process and steps its replicates until the target tick.
+
+    Sends (replicate_id, ticks, values) tuples with all data points that were
+    sampled since the previous message.
+    """
+    models = [model_class(**parameters) for parameters in parameter_dicts]
+    getters = [get_attribute_getter(metric) for metric in metrics]
+
+    def get_values(model):
+        values = []
+        for metric, getter in zip(metrics, getters):
+            if from_datacollector and isinstance(metric, str):
+                data = model.datacollector.model_vars[metric]
+                value = data[-1] if len(data) > 0 else None
+            else:
+                value = getter(model)
+            values.append(np.nan if value is None else float(value))
+        return values
+
+    tick = 0
+    ticks = []
+    rows = [[] for _ in models]
+    last_send = time.perf_counter()
+
+    while True:
+        if tick < target_tick.value:
+            tick += 1
+            for i, model in enumerate(models):
+                model.step()
+                if tick % sample_step == 0 or tick <= 1:
+                    rows[i].append(get_values(model))
+            if tick % sample_step == 0 or tick <= 1:
+                ticks.append(tick)
+        else:
+            # wait for the displayed model
+            time.sleep(0.01)
+
+        if ticks and time.perf_counter() - last_send > SEND_INTERVAL:
+            for replicate_id, replicate_rows in zip(replicate_ids, rows):
+                result_queue.put(
+                    (replicate_id, np.array(ticks), np.array(replicate_rows, dtype=np.float64))
+                )
+            ticks = []
+            rows = [[] for _ in models]
+            last_send = time.perf_counter()
+
+
+class Ensemble:
+    """Replicates of a model that run in worker processes alongside the displayed model.
+
+    The replicates are created with the same parameters as the displayed model
+    but with different seeds and are distributed over a few worker processes.
+    They never run ahead of the tick passed to set_target_tick(). Call poll()
+    regularly to receive their data points, which are reduced to the mean and
+    the quantiles of all replicates as soon as every replicate has reached a tick.
+
+    Args:
+        model_class: The class of the model.
+        parameters: Keyword arguments of the model class.
+        metrics: Model attributes or picklable callables that are sampled.
+        num_replicates: Number of replicates.
+        quantiles: Lower and upper quantile of the bands.
+        from_datacollector: If True, string metrics are read from the datacollector.
+        sample_step: Simulation steps between two sampled data points.
+        num_processes: Number of worker processes. Defaults to the number of CPUs
+            minus one, but not more than the number of replicates.
+    """
+
+    def __init__(
+        self,
+        model_class: type[mesa.Model],
+        parameters: dict[str, Any],
+        metrics: list[str | Callable[[mesa.Model], Any]],
+        num_replicates: int,
+        quantiles: tuple[float, float] = (0.1, 0.9),
+        from_datacollector: bool = False,
+        sample_step: int = 1,
+        num_processes: int | None = None,
+    ) -> None:
+        self.num_replicates = num_replicates
+        self.num_metrics = len(metrics)
+        self.quantiles = quantiles
+
+        # data points that have not been reduced yet, per replicate
+        self.pending_ticks: list[list[np.ndarray]] = [[] for _ in range(num_replicates)]
+        self.pending_values: list[list[np.ndarray]] = [[] for _ in range(num_replicates)]
+
+        # the workers receive pickled copies of their arguments, see get_process_context()
+        try:
+            pickle.dumps((model_class, parameters, metrics))
+        except (pickle.PicklingError, AttributeError, TypeError) as error:
+            raise ValueError(
+                "Replicates require a model class, parameters and metrics that can be "
+                "pickled, e.g. attribute names or module-level functions instead of lambdas."
+            ) from error
+
+        parameter_dicts = self.get_parameter_dicts(model_class, parameters, num_replicates)
+
+        if num_processes is None:
+            num_processes = max(1, (os.cpu_count() or 2) - 1)
+        num_processes = min(num_processes, num_replicates)
+
+        context = get_process_context()
+        self.target_tick = context.Value("q", 0, lock=False)
+        self.queue = context.Queue()
+        self.processes = []
+        for i in range(num_processes):
+            replicate_ids = list(range(i, num_replicates, num_processes))
+            process = context.Process(
+                target=_run_replicates,
+                args=(
+                    model_class,
+                    [parameter_dicts[j] for j in replicate_ids],
+                    replicate_ids,
+                    metrics,
+                    from_datacollector,
+                    sample_step,
+                    self.target_tick,
+                    self.queue,
+                ),
+                daemon=True,
+            )
+            process.start()
+            self.processes.append(process)
+
+    @staticmethod
+    def get_parameter_dicts(model_class, parameters, num_replicates) -> list[dict[str, Any]]:
+        """Returns the parameters of each replicate with its own seed if supported."""
+        signature = inspect.signature(model_class).parameters
+        accepts_seed = "seed" in signature or any(
+            parameter.kind == inspect.Parameter.VAR_KEYWORD for parameter in signature.values()
+        )
+        if not accepts_seed:
+            return [dict(parameters) for _ in range(num_replicates)]
+
+        # the seeds are reproducible if the displayed model has a fixed seed
+        seeds = np.random.SeedSequence(parameters.get("seed")).generate_state(num_replicates)
+        return [{**parameters, "seed": int(seed)} for seed in seeds]
+
+    def set_target_tick(self, tick: int) -> None:
+        """Lets the replicates run until the given tick."""
+        self.target_tick.value = tick
+
+    def poll(self) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray] | None:
+        """Receives new data points and reduces those that all replicates have reached.
+
+        Returns:
+            None if no new tick was completed by all replicates. Otherwise the
+            ticks (n,) and the mean, lower and upper quantile (n, num_metrics)
+            of the newly completed ticks.
+        """
+        while True:
+            try:
+                replicate_id, ticks, values = self.queue.get_nowait()
+            except queue.Empty:
+                break
+            self.pending_ticks[replicate_id].append(ticks)
+            self.pending_values[replicate_id].append(values)
+
+        # number of data points that every replicate has delivered
+        num_complete = min(
+            sum(len(ticks) for ticks in replicate_ticks) for replicate_ticks in self.pending_ticks
+        )
+        if num_complete == 0:
+            return None
+
+        ticks = np.concatenate(self.pending_ticks[0])[:num_complete]
+        values = np.empty((self.num_replicates, num_complete, self.num_metrics))
+        for i in range(self.num_replicates):
+            replicate_ticks = np.concatenate(self.pending_ticks[i])
+            replicate_values = np.concatenate(self.pending_values[i])
+            values[i] = replicate_values[:num_complete]
+            # keep only the data points that have not been reduced
+            self.pending_ticks[i] = [replicate_ticks[num_complete:]]
+            self.pending_values[i] = [replicate_values[num_complete:]]
+
+        # vectorized reductions over all replicates
+        mean = np.nanmean(values, axis=0)
+        lower, upper = np.nanquantile(values, self.quantiles, axis=0)
+        return ticks, mean, lower, upper
+
+    def stop(self) -> None:
+        for process in self.processes:
+            if process.is_alive():
+                process.terminate()
@@ -26,6 +26,13 @@ class Figure:
         self.height = height
         self.renderer = renderer
 
+        # names under which the profiler reports the figure and its components
+        self.profile_name = f"{type(self).__name__} {renderer.figures.index(self) + 1}"
+        self.component_profile_names = [
+            f"{self.profile_name} {type(component).__name__.lstrip('_')} {i + 1}"
+            for i, component in enumerate(self.components)
+        ]
+
         self.font_size = self.height * 0.03
 
         if self.figure_type == "network":
@@ -45,15 +52,29 @@ class Figure:
         self.create_empty_figure()
         self.setup_components()
 
-    def update(self):
+    def sample(self):
+        """Records data of the model at the current tick without redrawing anything."""
+        for component in self.components:
+            component.sample()
+
+    def poll(self):
+        """Applies finished background jobs of the components, e.g. a network layout."""
         for component in self.components:
-            component.update()
+            component.poll()
+
+    def update(self):
+        profiler = self.renderer.profiler
+        for component, name in zip(self.components, self.component_profile_names):
+            with profiler.measure(f"{name}.update"):
+                component.update()
 
     def draw(self):
         self.shape_list.draw()
         self.text_batch.draw()
-        for component in self.components:
-            component.draw()
+        profiler = self.renderer.profiler
+        for component, name in zip(self.components, self.component_profile_names):
+            with profiler.measure(f"{name}.draw"):
+                component.draw()
 
     def setup_components(self) -> None:
         """Initializes/resets all components including all their sprites."""
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import math
+
+
+class StepGovernor:
+    """Chooses how many model steps are run per frame to keep a steady frame rate.
+
+    The governor keeps exponential moving averages of the duration of a model
+    step, of updating the figures and of drawing a frame. Per frame, it runs as
+    many steps as fit into the time that drawing leaves of the frame budget.
+    Updating the figures is limited to a share of the total time, so slow steps
+    are not slowed down further by figures that are updated after each of them.
+
+    Args:
+        smoothing: Weight of a new measurement in the moving averages.
+        max_update_share: Largest share of the time spent on updating figures.
+        headroom: Share of the frame budget that is not planned for, as a margin
+            for measurement noise and the event loop.
+        max_steps: Largest number of steps per frame.
+    """
+
+    def __init__(
+        self,
+        smoothing: float = 0.2,
+        max_update_share: float = 0.25,
+        headroom: float = 0.1,
+        max_steps: int = 1000,
+    ) -> None:
+        self.smoothing = smoothing
+        self.max_update_share = max_update_share
+        self.headroom = headroom
+        self.max_steps = max_steps
+
+        # moving averages in seconds, None until the first measurement
+        self.step_time = None
+        self.update_time = None
+        self.draw_time = None
+
+        self.num_steps = 1
+        self.time_since_update = math.inf
+
+    def _average(self, average: float | None, duration: float) -> float:
+        if average is None:
+            return duration
+        return average + self.smoothing * (duration - average)
+
+    def record_steps(self, num_steps: int, duration: float) -> None:
+        if num_steps > 0:
+            self.step_time = self._average(self.step_time, duration / num_steps)
+
+    def record_update(self, duration: float) -> None:
+        self.update_time = self._average(self.update_time, duration)
+        self.time_since_update = 0
+
+    def record_draw(self, duration: float) -> None:
+        self.draw_time = self._average(self.draw_time, duration)
+
+    def get_num_steps(self, frame_budget: float) -> int:
+        """Returns the number of steps that fit into the next frame.
+
+        Args:
+            frame_budget: Duration of a frame in seconds, i.e. 1 / target fps.
+        """
+        if self.step_time is None:
+            return 1
+
+        budget = frame_budget * (1 - self.headroom) - (self.draw_time or 0)
+        if self.update_due(frame_budget):
+            budget -= self.update_time or 0
+
+        self.num_steps = min(self.max_steps, max(1, int(budget / max(self.step_time, 1e-9))))
+        return self.num_steps
+
+    def update_due(self, frame_budget: float) -> bool:
+        """Whether the figures should be updated after the steps of this frame."""
+        if self.update_time is None:
+            return True
+
+        # the updates should not take more than their share of the time
+        interval = max(frame_budget, self.update_time / self.max_update_share)
+        # half a frame of tolerance, as the frame times jitter
+        return self.time_since_update + frame_budget / 2 >= interval
+
+    def advance(self, delta_time: float) -> None:
+        """Records the time that has passed since the previous frame."""
+        self.time_since_update += delta_time
@@ -0,0 +1,737 @@
+from __future__ import annotations
+
+import weakref
+from typing import Literal
+
+import arcade
+import numpy as np
+from arcade.gl import BufferDescription
+
+INSTANCED_SHAPES_VERTEX_SHADER = """
+#version 330
+
+uniform WindowBlock {
+    mat4 projection;
+    mat4 view;
+} window;
+
+uniform vec2 size;
+
+// corner of the unit quad
+in vec2 in_vert;
+
+// per instance attributes
+in vec2 in_position;
+in vec2 in_offset;
+in vec4 in_color;
+
+out vec2 v_uv;
+out vec4 v_color;
+
+void main() {
+    v_uv = in_vert * 2.0;
+    v_color = in_color;
+    vec2 position = in_position + in_offset + in_vert * size;
+    gl_Position = window.projection * window.view * vec4(position, 0.0, 1.0);
+}
+"""
+
+INSTANCED_SHAPES_FRAGMENT_SHADER = """
+#version 330
+
+uniform int circle;
+
+in vec2 v_uv;
+in vec4 v_color;
+
+out vec4 f_color;
+
+void main() {
+    if (circle == 1 && dot(v_uv, v_uv) > 1.0) {
+        discard;
+    }
+    f_color = v_color;
+}
+"""
+
+# corners of a unit quad drawn as triangle strip
+UNIT_QUAD = np.array([-0.5, -0.5, 0.5, -0.5, -0.5, 0.5, 0.5, 0.5], dtype=np.float32)
+
+# compiled programs per OpenGL context
+_programs: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+
+def get_program(ctx, name: str, **shaders):
+    """Returns the program `name` of the given context and compiles it on first use."""
+    ctx_programs = _programs.setdefault(ctx, {})
+    if name not in ctx_programs:
+        ctx_programs[name] = ctx.program(**shaders)
+    return ctx_programs[name]
+
+
+class InstancedShapeList:
+    """Array-backed replacement for a SpriteList of equally sized rects or circles.
+
+    Positions, offsets and colors of all instances are kept in contiguous numpy
+    arrays and uploaded to the GPU as instanced vertex buffers, so the whole list
+    is drawn with a single draw call. Rows are removed by moving the last row into
+    the gap, i.e. the order of the rows is not stable.
+    """
+
+    def __init__(
+        self,
+        shape: Literal["rect", "circle"],
+        width: float,
+        height: float,
+        capacity: int = 256,
+    ) -> None:
+        self.shape = shape
+        if shape == "circle":
+            self.size = (min(width, height), min(width, height))
+        else:
+            self.size = (width, height)
+
+        self.num_instances = 0
+        self.positions = np.zeros((capacity, 2), dtype=np.float32)
+        self.offsets = np.zeros((capacity, 2), dtype=np.float32)
+        self.colors = np.zeros((capacity, 4), dtype=np.uint8)
+
+        # names of the arrays that have to be uploaded before the next draw
+        self.dirty_arrays = {"positions", "offsets", "colors"}
+
+        self.ctx = None
+        self.gpu_capacity = 0
+
+    def __len__(self) -> int:
+        return self.num_instances
+
+    def reserve(self, capacity: int) -> None:
+        """Grows the arrays so that they can hold at least `capacity` rows."""
+        if capacity <= len(self.positions):
+            return
+
+        new_capacity = max(capacity, 2 * len(self.positions))
+        for name in ("positions", "offsets", "colors"):
+            old_array = getattr(self, name)
+            new_array = np.zeros((new_capacity, old_array.shape[1]), dtype=old_array.dtype)
+            new_array[: self.num_instances] = old_array[: self.num_instances]
+            setattr(self, name, new_array)
+
+    def extend(self, positions, colors, offsets=None) -> None:
+        """Appends new rows to the end of the list."""
+        k = len(positions)
+        if k == 0:
+            return
+
+        self.reserve(self.num_instances + k)
+        rows = slice(self.num_instances, self.num_instances + k)
+        self.positions[rows] = positions
+        self.colors[rows] = colors
+        self.offsets[rows] = 0 if offsets is None else offsets
+        self.num_instances += k
+        self.dirty_arrays.update(("positions", "offsets", "colors"))
+
+    def remove(self, row: int) -> None:
+        """Removes a row by moving the last row into its place."""
+        last_row = self.num_instances - 1
+        if row != last_row:
+            self.positions[row] = self.positions[last_row]
+            self.offsets[row] = self.offsets[last_row]
+            self.colors[row] = self.colors[last_row]
+        self.num_instances -= 1
+        self.dirty_arrays.update(("positions", "offsets", "colors"))
+
+    def update_positions(self, positions) -> np.ndarray:
+        """Overwrites the positions of all rows.
+
+        Returns:
+            A boolean mask of the rows whose position has changed.
+        """
+        return self._update_array("positions", np.asarray(positions, dtype=np.float32))
+
+    def update_colors(self, colors) -> np.ndarray:
+        """Overwrites the colors of all rows.
+
+        Returns:
+            A boolean mask of the rows whose color has changed.
+        """
+        return self._update_array("colors", np.asarray(colors, dtype=np.uint8))
+
+    def _update_array(self, name: str, values: np.ndarray) -> np.ndarray:
+        current_values = getattr(self, name)[: self.num_instances]
+        changed = np.any(current_values != values, axis=1)
+        if changed.any():
+            current_values[changed] = values[changed]
+            self.dirty_arrays.add(name)
+        return changed
+
+    def _create_buffers(self) -> None:
+        self.gpu_capacity = len(self.positions)
+        self.quad_buffer = self.ctx.buffer(data=UNIT_QUAD)
+        self.position_buffer = self.ctx.buffer(reserve=self.positions.nbytes, usage="dynamic")
+        self.offset_buffer = self.ctx.buffer(reserve=self.offsets.nbytes, usage="dynamic")
+        self.color_buffer = self.ctx.buffer(reserve=self.colors.nbytes, usage="dynamic")
+        self.geometry = self.ctx.geometry(
+            [
+                BufferDescription(self.quad_buffer, "2f", ["in_vert"]),
+                BufferDescription(
+                    self.position_buffer, "2f", ["in_position"], instanced=True
+                ),
+                BufferDescription(self.offset_buffer, "2f", ["in_offset"], instanced=True),
+                BufferDescription(
+                    self.color_buffer,
+                    "4f1",
+                    ["in_color"],
+                    normalized=["in_color"],
+                    instanced=True,
+                ),
+            ]
+        )
+        self.dirty_arrays.update(("positions", "offsets", "colors"))
+
+    def draw(self) -> None:
+        if self.num_instances == 0:
+            return
+
+        if self.ctx is None:
+            self.ctx = arcade.get_window().ctx
+            self.program = get_program(
+                self.ctx,
+                "instanced_shapes",
+                vertex_shader=INSTANCED_SHAPES_VERTEX_SHADER,
+                fragment_shader=INSTANCED_SHAPES_FRAGMENT_SHADER,
+            )
+
+        # the arrays have grown beyond the size of the gpu buffers
+        if self.gpu_capacity < len(self.positions):
+            self._create_buffers()
+
+        # upload only the arrays that have changed since the last draw
+        for name in self.dirty_arrays:
+            buffer = getattr(self, name[:-1] + "_buffer")
+            buffer.write(getattr(self, name)[: self.num_instances])
+        self.dirty_arrays.clear()
+
+        self.program["size"] = self.size
+        self.program["circle"] = 1 if self.shape == "circle" else 0
+        self.geometry.render(
+            self.program,
+            mode=self.ctx.TRIANGLE_STRIP,
+            vertices=4,
+            instances=self.num_instances,
+        )
+
+
+RASTER_IMAGE_VERTEX_SHADER = """
+#version 330
+
+uniform WindowBlock {
+    mat4 projection;
+    mat4 view;
+} window;
+
+// x, y, width and height of the target rectangle
+uniform vec4 rect;
+
+// corner of the unit quad
+in vec2 in_vert;
+
+out vec2 v_uv;
+
+void main() {
+    v_uv = in_vert + 0.5;
+    vec2 position = rect.xy + v_uv * rect.zw;
+    gl_Position = window.projection * window.view * vec4(position, 0.0, 1.0);
+}
+"""
+
+RASTER_IMAGE_FRAGMENT_SHADER = """
+#version 330
+
+uniform sampler2D image;
+
+in vec2 v_uv;
+
+out vec4 f_color;
+
+void main() {
+    f_color = texture(image, v_uv);
+}
+"""
+
+
+class RasterImage:
+    """An RGBA image that is stretched over a rectangle with a single draw call.
+
+    The pixels are kept in the numpy array `image` of shape (height, width, 4),
+    where row 0 is drawn at the bottom. Set `dirty` after writing to the array
+    to upload it before the next draw.
+    """
+
+    def __init__(self, width: int, height: int) -> None:
+        self.width = width
+        self.height = height
+        self.image = np.zeros((height, width, 4), dtype=np.uint8)
+        self.dirty = True
+        self.ctx = None
+
+    def draw(self, x: float, y: float, width: float, height: float) -> None:
+        if self.ctx is None:
+            self.ctx = arcade.get_window().ctx
+            self.program = get_program(
+                self.ctx,
+                "raster_image",
+                vertex_shader=RASTER_IMAGE_VERTEX_SHADER,
+                fragment_shader=RASTER_IMAGE_FRAGMENT_SHADER,
+            )
+            self.texture = self.ctx.texture(
+                (self.width, self.height),
+                components=4,
+                filter=(self.ctx.NEAREST, self.ctx.NEAREST),
+            )
+            self.quad_buffer = self.ctx.buffer(data=UNIT_QUAD)
+            self.geometry = self.ctx.geometry(
+                [BufferDescription(self.quad_buffer, "2f", ["in_vert"])]
+            )
+
+        if self.dirty:
+            self.texture.write(self.image)
+            self.dirty = False
+
+        self.texture.use(0)
+        self.program["image"] = 0
+        self.program["rect"] = (x, y, width, height)
+        self.geometry.render(self.program, mode=self.ctx.TRIANGLE_STRIP, vertices=4)
+
+
+def create_line_quads(start: np.ndarray, end: np.ndarray, line_width: float) -> np.ndarray:
+    """Turns line segments into triangles that can be drawn in a single batch.
+
+    Args:
+        start: (n, 2) array of the start points of the segments.
+        end: (n, 2) array of the end points of the segments.
+        line_width: Width of the lines in pixels.
+
+    Returns:
+        (6 * n, 2) array with the corners of two triangles per segment.
+    """
+    direction = end - start
+    length = np.hypot(direction[:, 0], direction[:, 1])
+    length[length == 0] = 1
+
+    # vector perpendicular to each segment with half the line width as length
+    normal = np.column_stack((-direction[:, 1], direction[:, 0]))
+    normal *= (line_width / 2) / length[:, np.newaxis]
+
+    a = start + normal
+    b = start - normal
+    c = end + normal
+    d = end - normal
+    return np.stack((a, b, c, b, d, c), axis=1).reshape(-1, 2)
+
+
+TRIANGLE_BATCH_VERTEX_SHADER = """
+#version 330
+
+uniform WindowBlock {
+    mat4 projection;
+    mat4 view;
+} window;
+
+in vec2 in_vert;
+
+void main() {
+    gl_Position = window.projection * window.view * vec4(in_vert, 0.0, 1.0);
+}
+"""
+
+TRIANGLE_BATCH_FRAGMENT_SHADER = """
+#version 330
+
+uniform vec4 color;
+
+out vec4 f_color;
+
+void main() {
+    f_color = color;
+}
+"""
+
+
+class TriangleBatch:
+    """Triangles of a single color, e.g. the edges of a network, drawn with one draw call.
+
+    The corners are written straight from a numpy array into a persistent vertex
+    buffer. Moving the triangles overwrites the buffer in place, it is only
+    reallocated if the number of triangles grows.
+
+    Args:
+        color: RGBA color of all triangles.
+    """
+
+    def __init__(self, color: tuple[int, int, int, int] = (0, 0, 0, 255)) -> None:
+        self.color = tuple(channel / 255 for channel in color)
+        self.vertices = np.zeros((0, 2), dtype=np.float32)
+        # whether the vertices have to be uploaded before the next draw
+        self.dirty = False
+
+        self.ctx = None
+        self.gpu_capacity = 0
+
+    def set_vertices(self, vertices) -> None:
+        """Replaces the corners of all triangles.
+
+        Args:
+            vertices: (3 * n, 2) array of the corners of n triangles, e.g. the
+                result of create_line_quads().
+        """
+        self.vertices = np.ascontiguousarray(vertices, dtype=np.float32).reshape(-1, 2)
+        self.dirty = True
+
+    def draw(self) -> None:
+        if len(self.vertices) == 0:
+            return
+
+        if self.ctx is None:
+            self.ctx = arcade.get_window().ctx
+            self.program = get_program(
+                self.ctx,
+                "triangle_batch",
+                vertex_shader=TRIANGLE_BATCH_VERTEX_SHADER,
+                fragment_shader=TRIANGLE_BATCH_FRAGMENT_SHADER,
+            )
+
+        # the vertices have grown beyond the size of the gpu buffer
+        if self.gpu_capacity < len(self.vertices):
+            self.gpu_capacity = len(self.vertices)
+            self.buffer = self.ctx.buffer(reserve=self.vertices.nbytes, usage="dynamic")
+            self.geometry = self.ctx.geometry(
+                [BufferDescription(self.buffer, "2f", ["in_vert"])]
+            )
+            self.dirty = True
+
+        if self.dirty:
+            self.buffer.write(self.vertices)
+            self.dirty = False
+
+        self.program["color"] = self.color
+        self.geometry.render(self.program, mode=self.ctx.TRIANGLES, vertices=len(self.vertices))
+
+
+LINE_BATCH_VERTEX_SHADER = """
+#version 330
+
+// scale and offset of the x and y axis that map data to screen coordinates
+uniform vec4 transform;
+
+in vec2 in_vert;
+in float in_series;
+
+out float v_series;
+
+void main() {
+    vec2 position = in_vert * transform.xz + transform.yw;
+    gl_Position = vec4(position, 0.0, 1.0);
+    v_series = in_series;
+}
+"""
+
+LINE_BATCH_GEOMETRY_SHADER = """
+#version 330
+
+layout (lines) in;
+layout (triangle_strip, max_vertices = 4) out;
+
+uniform WindowBlock {
+    mat4 projection;
+    mat4 view;
+} window;
+
+uniform float line_width;
+
+// one texel with the color of each series
+uniform sampler2D colors;
+
+in float v_series[];
+
+out vec4 g_color;
+
+void main() {
+    // skip unused rows and the segments between two series
+    if (v_series[0] < 0.0 || v_series[0] != v_series[1]) {
+        return;
+    }
+    vec4 color = texelFetch(colors, ivec2(int(v_series[0]), 0), 0);
+
+    vec2 start = gl_in[0].gl_Position.xy;
+    vec2 end = gl_in[1].gl_Position.xy;
+
+    vec2 direction = end - start;
+    direction = length(direction) > 0.0 ? normalize(direction) : vec2(1.0, 0.0);
+    direction *= line_width / 2.0;
+    vec2 normal = vec2(-direction.y, direction.x);
+
+    // the segments are extended by half the line width to close the joints
+    start -= direction;
+    end += direction;
+
+    mat4 projection = window.projection * window.view;
+    g_color = color;
+    gl_Position = projection * vec4(start + normal, 0.0, 1.0);
+    EmitVertex();
+    g_color = color;
+    gl_Position = projection * vec4(start - normal, 0.0, 1.0);
+    EmitVertex();
+    g_color = color;
+    gl_Position = projection * vec4(end + normal, 0.0, 1.0);
+    EmitVertex();
+    g_color = color;
+    gl_Position = projection * vec4(end - normal, 0.0, 1.0);
+    EmitVertex();
+    EndPrimitive();
+}
+"""
+
+LINE_BATCH_FRAGMENT_SHADER = """
+#version 330
+
+in vec4 g_color;
+
+out vec4 f_color;
+
+void main() {
+    f_color = g_color;
+}
+"""
+
+
+BAND_BATCH_GEOMETRY_SHADER = """
+#version 330
+
+layout (triangles) in;
+layout (triangle_strip, max_vertices = 3) out;
+
+uniform WindowBlock {
+    mat4 projection;
+    mat4 view;
+} window;
+
+uniform float opacity;
+
+// one texel with the color of each series
+uniform sampler2D colors;
+
+in float v_series[];
+
+out vec4 g_color;
+
+void main() {
+    // skip unused rows and the triangles between two series
+    if (v_series[0] < 0.0 || v_series[0] != v_series[1] || v_series[0] != v_series[2]) {
+        return;
+    }
+    vec4 color = texelFetch(colors, ivec2(int(v_series[0]), 0), 0);
+    color.a *= opacity;
+
+    mat4 projection = window.projection * window.view;
+    for (int i = 0; i < 3; i++) {
+        g_color = color;
+        gl_Position = projection * gl_in[i].gl_Position;
+        EmitVertex();
+    }
+    EndPrimitive();
+}
+"""
+
+
+def get_axis_transform(
+    old_min: float,
+    old_max: float,
+    new_min: float,
+    new_max: float,
+) -> tuple[float, float]:
+    """Returns the scale and offset that map [old_min, old_max] to [new_min, new_max]."""
+    old_range = old_max - old_min
+    new_range = new_max - new_min
+    scale = new_range / old_range if old_range > 0 else new_range
+    return scale, new_min - old_min * scale
+
+
+class LineBatch:
+    """Line strips of several series that are drawn with a single draw call.
+
+    Every series owns a region of `capacity` rows in one persistent vertex
+    buffer. A vertex consists of its x and y value in data coordinates and the
+    index of its series, unused rows have the index -1. The whole buffer is drawn
+    as one line strip and a geometry shader skips all segments that touch an
+    unused row or connect two series.
+
+    The vertices are mapped to the screen by the transform passed to draw(), so
+    changing the axis limits requires no upload. set_vertices() only uploads the
+    rows that differ from the current vertices of a series, i.e. appending to a
+    line only writes the new rows. Drawing unchanged lines only issues a draw call.
+
+    Args:
+        colors: RGBA color of each series.
+        line_width: Width of the lines in pixels.
+        capacity: Initial number of vertices per series.
+    """
+
+    program_name = "line_batch"
+    shaders = {
+        "vertex_shader": LINE_BATCH_VERTEX_SHADER,
+        "geometry_shader": LINE_BATCH_GEOMETRY_SHADER,
+        "fragment_shader": LINE_BATCH_FRAGMENT_SHADER,
+    }
+
+    def __init__(
+        self,
+        colors: list[tuple[int, int, int, int]],
+        line_width: float = 2,
+        capacity: int = 1024,
+    ) -> None:
+        self.colors = np.array(colors, dtype=np.uint8).reshape(-1, 4)
+        self.num_series = len(self.colors)
+        self.line_width = line_width
+
+        self.capacity = capacity
+        self.sizes = np.zeros(self.num_series, dtype=np.int64)
+        self.vertices = self._create_vertices(capacity)
+
+        # row ranges that have to be uploaded before the next draw
+        self.dirty_ranges = [(0, len(self.vertices))]
+
+        self.ctx = None
+        self.gpu_capacity = 0
+
+    def _create_vertices(self, capacity: int) -> np.ndarray:
+        vertices = np.zeros((self.num_series * capacity, 3), dtype=np.float32)
+        vertices[:, 2] = -1
+        return vertices
+
+    def _grow(self, min_capacity: int) -> None:
+        capacity = max(min_capacity, 2 * self.capacity)
+        vertices = self._create_vertices(capacity)
+        for i, size in enumerate(self.sizes):
+            old_start = i * self.capacity
+            vertices[i * capacity : i * capacity + size] = self.vertices[
+                old_start : old_start + size
+            ]
+        self.vertices = vertices
+        self.capacity = capacity
+        self.dirty_ranges = [(0, len(self.vertices))]
+
+    def set_vertices(self, series: int, vertices) -> None:
+        """Replaces the vertices of a series.
+
+        Args:
+            series: Index of the series.
+            vertices: (n, 2) array of the x and y values of the vertices.
+        """
+        vertices = np.asarray(vertices, dtype=np.float32).reshape(-1, 2)
+        n = len(vertices)
+        if n > self.capacity:
+            self._grow(n)
+
+        start = series * self.capacity
+        region = self.vertices[start : start + self.capacity]
+        old_n = int(self.sizes[series])
+
+        # find the first row that differs from the current vertices
+        common_rows = min(n, old_n)
+        changed = np.any(region[:common_rows, :2] != vertices[:common_rows], axis=1)
+        first_changed_row = int(np.argmax(changed)) if changed.any() else common_rows
+
+        region[first_changed_row:n, :2] = vertices[first_changed_row:]
+        region[first_changed_row:n, 2] = series
+        # rows that are no longer used
+        region[n:old_n, 2] = -1
+        self.sizes[series] = n
+
+        end_row = max(n, old_n)
+        if first_changed_row < end_row:
+            self.dirty_ranges.append((start + first_changed_row, start + end_row))
+
+    def set_uniforms(self) -> None:
+        self.program["line_width"] = self.line_width
+
+    def render(self) -> None:
+        self.geometry.render(self.program, mode=self.ctx.LINE_STRIP, vertices=len(self.vertices))
+
+    def draw(self, transform: tuple[float, float, float, float]) -> None:
+        """Draws all series.
+
+        Args:
+            transform: Scale and offset of the x axis followed by scale and offset of
+                the y axis, see get_axis_transform().
+        """
+        if self.num_series == 0 or self.sizes.max() < 2:
+            return
+
+        if self.ctx is None:
+            self.ctx = arcade.get_window().ctx
+            self.program = get_program(self.ctx, self.program_name, **self.shaders)
+            self.color_texture = self.ctx.texture(
+                (self.num_series, 1),
+                components=4,
+                data=self.colors.tobytes(),
+                filter=(self.ctx.NEAREST, self.ctx.NEAREST),
+            )
+
+        # the vertices have grown beyond the size of the gpu buffer
+        if self.gpu_capacity < len(self.vertices):
+            self.gpu_capacity = len(self.vertices)
+            self.buffer = self.ctx.buffer(reserve=self.vertices.nbytes, usage="dynamic")
+            self.geometry = self.ctx.geometry(
+                [BufferDescription(self.buffer, "2f 1f", ["in_vert", "in_series"])]
+            )
+            self.dirty_ranges = [(0, len(self.vertices))]
+
+        row_size = self.vertices.itemsize * self.vertices.shape[1]
+        for start, end in self.dirty_ranges:
+            self.buffer.write(self.vertices[start:end], offset=start * row_size)
+        self.dirty_ranges.clear()
+
+        self.color_texture.use(0)
+        self.program["colors"] = 0
+        self.program["transform"] = transform
+        self.set_uniforms()
+        self.render()
+
+
+class BandBatch(LineBatch):
+    """Filled bands of several series that are drawn with a single draw call.
+
+    The vertices of a band alternate between its lower and upper boundary, i.e.
+    rows 2 * i and 2 * i + 1 hold the lower and the upper value at the same x.
+    Otherwise it works like a LineBatch, see there.
+
+    Args:
+        colors: RGBA color of each series.
+        opacity: Factor applied to the alpha value of the colors.
+        capacity: Initial number of vertices per series.
+    """
+
+    program_name = "band_batch"
+    shaders = {
+        "vertex_shader": LINE_BATCH_VERTEX_SHADER,
+        "geometry_shader": BAND_BATCH_GEOMETRY_SHADER,
+        "fragment_shader": LINE_BATCH_FRAGMENT_SHADER,
+    }
+
+    def __init__(
+        self,
+        colors: list[tuple[int, int, int, int]],
+        opacity: float = 0.25,
+        capacity: int = 1024,
+    ) -> None:
+        super().__init__(colors=colors, capacity=capacity)
+        self.opacity = opacity
+
+    def set_uniforms(self) -> None:
+        self.program["opacity"] = self.opacity
+
+    def render(self) -> None:
+        self.geometry.render(
+            self.program, mode=self.ctx.TRIANGLE_STRIP, vertices=len(self.vertices)
+        )
@@ -1,9 +1,17 @@
 from __future__ import annotations
 
+import math
+import os
+from collections import deque
+
 import arcade
 import numpy as np
 
 from mesarcade.figure import Figure
+from mesarcade.colormap import ColorMap
+from mesarcade.ensemble import Ensemble
+from mesarcade.gpu import BandBatch, LineBatch, get_axis_transform
+from mesarcade.series import DecimatedSeries, WindowedSeries
 from mesarcade.utils import parse_color
 
 from typing import TYPE_CHECKING
@@ -16,33 +24,20 @@ if TYPE_CHECKING:
 # Type alias for color values
 Color = str | tuple[int, int, int] | tuple[int, int, int, int]
 
+DEFAULT_COLORS = [
+    arcade.color.NAVY_BLUE,
+    arcade.color.ORANGE,
+    arcade.color.GREEN,
+    arcade.color.RED,
+    arcade.color.PINK,
+    arcade.color.PURPLE,
+]
 
-def rescale(value, old_min, old_max, new_min, new_max):
-    old_range = old_max - old_min
-    new_range = new_max - new_min
-    if old_range > 0:
-        return (value - old_min) / old_range * new_range + new_min
-    else:
-        return (value - old_min) * new_range + new_min
-
-
-def rescale_array_column_inplace(
-    np_array: np.ndarray,
-    col: int,
-    old_min: float,
-    old_max: float,
-    new_min: float,
-    new_max: float,
-) -> None:
-    values = np_array[:, col]
-
-    old_range = old_max - old_min
-    new_range = new_max - new_min
+# color map of plots with more lines than default colors
+DEFAULT_COLOR_MAP = "turbo"
 
-    if old_range > 0:
-        values[:] = (values - old_min) / old_range * new_range + new_min
-    else:
-        values[:] = (values - old_min) * new_range + new_min
+# alpha value of the lines of the most recent previous run
+PREVIOUS_RUN_ALPHA = 110
 
 
 class _ModelHistoryPlot:
@@ -52,20 +47,39 @@ class _ModelHistoryPlot:
         ylim: list[float | None, float | None] | None = None,
         labels: list[str] | None = None,
         colors: list[str] | None = None,
+        color_map: str | None = None,
         rendering_step: int = 5,
+        sample_step: int = 1,
         title=None,
         legend: bool = True,
         from_datacollector: bool = False,
+        history_dir: str | os.PathLike | None = None,
+        window: int | None = None,
+        replicates: int = 0,
+        quantiles: tuple[float, float] = (0.1, 0.9),
+        keep_runs: int = 0,
     ):
         self.model_attrs = model_attributes
         self.lower_y_lim = ylim[0] if ylim is not None else None
         self.upper_y_lim = ylim[1] if ylim is not None else None
         self.labels = labels
         self.rendering_step = rendering_step
+        self.sample_step = sample_step
         self.legend = legend
         self.title = title
         self.from_datacollector = from_datacollector
-        self.colors = None
+        self.history_dir = history_dir
+        self.window = window
+        self.replicates = replicates
+        self.quantiles = quantiles
+        self.ensemble = None
+        self.keep_runs = keep_runs
+        self.colors = colors
+
+        # decimated lines of the previous runs, the most recent first
+        self.previous_runs = deque(maxlen=max(keep_runs, 0))
+        self.previous_lines = None
+        self.previous_max_x = 0
 
         self.padding = 10
 
@@ -73,19 +87,36 @@ class _ModelHistoryPlot:
 
         if colors is not None:
             self.colors = [parse_color(color) for color in colors]
-        else:
+        elif color_map is not None or len(self.model_attrs) > len(DEFAULT_COLORS):
+            # sample one color per line from the color map
+            num_lines = len(self.model_attrs)
             self.colors = [
-                arcade.color.NAVY_BLUE,
-                arcade.color.ORANGE,
-                arcade.color.GREEN,
-                arcade.color.RED,
-                arcade.color.PINK,
-                arcade.color.PURPLE,
+                tuple(color)
+                for color in ColorMap(
+                    color_map=color_map if color_map is not None else DEFAULT_COLOR_MAP,
+                    vmin=0,
+                    vmax=max(num_lines - 1, 1),
+                    num_colors=num_lines,
+                ).lut.tolist()
             ]
+        else:
+            self.colors = DEFAULT_COLORS[: len(self.model_attrs)]
 
     def validate_input(self):
-        if len(self.model_attrs) > 6:
-            raise ValueError("Only 6 lines allowed!")
+        if self.keep_runs < 0:
+            raise ValueError("The argument keep_runs must not be negative.")
+
+        if self.replicates < 0:
+            raise ValueError("The argument replicates must not be negative.")
+
+        if not 0 <= self.quantiles[0] <= self.quantiles[1] <= 1:
+            raise ValueError("The argument quantiles must be two increasing values in [0, 1].")
+
+        if self.window is not None:
+            if self.window < 2:
+                raise ValueError("The argument window must be at least 2.")
+            if self.history_dir is not None:
+                raise ValueError("The arguments window and history_dir cannot be combined.")
 
         if self.labels is not None:
             if len(self.model_attrs) != len(self.labels):
@@ -117,12 +148,50 @@ class _ModelHistoryPlot:
         self.plot_area_width = self.width * (0.85 - 0.025)
         self.plot_area_height = self.height * (0.7 - 0.025)
 
-        self.data_dict = {model_attr: [] for model_attr in self.model_attrs}
-        self.scaled_data_dict = {model_attr: [] for model_attr in self.model_attrs}
+        # keep the lines of the run that is replaced by this setup
+        if self.keep_runs > 0 and hasattr(self, "data_dict"):
+            self.store_previous_run()
+
+        # the files of the replaced run are unmapped before they are overwritten
+        if self.history_dir is not None and hasattr(self, "data_dict"):
+            for series in self.data_dict.values():
+                series.close()
+
+        # every plot of a canvas has its own subdirectory
+        plot_dir = None
+        if self.history_dir is not None:
+            plot_dir = os.path.join(
+                self.history_dir, f"plot_{self.renderer.figures.index(self.figure) + 1}"
+            )
+
+        self.data_dict = {
+            model_attr: self.create_series(
+                directory=(
+                    os.path.join(plot_dir, f"series_{i}") if plot_dir is not None else None
+                )
+            )
+            for i, model_attr in enumerate(self.model_attrs)
+        }
+
+        # lines are decimated to about two points per horizontal pixel
+        self.max_points = max(4, int(2 * (self.plot_area_width - 2 * self.padding)))
+
+        # all lines share one vertex buffer and are drawn with one draw call
+        line_colors = list(self.colors)
+        if self.replicates > 0:
+            # the ensemble means are drawn as half transparent lines
+            line_colors += [(*color[:3], color[3] // 2) for color in self.colors]
+        self.lines = LineBatch(colors=line_colors, line_width=2, capacity=self.max_points + 64)
+
+        self.setup_ensemble()
         self.min_y = self.lower_y_lim
         self.max_y = self.upper_y_lim
         self.min_x = 0
         self.max_x = 0
+        self.transform = (1, 0, 1, 0)
+        self.refreshed_tick = 0
+
+        self.setup_previous_runs()
 
         self.create_plot_area()
         self.create_axis_ticks()
@@ -131,6 +200,108 @@ class _ModelHistoryPlot:
         if self.legend:
             self.create_legend()
 
+    def store_previous_run(self):
+        # copies, as the buffers of the run may be reused by the next run
+        views = [
+            series.get_view(max_points=self.max_points).copy()
+            for series in self.data_dict.values()
+        ]
+        if max(len(view) for view in views) >= 2:
+            self.previous_runs.appendleft(views)
+
+    def setup_previous_runs(self):
+        colors = []
+        views = []
+        for age, run in enumerate(self.previous_runs):
+            # older runs are more transparent
+            alpha = int(PREVIOUS_RUN_ALPHA * (1 - age / len(self.previous_runs)))
+            for color, view in zip(self.colors, run):
+                colors.append((*color[:3], alpha))
+                views.append(view)
+
+        if not views:
+            self.previous_lines = None
+            return
+
+        # the previous runs are frozen into a static vertex buffer that is never updated
+        self.previous_lines = LineBatch(
+            colors=colors,
+            line_width=1.5,
+            capacity=max(len(view) for view in views),
+        )
+        for i, view in enumerate(views):
+            self.previous_lines.set_vertices(i, view)
+
+        # the axes include the previous runs
+        all_points = np.concatenate(views)
+        self.previous_max_x = all_points[:, 0].max()
+        if self.lower_y_lim is None:
+            self.min_y = all_points[:, 1].min()
+        if self.upper_y_lim is None:
+            self.max_y = all_points[:, 1].max()
+
+    def create_series(self, directory=None):
+        if self.window is not None:
+            return WindowedSeries(window=self.window)
+        return DecimatedSeries(directory=directory)
+
+    def setup_ensemble(self):
+        # the replicates of the previous model are no longer needed
+        if self.ensemble is not None:
+            self.ensemble.stop()
+            self.ensemble = None
+
+        if self.replicates == 0:
+            return
+
+        self.ensemble = Ensemble(
+            model_class=self.renderer.model_class,
+            parameters=dict(self.renderer.parameter_dict),
+            metrics=self.model_attrs,
+            num_replicates=self.replicates,
+            quantiles=self.quantiles,
+            from_datacollector=self.from_datacollector,
+            sample_step=self.sample_step,
+        )
+
+        # mean, lower and upper quantile of each model attribute
+        self.ensemble_dict = {
+            model_attr: (self.create_series(), self.create_series(), self.create_series())
+            for model_attr in self.model_attrs
+        }
+        self.bands = BandBatch(colors=self.colors, capacity=2 * (self.max_points + 64))
+
+    def update_ensemble(self):
+        result = self.ensemble.poll()
+        if result is None:
+            return
+
+        ticks, mean, lower, upper = result
+        for i, model_attr in enumerate(self.model_attrs):
+            for series, values in zip(self.ensemble_dict[model_attr], (mean, lower, upper)):
+                finite = np.isfinite(values[:, i])
+                series.extend(np.column_stack((ticks[finite], values[finite, i])))
+
+        # the y limits include the bands
+        if self.lower_y_lim is None and np.isfinite(lower).any():
+            self.min_y = min(self.min_y, np.nanmin(lower))
+        if self.upper_y_lim is None and np.isfinite(upper).any():
+            self.max_y = max(self.max_y, np.nanmax(upper))
+
+    def get_band(self, lower, upper):
+        # the upper boundary defines the x values of the band
+        upper = upper.get_view(max_points=self.max_points)
+        lower = lower.get_view(max_points=self.max_points)
+        if len(upper) == 0 or len(lower) == 0:
+            return np.empty((0, 2))
+
+        # rows alternate between the lower and the upper boundary
+        band = np.empty((2 * len(upper), 2))
+        band[0::2, 0] = band[1::2, 0] = upper[:, 0]
+        band[0::2, 1] = np.interp(upper[:, 0], lower[:, 0], lower[:, 1])
+        band[1::2, 1] = upper[:, 1]
+        return band
+
     def create_plot_area(self):
         background = arcade.shape_list.create_rectangle_filled(
             center_x=self.plot_area_x + self.plot_area_width / 2,
@@ -207,13 +378,14 @@ class _ModelHistoryPlot:
         else:
             labels = ["no label"] * len(self.model_attrs)
 
+        # the legend has 3 rows and more columns if there are more than 6 lines
+        num_columns = max(2, math.ceil(len(labels) / 3))
+        column_width = self.figure.width / num_columns
+
         for i, label in enumerate(labels):
-            if i % 2 == 0:
+            if i % num_columns == 0:
                 label_y -= self.font_size * 2
-            if i % 2 != 0:
-                label_x_ = label_x + self.figure.width / 2
-            else:
-                label_x_ = label_x
+            label_x_ = label_x + (i % num_columns) * column_width
 
             label_element = arcade.Text(
                 text=label,
@@ -234,28 +406,22 @@ class _ModelHistoryPlot:
             )
             self.figure.shape_list.append(color_dot)
 
-    def update(self):
+    def sample(self):
         # get the current time step
         tick = self.renderer.tick
 
-        # check if it is time to update
-        if tick % self.rendering_step == 0 or tick <= 1:
+        # check if it is time to record the data
+        # the replicates may run until the current tick
+        if self.ensemble is not None:
+            self.ensemble.set_target_tick(tick)
+
+        if tick % self.sample_step == 0 or tick <= 1:
             # for each model attribute that has to be collected
             for model_attr in self.model_attrs:
-                # model attribute was given as string?
-                if isinstance(model_attr, str):
-                    # get the value from a model attribute
-                    if not self.from_datacollector:
-                        y = getattr(self.model, model_attr)
-
-                    # or get the value from the datacollector
-                    else:
-                        y_data = self.model.datacollector.model_vars[model_attr]
-                        y = y_data[-1] if len(y_data) > 0 else None
-
-                # or as lambda?
-                else:
-                    y = model_attr(self.model)
+                # the value is shared with all other consumers of the same metric
+                y = self.renderer.metrics.get(
+                    model_attr, from_datacollector=self.from_datacollector
+                )
 
                 # set min and max values initially
                 if self.max_y is None:
@@ -266,7 +432,7 @@ class _ModelHistoryPlot:
                 # if there valid new data
                 if y is not None and np.isfinite(y):
                     # add new data point
-                    self.data_dict[model_attr].append((tick, y))
+                    self.data_dict[model_attr].append(tick, y)
 
                     # update min and max values
                     if self.lower_y_lim is None:
@@ -277,27 +443,43 @@ class _ModelHistoryPlot:
                         if y > self.max_y:
                             self.max_y = y
 
-                # Rescale the data
-                # TODO: Optimize this with numpy
-                self.scaled_data_dict[model_attr] = [
-                    (
-                        rescale(
-                            value=x,
-                            old_min=0,
-                            old_max=tick,
-                            new_min=self.plot_area_x + self.padding,
-                            new_max=self.plot_area_x + self.plot_area_width - self.padding,
-                        ),
-                        rescale(
-                            value=y,
-                            old_min=self.min_y,
-                            old_max=self.max_y,
-                            new_min=self.plot_area_y + self.padding,
-                            new_max=self.plot_area_y + self.plot_area_height - self.padding,
-                        ),
-                    )
-                    for x, y in self.data_dict[model_attr]
-                ]
+    def poll(self):
+        # the ensemble results are applied when the plot is updated
+        pass
+
+    def update(self):
+        # get the current time step
+        tick = self.renderer.tick
+
+        # nothing has been sampled yet
+        if self.min_y is None or self.max_y is None:
+            return
+
+        # check if it is time to refresh the plot, ticks may be skipped by the renderer
+        if tick - self.refreshed_tick >= self.rendering_step or tick <= 1:
+            self.refreshed_tick = tick
+            views = [
+                self.data_dict[model_attr].get_view(max_points=self.max_points)
+                for model_attr in self.model_attrs
+            ]
+            band_views = []
+            if self.ensemble is not None:
+                self.update_ensemble()
+                for mean, lower, upper in self.ensemble_dict.values():
+                    views.append(mean.get_view(max_points=self.max_points))
+                    band_views.append(self.get_band(lower, upper))
+            self.max_x = tick if self.window is not None else max(tick, self.previous_max_x)
+
+            # in window mode, the axes only span the kept data points
+            if self.window is not None:
+                self.update_window_limits(views + band_views)
+
+            # upload the decimated data, which is rescaled on the gpu
+            for i, view in enumerate(views):
+                self.lines.set_vertices(i, view)
+            for i, view in enumerate(band_views):
+                self.bands.set_vertices(i, view)
+            self.update_transform()
 
             # update lower y_label
             str_min_y_label = str(round(self.min_y, 3))
@@ -323,38 +505,122 @@ class _ModelHistoryPlot:
                     self.plot_area_x - (len(str_max_y_label) + 2) * self.font_size / 1.5
                 )
 
-    def draw(self):
+    def update_window_limits(self, views):
+        # the views contain the extremes of the kept data points
+        views = [view for view in views if len(view) > 0]
+        if not views:
+            return
+
+        self.min_x = min(
+            series.first_x for series in self.data_dict.values() if len(series) > 0
+        )
+        if self.lower_y_lim is None:
+            self.min_y = min(view[:, 1].min() for view in views)
+        if self.upper_y_lim is None:
+            self.max_y = max(view[:, 1].max() for view in views)
+
+    def draw_previous_runs(self):
+        # the previous runs may exceed the axes of the current run
+        window = self.renderer.window
+        ctx = window.ctx
+        pixel_ratio = window.get_pixel_ratio()
+        ctx.scissor = (
+            int(self.plot_area_x * pixel_ratio),
+            int(self.plot_area_y * pixel_ratio),
+            int(self.plot_area_width * pixel_ratio),
+            int(self.plot_area_height * pixel_ratio),
+        )
+        self.previous_lines.draw(self.transform)
+        ctx.scissor = None
+
+    def get_history(self, copy: bool = True) -> dict[str, np.ndarray]:
+        history = {}
         for i, model_attr in enumerate(self.model_attrs):
-            arcade.draw_line_strip(
-                self.scaled_data_dict[model_attr],
-                color=self.colors[i],
-                line_width=2,
-            )
+            if self.labels is not None:
+                name = self.labels[i]
+            elif isinstance(model_attr, str):
+                name = model_attr
+            else:
+                name = f"series_{i}"
+            values = self.data_dict[model_attr].values
+            # copies, as the buffers are reused by the next run
+            history[name] = np.array(values) if copy else values
+        return history
+
+    def update_transform(self):
+        x_scale, x_offset = get_axis_transform(
+            old_min=self.min_x,
+            old_max=self.max_x,
+            new_min=self.plot_area_x + self.padding,
+            new_max=self.plot_area_x + self.plot_area_width - self.padding,
+        )
+        y_scale, y_offset = get_axis_transform(
+            old_min=self.min_y,
+            old_max=self.max_y,
+            new_min=self.plot_area_y + self.padding,
+            new_max=self.plot_area_y + self.plot_area_height - self.padding,
+        )
+        self.transform = (x_scale, x_offset, y_scale, y_offset)
+
+    def draw(self):
+        # idle frames only issue the draw calls of the persistent vertex buffers
+        if self.previous_lines is not None:
+            self.draw_previous_runs()
+        if self.ensemble is not None:
+            self.bands.draw(self.transform)
+        self.lines.draw(self.transform)
 
 
 class ModelHistoryPlot(Figure):
     """A line plot that displays the history of model attributes over time.
 
     Tracks one or more model attributes and visualizes their values as lines
-    over the course of the simulation. Supports up to 6 lines.
+    over the course of the simulation. Any number of lines is supported, they
+    are drawn together with a single draw call.
 
     Args:
         model_attributes: List of model attributes to track. Each element can be
-            a string (attribute name) or a callable that takes a mesa.Model and
-            returns a numeric value.
+            a string (attribute name, dotted paths are allowed) or a callable
+            that takes a mesa.Model and returns a numeric value.
         ylim: Optional y-axis limits as [min, max]. If None, limits are
             determined automatically from the data. Individual elements can be
             None to auto-scale only that bound.
         labels: Optional labels for the legend. If None, attribute names are
             used for string attributes, or "no label" for callables.
         colors: Optional colors for the lines. Accepts color names, RGB tuples,
-            or RGBA tuples. Defaults to a predefined color palette.
+            or RGBA tuples. Defaults to a predefined color palette for up to 6
+            lines and to colors sampled from `color_map` otherwise.
+        color_map: Optional name of a matplotlib colormap from which the colors
+            of the lines are sampled if `colors` is None. Defaults to "turbo" if
+            there are more than 6 lines.
         legend: Whether to display a legend. Defaults to True.
         title: Optional title for the plot.
         from_datacollector: If True, reads values from the model's datacollector
             instead of directly from model attributes. Only works with string
             attributes. Defaults to False.
-        rendering_step: Simulation steps between plot updates. Defaults to 3.
+        rendering_step: Simulation steps between redraws of the plot. Defaults to 3.
+        sample_step: Simulation steps between recorded data points. Data points
+            are recorded independently of the rendering, so the history is
+            complete even if the plot is rarely redrawn. Defaults to 1.
+        history_dir: Optional directory in which the history is stored in
+            memory-mapped files instead of in memory. Use this for very long
+            runs. Each plot of a canvas uses the subdirectory `plot_{k}`, where
+            k is the position of the plot in the canvas, starting at 1. The
+            files of a previous run in this directory are overwritten.
+        window: Optional number of most recent data points per line that are
+            kept. The x-axis then scrolls with the simulation and the history
+            is limited to the window. Cannot be combined with `history_dir`.
+        replicates: Number of additional model instances with different seeds
+            that run in worker processes alongside the displayed model. If
+            greater than 0, the mean of the replicates is drawn as a half
+            transparent line and the range between the quantiles as a band.
+            The model class and callable model attributes are pickled for
+            the workers, so they must be importable, e.g. module-level
+            functions instead of lambdas. Defaults to 0.
+        quantiles: Lower and upper quantile of the bands. Defaults to (0.1, 0.9).
+        keep_runs: Number of previous runs whose lines are kept as faded
+            overlays after a reset, e.g. to compare parameter settings. The
+            axes include the previous runs. Defaults to 0.
     """
 
     def __init__(
@@ -363,19 +629,54 @@ class ModelHistoryPlot(Figure):
         ylim: list[float, float] | None = None,
         labels: list[str] | None = None,
         colors: list[Color] | None = None,
+        color_map: str | None = None,
         legend: bool = True,
         title: str | None = None,
         from_datacollector: bool = False,
         rendering_step: int = 3,
+        sample_step: int = 1,
+        history_dir: str | os.PathLike | None = None,
+        window: int | None = None,
+        replicates: int = 0,
+        quantiles: tuple[float, float] = (0.1, 0.9),
+        keep_runs: int = 0,
     ) -> None:
         plot = _ModelHistoryPlot(
             model_attributes=model_attributes,
             ylim=ylim,
             labels=labels,
             colors=colors,
+            color_map=color_map,
             legend=legend,
             title=title,
             rendering_step=rendering_step,
+            sample_step=sample_step,
             from_datacollector=from_datacollector,
+            history_dir=history_dir,
+            window=window,
+            replicates=replicates,
+            quantiles=quantiles,
+            keep_runs=keep_runs,
         )
         super().__init__(components=[plot], title=title, get_space=None)
+
+    def get_history(self) -> dict[str, np.ndarray]:
+        """Returns the raw history of the current run.
+
+        Returns:
+            A dict mapping the label of each line to an (n, 2) array of its ticks
+            and values. The arrays are copies that stay valid after a reset.
+        """
+        return self.components[0].get_history()
+
+    def export_history(self, path: str | os.PathLike) -> None:
+        """Saves the raw history of the current run as .npz file.
+
+        The file contains one (n, 2) array of ticks and values per line, named
+        after its label. It can be loaded with `numpy.load`.
+
+        Args:
+            path: Path of the file.
+        """
+        # memory-mapped histories are written in chunks without loading them into memory
+        np.savez(path, **self.components[0].get_history(copy=False))
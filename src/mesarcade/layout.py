@@ -0,0 +1,463 @@
+from __future__ import annotations
+
+import functools
+import hashlib
+import inspect
+import os
+import pickle
+import queue
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+import networkx as nx
+import numpy as np
+
+from mesarcade.utils import get_process_context
+
+# maximum number of layouts that are kept in memory
+MAX_CACHED_LAYOUTS = 16
+
+# (graph fingerprint, layout function) -> (n, 2) array of node positions
+_layout_cache: dict[tuple[str, Any], np.ndarray] = {}
+
+
+def get_graph_fingerprint(graph: nx.Graph) -> str:
+    """Returns a hash of the nodes and edges of a graph."""
+    hasher = hashlib.sha1()
+    hasher.update(repr(list(graph.nodes())).encode())
+    hasher.update(repr(list(graph.edges())).encode())
+    return hasher.hexdigest()
+
+
+def get_layout_name(layout: Callable[..., Any]) -> str | None:
+    """Returns a name that identifies a layout function across sessions.
+
+    Lambdas, local functions and other callables without a stable name return None.
+    """
+    module = getattr(layout, "__module__", None)
+    qualname = getattr(layout, "__qualname__", None)
+    if module is None or qualname is None or "<" in qualname:
+        return None
+    return f"{module}.{qualname}"
+
+
+def _store_layout(key: tuple[str, Any], positions: np.ndarray) -> None:
+    # forget the oldest layout if the cache is full
+    if len(_layout_cache) >= MAX_CACHED_LAYOUTS:
+        del _layout_cache[next(iter(_layout_cache))]
+    _layout_cache[key] = positions
+
+
+def _get_cache_file(fingerprint: str, layout, cache_dir) -> Path | None:
+    layout_name = get_layout_name(layout)
+    if cache_dir is None or layout_name is None:
+        return None
+    return Path(cache_dir) / f"{fingerprint}-{layout_name}.npy"
+
+
+def _get_cached_layout(key: tuple[str, Any], cache_file: Path | None) -> np.ndarray | None:
+    positions = _layout_cache.get(key)
+
+    # try to load the layout from the disk
+    if positions is None and cache_file is not None and cache_file.exists():
+        positions = np.load(cache_file)
+        _store_layout(key, positions)
+
+    return positions
+
+
+def _save_layout(positions: np.ndarray, cache_file: Path | None) -> None:
+    if cache_file is not None and not cache_file.exists():
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        np.save(cache_file, positions)
+
+
+def get_layout(
+    graph: nx.Graph,
+    layout: Callable[..., dict[Any, Any]],
+    cache_dir: str | os.PathLike | None = None,
+) -> dict[Any, np.ndarray]:
+    """Computes the layout of a graph or reuses a previously computed one.
+
+    Layouts are memoized per graph fingerprint and layout function, so all
+    artists, figures and resets that show the same graph share one layout. If
+    `cache_dir` is given, layouts of named layout functions are also stored on
+    disk and reused in later sessions.
+
+    Returns:
+        A dict that maps every node to a fresh copy of its position.
+    """
+    nodes = list(graph.nodes())
+    fingerprint = get_graph_fingerprint(graph)
+    key = (fingerprint, layout)
+    cache_file = _get_cache_file(fingerprint, layout, cache_dir)
+
+    positions = _get_cached_layout(key, cache_file)
+
+    # compute the layout
+    if positions is None:
+        layout_positions = layout(graph)
+        positions = np.array([layout_positions[node] for node in nodes], dtype=np.float64)
+        _store_layout(key, positions)
+
+    _save_layout(positions, cache_file)
+
+    return {node: positions[i].copy() for i, node in enumerate(nodes)}
+
+
+@functools.lru_cache(maxsize=4)
+def _get_repulsion_kernels(grid_size: int) -> tuple[np.ndarray, np.ndarray]:
+    """Returns the Fourier transforms of the repulsion kernels of a grid.
+
+    The kernels hold the repulsive force r / |r|^2 between two grid points in units
+    of the grid spacing. They are arranged for a linear convolution on a grid that
+    is padded to twice its size.
+    """
+    padded_size = 2 * grid_size
+    offsets = np.arange(padded_size)
+    offsets[offsets >= grid_size] -= padded_size
+    dx, dy = np.meshgrid(offsets, offsets, indexing="ij")
+
+    squared_distance = (dx**2 + dy**2).astype(np.float64)
+    squared_distance[0, 0] = 1
+    kernel_x = dx / squared_distance
+    kernel_y = dy / squared_distance
+    kernel_x[0, 0] = 0
+    kernel_y[0, 0] = 0
+
+    return np.fft.rfft2(kernel_x), np.fft.rfft2(kernel_y)
+
+
+def _get_repulsion(positions: np.ndarray, k: float, grid_size: int) -> np.ndarray:
+    """Approximates the repulsive forces between all pairs of nodes on a grid.
+
+    The nodes are spread onto a grid with cloud-in-cell weights, the force field
+    of the grid is computed by a FFT convolution and interpolated back to the nodes
+    with the same weights. This costs O(n + g^2 log g) instead of O(n^2) and
+    underestimates the forces between nodes closer than one grid cell.
+    """
+    g = grid_size
+    lower = positions.min(axis=0)
+    extent = (positions.max(axis=0) - lower).max()
+    if extent <= 0:
+        extent = 1.0
+    spacing = extent / (g - 1)
+
+    # grid cell and position within the cell of every node
+    grid_positions = (positions - lower) / spacing
+    cells = np.clip(np.floor(grid_positions).astype(np.intp), 0, g - 2)
+    fractions = grid_positions - cells
+    fx, fy = fractions[:, 0], fractions[:, 1]
+
+    # flat indices and weights of the four surrounding grid points
+    flat = cells[:, 0] * g + cells[:, 1]
+    corners = (flat, flat + g, flat + 1, flat + g + 1)
+    weights = ((1 - fx) * (1 - fy), fx * (1 - fy), (1 - fx) * fy, fx * fy)
+
+    density = np.zeros(g * g)
+    for corner, weight in zip(corners, weights):
+        density += np.bincount(corner, weights=weight, minlength=g * g)
+
+    # convolve the density with the repulsion kernels
+    padded_density = np.zeros((2 * g, 2 * g))
+    padded_density[:g, :g] = density.reshape(g, g)
+    density_hat = np.fft.rfft2(padded_density)
+    kernel_x_hat, kernel_y_hat = _get_repulsion_kernels(g)
+    shape = padded_density.shape
+    field_x = np.fft.irfft2(density_hat * kernel_x_hat, s=shape)[:g, :g].ravel()
+    field_y = np.fft.irfft2(density_hat * kernel_y_hat, s=shape)[:g, :g].ravel()
+
+    # interpolate the field back to the nodes
+    repulsion = np.zeros_like(positions)
+    for corner, weight in zip(corners, weights):
+        repulsion[:, 0] += weight * field_x[corner]
+        repulsion[:, 1] += weight * field_y[corner]
+
+    return repulsion * (k**2 / spacing)
+
+
+def force_layout(
+    G: nx.Graph,
+    k: float | None = None,
+    pos: dict[Any, Any] | None = None,
+    iterations: int = 50,
+    scale: float = 1,
+    center: Any = None,
+    dim: int = 2,
+    seed: int | np.random.Generator | None = None,
+    grid_size: int = 128,
+) -> dict[Any, np.ndarray]:
+    """Fast force-directed layout for large graphs.
+
+    A vectorized Fruchterman-Reingold layout with the same call signature as
+    `nx.spring_layout`. Repulsion is approximated on a grid, so a single
+    iteration costs O(nodes + edges) and graphs with 100k+ nodes are laid out
+    in seconds. Edge weights are ignored.
+
+    Args:
+        G: The graph.
+        k: Optimal distance between nodes. Defaults to 1/sqrt(n).
+        pos: Optional initial positions of the nodes.
+        iterations: Number of iterations.
+        scale: Scale of the returned positions.
+        center: Center of the returned positions.
+        dim: Dimension of the layout. Only 2 is supported.
+        seed: Seed for the random initial positions.
+        grid_size: Number of grid points per axis used to approximate repulsion.
+
+    Returns:
+        A dict that maps every node to its position.
+    """
+    *_, layout_positions = _iterate_force_layout(
+        G,
+        k=k,
+        pos=pos,
+        iterations=iterations,
+        scale=scale,
+        center=center,
+        dim=dim,
+        seed=seed,
+        grid_size=grid_size,
+    )
+    return layout_positions
+
+
+def _iterate_force_layout(
+    G: nx.Graph,
+    k: float | None = None,
+    pos: dict[Any, Any] | None = None,
+    iterations: int = 50,
+    scale: float = 1,
+    center: Any = None,
+    dim: int = 2,
+    seed: int | np.random.Generator | None = None,
+    grid_size: int = 128,
+    iterations_per_update: int | None = None,
+) -> Iterator[dict[Any, np.ndarray]]:
+    """Yields the intermediate positions of force_layout(), see there for the arguments.
+
+    The temperature keeps cooling down across the updates, so the last positions
+    equal the result of an uninterrupted run with the same arguments.
+
+    Args:
+        iterations_per_update: Number of iterations between two yielded positions.
+            Defaults to `iterations`, i.e. only the final positions are yielded.
+    """
+    if dim != 2:
+        raise ValueError("`force_layout` only supports 2 dimensions.")
+
+    nodes = list(G.nodes())
+    n = len(nodes)
+    center = np.zeros(2) if center is None else np.asarray(center, dtype=np.float64)
+    if n == 0:
+        yield {}
+        return
+    if n == 1:
+        yield {nodes[0]: center.copy()}
+        return
+
+    rng = np.random.default_rng(seed)
+    positions = rng.random((n, 2))
+    if pos is not None:
+        for i, node in enumerate(nodes):
+            if node in pos:
+                positions[i] = pos[node]
+
+    node_index = {node: i for i, node in enumerate(nodes)}
+    edges = np.array([(node_index[u], node_index[v]) for u, v in G.edges()], dtype=np.intp)
+    edges = edges.reshape(-1, 2)
+    edges = edges[edges[:, 0] != edges[:, 1]]
+
+    if k is None:
+        k = np.sqrt(1 / n)
+    if iterations_per_update is None:
+        iterations_per_update = max(iterations, 1)
+
+    def rescaled_positions():
+        # rescale_layout works in place
+        return dict(zip(nodes, nx.rescale_layout(positions.copy(), scale=scale) + center))
+
+    # the temperature limits the displacement and cools down linearly
+    temperature = 0.1 * (positions.max(axis=0) - positions.min(axis=0)).max()
+    cooling = temperature / (iterations + 1)
+
+    for iteration in range(1, iterations + 1):
+        displacement = _get_repulsion(positions, k=k, grid_size=grid_size)
+
+        # attraction along the edges with a force of d^2 / k
+        delta = positions[edges[:, 0]] - positions[edges[:, 1]]
+        distance = np.hypot(delta[:, 0], delta[:, 1])
+        attraction = delta * (distance / k)[:, np.newaxis]
+        for axis in range(2):
+            displacement[:, axis] -= np.bincount(edges[:, 0], attraction[:, axis], minlength=n)
+            displacement[:, axis] += np.bincount(edges[:, 1], attraction[:, axis], minlength=n)
+
+        length = np.hypot(displacement[:, 0], displacement[:, 1])
+        length = np.where(length < 0.01, 0.1, length)
+        positions += displacement * (temperature / length)[:, np.newaxis]
+        temperature -= cooling
+
+        if iteration % iterations_per_update == 0 and iteration < iterations:
+            yield rescaled_positions()
+
+    yield rescaled_positions()
+
+
+def _run_layout_job(graph, layout, initial_positions, iterations_per_update, result_queue):
+    """Runs in the worker process and sends (positions, done) tuples to the queue."""
+    nodes = list(graph.nodes())
+    initial_layout_positions = {node: initial_positions[i] for i, node in enumerate(nodes)}
+
+    def to_array(layout_positions):
+        return np.array([layout_positions[node] for node in nodes], dtype=np.float64)
+
+    parameters = inspect.signature(layout).parameters
+    if layout is force_layout:
+        # the temperature cools down across the updates, the last one is the final layout
+        updates = _iterate_force_layout(
+            graph, pos=initial_layout_positions, iterations_per_update=iterations_per_update
+        )
+        layout_positions = next(updates)
+        for next_layout_positions in updates:
+            result_queue.put((to_array(layout_positions), False))
+            layout_positions = next_layout_positions
+        result_queue.put((to_array(layout_positions), True))
+    elif "pos" in parameters and "iterations" in parameters:
+        # other iterative layouts restart their cooling schedule in every call, so the
+        # chunks only preview the layout and an uninterrupted run is the final layout
+        total_iterations = parameters["iterations"].default
+        if not isinstance(total_iterations, int):
+            total_iterations = 50
+
+        layout_positions = initial_layout_positions
+        for start in range(0, total_iterations, iterations_per_update):
+            iterations = min(iterations_per_update, total_iterations - start)
+            layout_positions = layout(graph, pos=layout_positions, iterations=iterations)
+            result_queue.put((to_array(layout_positions), False))
+        result_queue.put((to_array(layout(graph, pos=initial_layout_positions)), True))
+    else:
+        result_queue.put((to_array(layout(graph)), True))
+
+
+class LayoutJob:
+    """Computes a layout in a worker process and streams intermediate positions back.
+
+    Until the first result arrives, the nodes are placed randomly. Call poll()
+    regularly to receive new positions, which increments `version`. Only the
+    final layout of an uninterrupted run is put into the layout cache.
+    """
+
+    def __init__(
+        self,
+        graph: nx.Graph,
+        layout: Callable[..., dict[Any, Any]],
+        key: tuple[str, Any],
+        cache_file: Path | None,
+        iterations_per_update: int = 5,
+    ) -> None:
+        self.nodes = list(graph.nodes())
+        self.key = key
+        self.cache_file = cache_file
+        self.version = 0
+        self.done = False
+
+        # the worker receives a pickled copy of the layout function, see get_process_context()
+        try:
+            pickle.dumps(layout)
+        except (pickle.PicklingError, AttributeError, TypeError) as error:
+            raise ValueError(
+                "A background layout requires a layout function that can be pickled, "
+                "e.g. a module-level function instead of a lambda."
+            ) from error
+
+        # cheap initial placement around the origin
+        initial_positions = nx.random_layout(graph, center=(-0.5, -0.5))
+        self.positions = np.array([initial_positions[node] for node in self.nodes])
+
+        # only the structure of the graph is sent to the worker
+        worker_graph = graph.__class__()
+        worker_graph.add_nodes_from(self.nodes)
+        worker_graph.add_edges_from(graph.edges())
+
+        context = get_process_context()
+        self.queue = context.Queue()
+        self.process = context.Process(
+            target=_run_layout_job,
+            args=(worker_graph, layout, self.positions, iterations_per_update, self.queue),
+            daemon=True,
+        )
+        self.process.start()
+
+    def poll(self) -> bool:
+        """Receives the latest positions from the worker.
+
+        Returns:
+            True if new positions have arrived.
+        """
+        if self.done:
+            return False
+
+        message = None
+        while True:
+            try:
+                message = self.queue.get_nowait()
+            except queue.Empty:
+                break
+
+        if message is None:
+            return False
+
+        self.positions, self.done = message
+        self.version += 1
+
+        if self.done:
+            _store_layout(self.key, self.positions)
+            _save_layout(self.positions, self.cache_file)
+            _layout_jobs.pop(self.key, None)
+
+        return True
+
+    def get_positions(self) -> dict[Any, np.ndarray]:
+        """Returns a dict that maps every node to a fresh copy of its current position."""
+        return {node: self.positions[i].copy() for i, node in enumerate(self.nodes)}
+
+    def stop(self) -> None:
+        if self.process.is_alive():
+            self.process.terminate()
+        _layout_jobs.pop(self.key, None)
+
+
+# running layout jobs per (graph fingerprint, layout function)
+_layout_jobs: dict[tuple[str, Any], LayoutJob] = {}
+
+
+def start_layout_job(
+    graph: nx.Graph,
+    layout: Callable[..., dict[Any, Any]],
+    cache_dir: str | os.PathLike | None = None,
+) -> LayoutJob | None:
+    """Starts computing the layout of a graph in the background.
+
+    Artists showing the same graph share one job. Jobs for other graphs are
+    stopped, as their results are no longer needed.
+
+    Returns:
+        The job, or None if the layout is cached already and can be obtained
+        right away with get_layout().
+    """
+    fingerprint = get_graph_fingerprint(graph)
+    key = (fingerprint, layout)
+    cache_file = _get_cache_file(fingerprint, layout, cache_dir)
+
+    if _get_cached_layout(key, cache_file) is not None:
+        return None
+
+    if key in _layout_jobs:
+        return _layout_jobs[key]
+
+    for job in list(_layout_jobs.values()):
+        job.stop()
+
+    job = LayoutJob(graph=graph, layout=layout, key=key, cache_file=cache_file)
+    _layout_jobs[key] = job
+    return job
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Callable
+
+from mesarcade.utils import get_attribute_getter
+
+if TYPE_CHECKING:
+    import mesa
+
+    from mesarcade.renderer import Renderer
+
+Metric = str | Callable[["mesa.Model"], Any]
+
+
+class MetricSampler:
+    """Evaluates the metrics of a model at most once per model state.
+
+    Figures and value displays read their metrics from the sampler of the
+    renderer instead of from the model, so a metric that is shown several
+    times, e.g. an expensive lambda over all agents, is computed only once per
+    state. A metric is identified by its attribute name or callable and by
+    whether it is read from the datacollector. The renderer calls clear()
+    whenever the model changes, i.e. after a step, a reset or a change of a
+    parameter by a controller.
+
+    Args:
+        renderer: The renderer whose model and tick are sampled.
+    """
+
+    def __init__(self, renderer: Renderer) -> None:
+        self.renderer = renderer
+        self.values: dict[tuple[Metric, bool], Any] = {}
+        self.getters: dict[Metric, Callable[[mesa.Model], Any]] = {}
+
+    def clear(self) -> None:
+        """Forgets all values, as the model has changed."""
+        self.values.clear()
+
+    def get(self, metric: Metric, from_datacollector: bool = False) -> Any:
+        """Returns the value of a metric in the current state of the model.
+
+        Args:
+            metric: Name of a model attribute (dotted paths are allowed) or a
+                callable that takes the model and returns a value.
+            from_datacollector: If True, the latest value of a string metric is
+                read from the model's datacollector. None if nothing has been
+                collected yet.
+        """
+        key = (metric, from_datacollector and isinstance(metric, str))
+        if key not in self.values:
+            self.values[key] = self._evaluate(*key)
+        return self.values[key]
+
+    def _evaluate(self, metric: Metric, from_datacollector: bool) -> Any:
+        model = self.renderer.model
+        if from_datacollector:
+            data = model.datacollector.model_vars[metric]
+            return data[-1] if len(data) > 0 else None
+
+        if metric not in self.getters:
+            self.getters[metric] = get_attribute_getter(metric)
+        return self.getters[metric](model)
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    import mesa
+
+
+class PopulationChanges:
+    """Agents that were added to or removed from a model since the last pop()."""
+
+    def __init__(self) -> None:
+        # dicts are used as insertion ordered sets
+        self.added: dict[Any, None] = {}
+        self.removed: dict[Any, None] = {}
+
+    def __bool__(self) -> bool:
+        return bool(self.added) or bool(self.removed)
+
+    def on_add(self, agent) -> None:
+        # an agent that was removed and added again has not changed at all
+        if agent in self.removed:
+            del self.removed[agent]
+        else:
+            self.added[agent] = None
+
+    def on_remove(self, agent) -> None:
+        # an agent that was added and removed again has never been seen
+        if agent in self.added:
+            del self.added[agent]
+        else:
+            self.removed[agent] = None
+
+    def pop(self) -> tuple[list, list]:
+        """Returns the added and removed agents and forgets about them."""
+        added, removed = list(self.added), list(self.removed)
+        self.added.clear()
+        self.removed.clear()
+        return added, removed
+
+
+class PopulationTracker:
+    """Records the agents that are registered at or removed from a model.
+
+    The tracker replaces the `register_agent` and `deregister_agent` methods of
+    the model instance by its own methods, which call the methods of the model
+    class. Every subscriber receives its own PopulationChanges, so consumers can
+    update in proportion to the churn instead of comparing the whole population
+    every frame. Call detach() before the model is dropped or reused.
+
+    Only the agent sets that mesa updates in these two methods, i.e.
+    `model.agents` and the sets of `model.agents_by_type`, are tracked. Agent
+    sets that are changed with add() or discard() have to be compared instead.
+    """
+
+    def __init__(self, model: mesa.Model) -> None:
+        self.model = model
+        self.subscriptions: list[PopulationChanges] = []
+
+        # bound methods of the tracker instead of closures keep the model picklable,
+        # Agent.__init__ / Agent.remove() find them through the usual attribute lookup
+        model.register_agent = self.register_agent
+        model.deregister_agent = self.deregister_agent
+
+    def register_agent(self, agent) -> None:
+        # the method of the model class, so overrides of a model subclass are still called
+        type(self.model).register_agent(self.model, agent)
+        for subscription in self.subscriptions:
+            subscription.on_add(agent)
+
+    def deregister_agent(self, agent) -> None:
+        type(self.model).deregister_agent(self.model, agent)
+        for subscription in self.subscriptions:
+            subscription.on_remove(agent)
+
+    def detach(self) -> None:
+        """Restores the methods of the model class and drops all subscriptions."""
+        for name in ("register_agent", "deregister_agent"):
+            self.model.__dict__.pop(name, None)
+        self.subscriptions.clear()
+
+    def tracks(self, population: Any) -> bool:
+        """Whether the membership of a population changes only by (de)registration."""
+        if population is self.model.agents:
+            return True
+        return any(population is agents for agents in self.model.agents_by_type.values())
+
+    def subscribe(self) -> PopulationChanges:
+        subscription = PopulationChanges()
+        self.subscriptions.append(subscription)
+        return subscription
@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from contextlib import nullcontext
+from typing import ContextManager
+
+import arcade
+
+# shared context of a disabled profiler, so measuring costs almost nothing
+_NO_MEASUREMENT = nullcontext()
+
+
+class _Measurement:
+    """Context manager that records the duration of its block in a profiler."""
+
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler: Profiler, name: str) -> None:
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self) -> None:
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc_info) -> None:
+        self.profiler.record(self.name, time.perf_counter() - self.start)
+
+
+class Profiler:
+    """Rolling timings of the model step and of every component of a canvas.
+
+    The renderer measures the model step, the sampling, update and draw of each
+    figure and each of its artists, the value displays and the UI manager.
+    Comparing the model step with the rest shows whether a slowdown comes from
+    the model or from the visualization.
+
+    Args:
+        enabled: Whether durations are measured.
+        window: Number of most recent measurements per component that are kept.
+    """
+
+    def __init__(self, enabled: bool = False, window: int = 120) -> None:
+        self.enabled = enabled
+        self.window = window
+        self.durations: dict[str, deque[float]] = {}
+
+        # the worker thread records durations while the overlay reads them
+        self.lock = threading.Lock()
+
+    def measure(self, name: str) -> ContextManager:
+        """Returns a context manager that measures the duration of its block."""
+        if not self.enabled:
+            return _NO_MEASUREMENT
+        return _Measurement(self, name)
+
+    def record(self, name: str, duration: float) -> None:
+        """Records a duration in seconds."""
+        with self.lock:
+            if name not in self.durations:
+                self.durations[name] = deque(maxlen=self.window)
+            self.durations[name].append(duration)
+
+    def reset(self) -> None:
+        with self.lock:
+            self.durations.clear()
+
+    def get_timings(self) -> dict[str, dict[str, float]]:
+        """Returns the rolling timings of each component in milliseconds.
+
+        Returns:
+            Dictionary that maps component names, e.g. "model.step" or
+            "GridSpacePlot 1.draw", to the mean, max and last duration.
+        """
+        # iterate over a snapshot, as other threads may record durations meanwhile
+        with self.lock:
+            snapshot = {name: list(durations) for name, durations in self.durations.items()}
+
+        timings = {}
+        for name, durations in snapshot.items():
+            if len(durations) == 0:
+                continue
+            timings[name] = {
+                "mean": 1000 * sum(durations) / len(durations),
+                "max": 1000 * max(durations),
+                "last": 1000 * durations[-1],
+            }
+        return timings
+
+    def format_timings(self) -> str:
+        """Returns one line per component with its mean and max duration."""
+        lines = [f"{'component':<36}{'mean ms':>9}{'max ms':>9}"]
+        for name, timing in self.get_timings().items():
+            lines.append(f"{name[:35]:<36}{timing['mean']:>9.2f}{timing['max']:>9.2f}")
+        return "\n".join(lines)
+
+
+class ProfilerOverlay:
+    """Draws the timings of a profiler in the top left corner of the window.
+
+    The text is refreshed at most every `refresh_interval` seconds, as creating
+    the layout of the text is itself expensive.
+
+    Args:
+        profiler: The profiler whose timings are shown.
+        x: x coordinate of the top left corner.
+        y: y coordinate of the top left corner.
+        width: Width of the overlay in pixels.
+        font_size: Font size of the timings.
+        refresh_interval: Seconds between two refreshes of the text.
+    """
+
+    def __init__(
+        self,
+        profiler: Profiler,
+        x: float,
+        y: float,
+        width: float,
+        font_size: float,
+        refresh_interval: float = 0.5,
+    ) -> None:
+        self.profiler = profiler
+        self.x = x
+        self.y = y
+        self.width = width
+        self.refresh_interval = refresh_interval
+        self.visible = True
+        self.refreshed_at = -refresh_interval
+
+        self.text = arcade.Text(
+            text="",
+            x=x,
+            y=y,
+            color=arcade.color.WHITE,
+            font_size=font_size,
+            font_name=("Courier New", "DejaVu Sans Mono", "Liberation Mono"),
+            width=int(width),
+            multiline=True,
+            anchor_y="top",
+        )
+
+    def draw(self) -> None:
+        if not self.visible:
+            return
+
+        now = time.perf_counter()
+        if now - self.refreshed_at >= self.refresh_interval:
+            self.text.text = self.profiler.format_timings()
+            self.refreshed_at = now
+
+        arcade.draw_lrbt_rectangle_filled(
+            left=self.x - 5,
+            right=self.x + self.width + 5,
+            bottom=self.y - self.text.content_height - 5,
+            top=self.y + 5,
+            color=(30, 30, 35, 200),
+        )
+        self.text.draw()
@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import os
+from typing import TYPE_CHECKING, Literal
+
+import numpy as np
+from pyglet import gl
+
+from mesarcade.utils import get_process_context
+
+if TYPE_CHECKING:
+    import arcade
+
+# BT.601 coefficients that convert RGB in [0, 1] to limited range YCbCr
+RGB_TO_YCBCR = np.array(
+    [
+        [65.481, 128.553, 24.966],
+        [-37.797, -74.203, 112.0],
+        [112.0, -93.786, -18.214],
+    ]
+)
+YCBCR_OFFSET = np.array([16.0, 128.0, 128.0])
+
+
+def _write_frames(frame_queue, path, format, width, height, fps):
+    """Runs in the writer process and writes the RGBA frames from the queue to disk.
+
+    Frames are given bottom row first, as read from OpenGL. None ends the process.
+    """
+    video_file = None
+    if format == "y4m":
+        video_file = open(path, "wb")
+        video_file.write(f"YUV4MPEG2 W{width} H{height} F{fps}:1 Ip A1:1 C444\n".encode())
+    else:
+        from PIL import Image
+
+        os.makedirs(path, exist_ok=True)
+
+    frame_index = 0
+    while True:
+        data = frame_queue.get()
+        if data is None:
+            break
+
+        frame = np.frombuffer(data, dtype=np.uint8).reshape(height, width, 4)[::-1]
+        if video_file is not None:
+            rgb = frame[:, :, :3] / 255
+            ycbcr = rgb @ RGB_TO_YCBCR.T + YCBCR_OFFSET
+            planes = np.clip(np.rint(ycbcr), 0, 255).astype(np.uint8).transpose(2, 0, 1)
+            video_file.write(b"FRAME\n")
+            video_file.write(planes.tobytes())
+        else:
+            image = Image.fromarray(np.ascontiguousarray(frame))
+            image.save(os.path.join(path, f"frame_{frame_index:06d}.png"))
+        frame_index += 1
+
+    if video_file is not None:
+        video_file.close()
+
+
+class FrameRecorder:
+    """Records the frames drawn by a canvas without stalling the simulation.
+
+    Each recorded frame is read from the window into one of two pixel buffers.
+    The GPU fills the buffer asynchronously, and it is only
+    read one recorded frame later, when the transfer has finished. The frames
+    are encoded by a separate writer process. If the writer falls behind by more
+    than `max_queued_frames`, recording waits for it instead of dropping frames.
+
+    Pass the recorder to a Canvas and call stop() to finish the recording.
+    Canvas.run() stops the recorder after the last step.
+
+    Args:
+        path: Directory of the PNG sequence or file of the y4m video.
+        format: "png" writes one image per frame, "y4m" writes an uncompressed
+            YUV4MPEG2 video that can be converted e.g. with ffmpeg.
+        every: Record every n-th drawn frame.
+        fps: Frame rate stored in the y4m video.
+        max_queued_frames: Largest number of frames waiting for the writer.
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike,
+        format: Literal["png", "y4m"] = "png",
+        every: int = 1,
+        fps: int = 30,
+        max_queued_frames: int = 16,
+    ) -> None:
+        if format not in ("png", "y4m"):
+            raise ValueError('The argument format must be "png" or "y4m".')
+
+        self.path = path
+        self.format = format
+        self.every = every
+        self.fps = fps
+        self.max_queued_frames = max_queued_frames
+
+        self.num_drawn_frames = 0
+        self.num_recorded_frames = 0
+        self.process = None
+
+    def _start(self, window: arcade.Window) -> None:
+        self.ctx = window.ctx
+        self.width, self.height = window.get_framebuffer_size()
+
+        self.pixel_buffers = [
+            self.ctx.buffer(reserve=self.width * self.height * 4) for _ in range(2)
+        ]
+        # whether a pixel buffer holds a frame that has not been sent to the writer
+        self.pending = [False, False]
+
+        context = get_process_context()
+        self.queue = context.Queue(maxsize=self.max_queued_frames)
+        self.process = context.Process(
+            target=_write_frames,
+            args=(self.queue, self.path, self.format, self.width, self.height, self.fps),
+            daemon=True,
+        )
+        self.process.start()
+
+    def _send(self, i: int) -> None:
+        if self.pending[i]:
+            self.queue.put(self.pixel_buffers[i].read())
+            self.pending[i] = False
+
+    def _read_screen(self, i: int) -> None:
+        # arcade cannot blit from the default framebuffer, so the pixels are read
+        # directly into the pixel buffer, which returns without waiting for the GPU
+        with self.ctx.screen.activate():
+            gl.glBindBuffer(gl.GL_PIXEL_PACK_BUFFER, self.pixel_buffers[i].glo)
+            gl.glPixelStorei(gl.GL_PACK_ALIGNMENT, 1)
+            gl.glReadPixels(0, 0, self.width, self.height, gl.GL_RGBA, gl.GL_UNSIGNED_BYTE, 0)
+            gl.glBindBuffer(gl.GL_PIXEL_PACK_BUFFER, 0)
+
+    def capture(self, window: arcade.Window) -> None:
+        """Records the current content of the window, call this after drawing."""
+        self.num_drawn_frames += 1
+        if (self.num_drawn_frames - 1) % self.every != 0:
+            return
+
+        if self.process is None:
+            self._start(window)
+
+        i = self.num_recorded_frames % 2
+        # the buffer still holds the frame before the previous one
+        self._send(i)
+
+        self._read_screen(i)
+        self.pending[i] = True
+        self.num_recorded_frames += 1
+
+        # the previous frame has been transferred while this one was drawn
+        self._send(1 - i)
+
+    def stop(self) -> None:
+        """Writes the remaining frames and waits for the writer process."""
+        if self.process is None:
+            return
+
+        # send the pending frames in the order they were recorded
+        i = self.num_recorded_frames % 2
+        self._send(i)
+        self._send(1 - i)
+
+        self.queue.put(None)
+        self.process.join()
+        self.process = None
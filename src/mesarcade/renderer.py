@@ -1,3 +1,7 @@
+import collections
+import threading
+import time
+
 import arcade
 import arcade.gui
 import arcade.gui.widgets.text
@@ -5,6 +9,11 @@ import mesa
 
 from mesarcade.button import DefaultButtons
 from mesarcade.controller import NumController
+from mesarcade.governor import StepGovernor
+from mesarcade.metrics import MetricSampler
+from mesarcade.population import PopulationTracker
+from mesarcade.profiler import Profiler, ProfilerOverlay
+from mesarcade.recorder import FrameRecorder
 from mesarcade.utils import parse_color
 from mesarcade.value_display import ValueDisplay
 
@@ -21,23 +30,53 @@ class Renderer(arcade.View):
         target_fps: int,
         rendering_step: int,
         parameter_dict: dict | None,
+        step_in_background: bool = False,
+        adaptive_steps: bool = False,
+        recorder: FrameRecorder | None = None,
+        profile: bool = False,
     ):
         super().__init__()
 
         self.model_class = model_class
         self.figures = figures
-        self.controllers = controllers
+        # the fps and rendering step controllers are added in every setup
+        self.user_controllers = list(controllers)
+        self.controllers = list(controllers)
         self.value_displays = value_displays
         self.parameter_dict = {} if parameter_dict is None else parameter_dict
         self.window_width = window_width
         self.window_height = window_height
         self.target_fps = target_fps
         self.rendering_step = rendering_step
+        self.step_in_background = step_in_background
+        self.governor = StepGovernor() if adaptive_steps else None
+        self.recorder = recorder
+        self.profiler = Profiler(enabled=profile)
+
+        # figures and value displays share the metrics sampled from the model
+        self.metrics = MetricSampler(renderer=self)
+        self.population_tracker = None
+
+        # held while the model is stepped or read, as it may be stepped in a worker thread
+        self.model_lock = threading.RLock()
 
-    def setup(self):
+        # handshake that lets the worker thread pause while the figures are updated
+        self.update_requested = threading.Event()
+        self.update_done = threading.Event()
+        self.stop_worker = threading.Event()
+        self.worker = None
+
+        # actions of the main thread that read or change the model, they are run
+        # during the handshake instead of waiting for the worker to finish its step
+        self.model_actions = collections.deque()
+
+    def setup(self, start_worker: bool = True):
         # play / pause state
         self.play = False
 
+        # drop the fps and rendering step controllers of a previous setup
+        self.controllers = list(self.user_controllers)
+
         # tick counter
         self.tick = 0
 
@@ -68,12 +107,29 @@ class Renderer(arcade.View):
 
         # add default buttons
         self.add_fps_buttons()
-        self.add_rendering_step_buttons()
+        # the governor replaces the manual rendering step
+        if self.governor is None:
+            self.add_rendering_step_buttons()
         self.add_default_buttons()
 
         # set initial target fps
         self.set_fps(new_value=self.target_fps)
 
+        self.profiler_overlay = None
+        if self.profiler.enabled:
+            self.profiler_overlay = ProfilerOverlay(
+                profiler=self.profiler,
+                x=self.atomic_width * 0.5,
+                y=self.window_height - self.atomic_height * 0.5,
+                width=self.atomic_width * 12,
+                font_size=self.font_size * 0.8,
+            )
+
+        # step the model in a worker thread, so slow steps do not block the window
+        if self.step_in_background and start_worker and self.worker is None:
+            self.worker = threading.Thread(target=self.run_model_worker, daemon=True)
+            self.worker.start()
+
     def update_parameter_dict(self) -> None:
         for controller in self.controllers:
             self.parameter_dict[controller.parameter_name] = controller.parameter_value
@@ -81,21 +137,34 @@ class Renderer(arcade.View):
     def setup_model(self) -> None:
         """Setups a fresh model instance with the current parameter setting."""
 
-        # reset the tick counter
-        self.tick = 0
+        # a model that is stepped in the background is replaced between two steps
+        with self.model_lock:
+            # reset the tick counter
+            self.tick = 0
+            self.rendered_tick = 0
+
+            # get the latest parameter values from the controllers
+            self.update_parameter_dict()
+
+            # remove the fps parameter
+            self.parameter_dict.pop("target_fps", None)
+            self.parameter_dict.pop("rendering_step", None)
 
-        # get the latest parameter values from the controllers
-        self.update_parameter_dict()
+            # the previous model keeps no reference to the artists
+            if self.population_tracker is not None:
+                self.population_tracker.detach()
 
-        # remove the fps parameter
-        self.parameter_dict.pop("target_fps", None)
-        self.parameter_dict.pop("rendering_step", None)
+            # create a new model instance with the current parameter setting
+            self.model = self.model_class(**self.parameter_dict)
 
-        # create a new model instance with the current parameter setting
-        self.model = self.model_class(**self.parameter_dict)
+            # let artists receive births and deaths of agents as events
+            self.population_tracker = PopulationTracker(self.model)
 
-        self.setup_figures()
-        self.setup_value_displays()
+            # the values of the previous model are no longer valid
+            self.metrics.clear()
+
+            self.setup_figures()
+            self.setup_value_displays()
 
     def setup_figures(self):
         if len(self.figures) == 1:
@@ -166,16 +235,18 @@ class Renderer(arcade.View):
         self.set_target_objects_of_controllers()
 
     def draw_value_displays(self) -> None:
-        self.tick_display.draw()
-        self.fps_display.draw()
-        for value_display in self.value_displays:
-            value_display.draw()
+        with self.profiler.measure("value displays.draw"):
+            self.tick_display.draw()
+            self.fps_display.draw()
+            for value_display in self.value_displays:
+                value_display.draw()
 
     def update_value_displays(self, force_update=False) -> None:
-        self.tick_display.update(new_value=self.tick, force_update=force_update)
-        self.fps_display.update(new_value=int(arcade.get_fps(60)), force_update=force_update)
-        for value_display in self.value_displays:
-            value_display.update(force_update=force_update)
+        with self.model_lock, self.profiler.measure("value displays.update"):
+            self.tick_display.update(new_value=self.tick, force_update=force_update)
+            self.fps_display.update(new_value=int(arcade.get_fps(60)), force_update=force_update)
+            for value_display in self.value_displays:
+                value_display.update(force_update=force_update)
 
     def setup_value_displays(self) -> None:
         self.tick_display = ValueDisplay(model_attribute=None, label="Tick", update_step=10)
@@ -238,25 +309,156 @@ class Renderer(arcade.View):
 
     def draw_figures(self):
         for figure in self.figures:
-            figure.draw()
+            with self.profiler.measure(f"{figure.profile_name}.draw"):
+                figure.draw()
 
-    def update_figures(self):
+    def sample_figures(self):
         for figure in self.figures:
-            figure.update()
+            with self.profiler.measure(f"{figure.profile_name}.sample"):
+                figure.sample()
+
+    def update_figures(self):
+        with self.model_lock:
+            for figure in self.figures:
+                with self.profiler.measure(f"{figure.profile_name}.update"):
+                    figure.update()
+
+    def poll_figures(self):
+        """Applies finished background jobs of the figures, also while the simulation is paused."""
+        with self.model_lock:
+            for figure in self.figures:
+                figure.poll()
+
+    def step_model(self):
+        """Runs one model step and records its data in all figures."""
+        with self.model_lock:
+            with self.profiler.measure("model.step"):
+                self.model.step()
+            self.metrics.clear()
+            self.tick += 1
+            self.sample_figures()
+
+    def run_with_model(self, action):
+        """Runs an action of the main thread that reads or changes the model.
+
+        If the model is stepped in a worker thread, the action is queued and run by
+        `update_from_background` between two steps, so the window never waits for a step.
+
+        Args:
+            action: Callable without arguments.
+        """
+        if self.worker is None:
+            with self.model_lock:
+                action()
+        else:
+            self.model_actions.append(action)
+
+    def run_model_worker(self):
+        """Steps the model in the worker thread while the simulation is playing."""
+        while not self.stop_worker.is_set():
+            if not self.play:
+                time.sleep(0.01)
+                continue
+
+            self.step_model()
+
+            # pause between two steps until the main thread is done with the model
+            if self.update_requested.is_set():
+                self.update_done.wait(timeout=0.1)
+
+    def update_from_background(self):
+        """Runs queued actions and updates the figures with the latest completed step."""
+        # while paused, the handshake is cheap and lets background layouts progress
+        if self.play and self.tick == self.rendered_tick and not self.model_actions:
+            return
+
+        # a stale answer of an earlier handshake must not release the worker
+        self.update_done.clear()
+        self.update_requested.set()
+        # the model can only be accessed while the worker is between two steps
+        if not self.model_lock.acquire(blocking=False):
+            return
+        try:
+            while self.model_actions:
+                self.model_actions.popleft()()
+            self.poll_figures()
+            if self.tick != self.rendered_tick:
+                self.update_figures()
+                self.update_value_displays()
+                self.rendered_tick = self.tick
+        finally:
+            self.model_lock.release()
+            self.update_requested.clear()
+            self.update_done.set()
 
     def on_draw(self):
         """Render the screen."""
+        start = time.perf_counter()
 
         self.clear()
         self.draw_figures()
         self.draw_value_displays()
 
-        self.manager.draw()
+        with self.profiler.measure("ui manager.draw"):
+            self.manager.draw()
+
+        if self.governor is not None:
+            self.governor.record_draw(time.perf_counter() - start)
+
+        if self.recorder is not None:
+            self.recorder.capture(self.window)
+
+        # drawn after the capture, so the overlay is not recorded
+        if self.profiler_overlay is not None:
+            self.profiler_overlay.draw()
+
+    def on_key_press(self, symbol, modifiers):
+        # toggle the profiler overlay, the timings are measured anyway
+        if symbol == arcade.key.P and self.profiler_overlay is not None:
+            self.profiler_overlay.visible = not self.profiler_overlay.visible
+
+    def run_adaptive_frame(self, delta_time):
+        """Runs as many steps as fit into the frame budget and updates the figures."""
+        self.governor.advance(delta_time)
+        frame_budget = 1 / self.target_fps
+        num_steps = self.governor.get_num_steps(frame_budget)
+
+        start = time.perf_counter()
+        # stop early if the steps are slower than expected
+        deadline = start + frame_budget
+        steps = 0
+        while steps < num_steps:
+            self.step_model()
+            steps += 1
+            if time.perf_counter() > deadline:
+                break
+        self.governor.record_steps(steps, time.perf_counter() - start)
+
+        # all steps are sampled, so skipping figure updates loses no data
+        if self.governor.update_due(frame_budget):
+            start = time.perf_counter()
+            self.update_figures()
+            self.update_value_displays()
+            self.governor.record_update(time.perf_counter() - start)
+
+    def on_hide_view(self):
+        self.stop_worker.set()
+        if self.recorder is not None:
+            self.recorder.stop()
 
     def on_update(self, delta_time):
+        if self.step_in_background:
+            self.update_from_background()
+            return
+
+        self.poll_figures()
+
+        if self.play and self.governor is not None:
+            self.run_adaptive_frame(delta_time)
+            return
+
         if self.play:
-            self.model.step()
-            self.tick += 1
+            self.step_model()
 
             if self.tick % self.rendering_step == 0:
                 self.update_figures()
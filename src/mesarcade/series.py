@@ -0,0 +1,258 @@
+from __future__ import annotations
+
+import os
+
+import numpy as np
+
+
+class SeriesBuffer:
+    """Growable numpy array of (x, y) data points.
+
+    Appending is amortized O(1), as the capacity doubles whenever it is exhausted.
+    If a path is given, the array is a memory-mapped file, so the data points are
+    paged out to disk by the operating system instead of being held in memory.
+
+    Args:
+        capacity: Initial number of data points the buffer can hold.
+        path: Optional file that backs the buffer. An existing file is overwritten.
+    """
+
+    def __init__(self, capacity: int = 1024, path: str | os.PathLike | None = None) -> None:
+        self.path = path
+        self.size = 0
+        if path is None:
+            self.data = np.empty((capacity, 2), dtype=np.float64)
+        else:
+            self.data = np.memmap(path, dtype=np.float64, mode="w+", shape=(capacity, 2))
+
+    def __len__(self) -> int:
+        return self.size
+
+    @property
+    def values(self) -> np.ndarray:
+        """View of all stored data points as an (n, 2) array."""
+        return self.data[: self.size]
+
+    def append(self, x: float, y: float) -> None:
+        if self.size == len(self.data):
+            self._grow()
+        self.data[self.size] = (x, y)
+        self.size += 1
+
+    def extend(self, values: np.ndarray) -> None:
+        """Appends an (n, 2) array of data points."""
+        new_size = self.size + len(values)
+        if new_size > len(self.data):
+            self._grow(new_size)
+        self.data[self.size : new_size] = values
+        self.size = new_size
+
+    def _grow(self, min_capacity: int = 0) -> None:
+        capacity = max(2 * len(self.data), min_capacity)
+        if self.path is None:
+            data = np.empty((capacity, 2), dtype=self.data.dtype)
+            data[: self.size] = self.data[: self.size]
+            self.data = data
+        else:
+            # a mapped file cannot be resized on every platform, so it is released first
+            self.close()
+            with open(self.path, "r+b") as file:
+                file.truncate(capacity * 2 * np.dtype(np.float64).itemsize)
+            self.data = np.memmap(self.path, dtype=np.float64, mode="r+", shape=(capacity, 2))
+
+    def flush(self) -> None:
+        """Writes the data points of a memory-mapped buffer to disk."""
+        if self.path is not None:
+            self.data.flush()
+
+    def close(self) -> None:
+        """Writes a memory-mapped buffer to disk and releases the mapping.
+
+        The file is unmapped once no views of `values` are left, so callers that
+        keep data points beyond the lifetime of the buffer should copy them.
+        The buffer cannot be used afterwards.
+        """
+        if self.path is not None and self.data is not None:
+            self.data.flush()
+            self.data = None
+
+
+def decimate_min_max(values: np.ndarray, group_size: int = 4) -> np.ndarray:
+    """Reduces each group of consecutive points to its minimum and maximum.
+
+    Args:
+        values: (group_size * n, 2) array of (x, y) data points ordered by x.
+        group_size: Number of points per group.
+
+    Returns:
+        (2 * n, 2) array with the points of the minimum and the maximum y value of
+        each group in their original order.
+    """
+    groups = values.reshape(-1, group_size, 2)
+    y = groups[:, :, 1]
+    rows = np.sort(np.column_stack((np.argmin(y, axis=1), np.argmax(y, axis=1))), axis=1)
+    return np.take_along_axis(groups, rows[:, :, np.newaxis], axis=1).reshape(-1, 2)
+
+
+class DecimatedSeries:
+    """Series of (x, y) data points with cached min/max decimation levels.
+
+    Level k summarizes buckets of 2 ** (k + 1) consecutive points by the points of
+    their minimum and maximum, so every level has half as many rows as the level
+    below and still shows all peaks of the series. The levels are extended
+    whenever points are appended, so get_view() only has to pick a level.
+
+    Args:
+        directory: Optional directory in which the raw points and the levels are
+            stored as memory-mapped files, see SeriesBuffer.
+    """
+
+    def __init__(self, directory: str | os.PathLike | None = None) -> None:
+        self.directory = directory
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+        self.data = self._create_buffer("data")
+        self.levels: list[SeriesBuffer] = []
+
+    def _create_buffer(self, name: str) -> SeriesBuffer:
+        if self.directory is None:
+            return SeriesBuffer()
+        return SeriesBuffer(path=os.path.join(self.directory, f"{name}.f64"))
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    @property
+    def values(self) -> np.ndarray:
+        """View of all raw data points as an (n, 2) array."""
+        return self.data.values
+
+    def append(self, x: float, y: float) -> None:
+        self.data.append(x, y)
+        self._update_levels()
+
+    def extend(self, values: np.ndarray) -> None:
+        """Appends an (n, 2) array of data points."""
+        self.data.extend(values)
+        self._update_levels()
+
+    def close(self) -> None:
+        """Releases the memory-mapped files of the raw points and the levels."""
+        for buffer in [self.data, *self.levels]:
+            buffer.close()
+
+    def _update_levels(self) -> None:
+        child = self.data
+        for k in range(len(self.levels) + 1):
+            if len(child) < 4:
+                break
+            if k == len(self.levels):
+                self.levels.append(self._create_buffer(f"level_{k}"))
+            level = self.levels[k]
+
+            # every 4 rows of the level below become 2 rows of this level
+            consumed_rows = 2 * len(level)
+            complete_rows = len(child) // 4 * 4
+            if complete_rows == consumed_rows:
+                # nothing new for this level, so the levels above are up to date too
+                break
+            level.extend(decimate_min_max(child.values[consumed_rows:complete_rows]))
+            child = level
+
+    def get_view(self, max_points: int) -> np.ndarray:
+        """Returns the series reduced to about `max_points` points.
+
+        The finest level with at most `max_points` rows is used. Points that are not
+        yet summarized by that level are taken from the finer levels, which adds
+        at most 2 points per level and 3 raw points.
+        """
+        buffers = [self.data, *self.levels]
+        k = next(
+            (i for i, buffer in enumerate(buffers) if len(buffer) <= max_points),
+            len(buffers) - 1,
+        )
+        if k == 0:
+            return self.data.values
+
+        parts = [buffers[k].values]
+        # number of raw points covered by the rows collected so far
+        covered_points = len(buffers[k]) * 2**k
+        for j in range(k - 1, -1, -1):
+            parts.append(buffers[j].values[covered_points >> j :])
+            covered_points = len(buffers[j]) * 2**j
+        return np.concatenate(parts)
+
+
+class WindowedSeries:
+    """The last `window` (x, y) data points of a series in a fixed-size ring buffer.
+
+    Memory and the cost of get_view() are constant no matter how many points have
+    been appended.
+
+    Args:
+        window: Number of data points that are kept.
+    """
+
+    def __init__(self, window: int) -> None:
+        self.window = window
+        self.data = np.empty((window, 2), dtype=np.float64)
+        self.size = 0
+        self.num_appended = 0
+
+    def __len__(self) -> int:
+        return self.size
+
+    @property
+    def values(self) -> np.ndarray:
+        """The kept data points from oldest to newest as an (n, 2) array."""
+        if self.size < self.window:
+            return self.data[: self.size]
+        start = self.num_appended % self.window
+        return np.concatenate((self.data[start:], self.data[:start]))
+
+    @property
+    def first_x(self) -> float:
+        """x value of the oldest kept data point."""
+        return self.data[0 if self.size < self.window else self.num_appended % self.window, 0]
+
+    def append(self, x: float, y: float) -> None:
+        self.data[self.num_appended % self.window] = (x, y)
+        self.num_appended += 1
+        self.size = min(self.size + 1, self.window)
+
+    def extend(self, values: np.ndarray) -> None:
+        """Appends an (n, 2) array of data points."""
+        # only the last `window` points can be kept
+        values = values[-self.window :]
+        rows = (self.num_appended + np.arange(len(values))) % self.window
+        self.data[rows] = values
+        self.num_appended += len(values)
+        self.size = min(self.size + len(values), self.window)
+
+    def get_view(self, max_points: int) -> np.ndarray:
+        """Returns the kept points reduced to about `max_points` points.
+
+        The min/max groups are aligned to the total number of appended points, so
+        they do not change while the window scrolls.
+        """
+        values = self.values
+        if len(values) <= max_points:
+            return values
+
+        # about 2 rows per group, with some room for the partial groups at both ends,
+        # which may exceed a very small `max_points` by a few rows
+        group_size = -(-2 * len(values) // max(max_points - 4, 2))
+        first_row = -(self.num_appended - len(values)) % group_size
+        last_row = first_row + (len(values) - first_row) // group_size * group_size
+        parts = [
+            values[:first_row],
+            values[first_row:last_row],
+            values[last_row:],
+        ]
+        return np.concatenate(
+            [
+                decimate_min_max(part, group_size=group_size if i == 1 else len(part))
+                for i, part in enumerate(parts)
+                if len(part) > 0
+            ]
+        )
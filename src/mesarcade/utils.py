@@ -1,6 +1,57 @@
+from __future__ import annotations
+
+import multiprocessing
+import operator
+from typing import Any, Callable, Iterable
+
 import matplotlib.colors
+import numpy as np
 
 
 def parse_color(color) -> tuple[int, int, int, int]:
     r, g, b, a = matplotlib.colors.to_rgba(color)
     return (int(r * 255), int(g * 255), int(b * 255), int(a * 255))
+
+
+def get_attribute_getter(attribute: str | Callable[[Any], Any]) -> Callable[[Any], Any]:
+    """Returns a callable that reads an attribute from an object.
+
+    Strings are turned into an `operator.attrgetter`, which also supports dotted
+    paths like "cell.coordinate". Callables are returned unchanged.
+    """
+    if isinstance(attribute, str):
+        return operator.attrgetter(attribute)
+    return attribute
+
+
+def get_attribute_array(
+    entities: Iterable[Any],
+    attribute: str | Callable[[Any], Any],
+) -> np.ndarray:
+    """Gathers an attribute of all entities as a numpy array in a single pass.
+
+    Useful for fast model reporters, e.g.
+    `lambda model: get_attribute_array(model.agents, "wealth").mean()`.
+
+    Args:
+        entities: Any iterable of entities, e.g. a mesa AgentSet or a grid.
+        attribute: Attribute name (dotted paths are allowed) or callable that
+            takes an entity and returns a value.
+    """
+    return np.array(list(map(get_attribute_getter(attribute), entities)))
+
+
+def get_process_context():
+    """Returns the multiprocessing context used to start worker processes.
+
+    Workers are never forked from the visualization, which holds an OpenGL
+    context and possibly a model thread, as this may crash or deadlock. The
+    forkserver forks them from a clean server process where it is available,
+    otherwise they are spawned. Either way, their targets and arguments have
+    to be picklable, and scripts that start workers, e.g. through replicates,
+    background layouts or a FrameRecorder, need an `if __name__ == "__main__":`
+    guard, as they are imported again by every worker.
+    """
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("forkserver")
+    return multiprocessing.get_context("spawn")
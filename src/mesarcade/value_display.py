@@ -18,7 +18,8 @@ class ValueDisplay:
 
     Args:
         model_attribute: The attribute to display. Can be a string (attribute
-            name) or a callable that takes a mesa.Model and returns a value.
+            name, dotted paths are allowed) or a callable that takes a
+            mesa.Model and returns a value.
         label: Optional label text. If None, the attribute name is used for
             string attributes, or "no label" for callables.
         update_step: Simulation steps between value updates. Defaults to 10.
@@ -58,6 +59,9 @@ class ValueDisplay:
         self.x_of_value = self.x_of_self
         self.y_of_value = self.y_of_self - self.renderer.atomic_height
 
+        # tick of the last update
+        self.updated_tick = self.renderer.tick
+
         if initial_value is not None:
             self.current_value = str(initial_value)
         elif self.model_attribute is not None:
@@ -95,21 +99,16 @@ class ValueDisplay:
         self.text_list.append(self.value_element)
 
     def get_value_from_model(self):
-        # get the value from a model attribute
-        if isinstance(self.model_attribute, str):
-            if not self.from_datacollector:
-                return str(getattr(self.model, self.model_attribute))
-
-            # get the value from the datacollector
-            else:
-                return str(self.model.datacollector.model_vars[self.model_attribute][-1])
-
-        # get the value using a lambda function
-        else:
-            return str(self.model_attribute(self.model))
+        # the value is shared with all other consumers of the same metric
+        value = self.renderer.metrics.get(
+            self.model_attribute, from_datacollector=self.from_datacollector
+        )
+        return str(value)
 
     def update(self, new_value=None, force_update=False):
-        if self.renderer.tick % self.update_step == 0 or force_update:
+        # ticks may be skipped by the renderer
+        if self.renderer.tick - self.updated_tick >= self.update_step or force_update:
+            self.updated_tick = self.renderer.tick
             new_value = self.get_value_from_model() if new_value is None else new_value
             if new_value != self.current_value:
                 self.current_value = new_value
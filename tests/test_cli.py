@@ -0,0 +1,34 @@
+import os
+import subprocess
+import sys
+
+import mesarcade
+
+
+def test_headless_run(tmp_path):
+    script = tmp_path / "script.py"
+    script.write_text(
+        "import mesarcade as mesar\n"
+        "from mesa.examples.basic.schelling.model import Schelling\n"
+        "plot = mesar.ModelHistoryPlot(model_attributes=['happy'])\n"
+        "canvas = mesar.Canvas(model_class=Schelling, plots=[plot])\n"
+        "canvas.show()\n"
+    )
+
+    # the package is found by the fresh interpreters, also if it is not installed
+    source_dir = os.path.dirname(os.path.dirname(mesarcade.__file__))
+    python_path = os.pathsep.join(filter(None, [source_dir, os.environ.get("PYTHONPATH")]))
+    result = subprocess.run(
+        [sys.executable, "-m", "mesarcade", "run", str(script), "--steps", "5", "--headless"],
+        env={**os.environ, "PYTHONPATH": python_path},
+        capture_output=True,
+        text=True,
+        timeout=300,
+    )
+
+    # either the run succeeds or the missing headless support is reported clearly
+    if result.returncode == 0:
+        assert "canvas 0: 5 steps" in result.stdout
+    else:
+        assert result.returncode == 2
+        assert "arcade cannot run headless" in result.stderr
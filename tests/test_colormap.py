@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+
+from mesarcade.colormap import ColorMap
+
+
+def test_str_color_map_supports_floats_and_clips():
+    colormap = ColorMap("Greens", vmin=0, vmax=4)
+
+    colors = colormap.map([-10, 0, 1.5, 4, 1000, float("nan")])
+
+    assert colors.shape == (6, 4)
+    assert colors.dtype == np.uint8
+    assert (colors[0] == colors[1]).all()
+    assert (colors[3] == colors[4]).all()
+    assert colors[5, 3] == 0
+    assert colormap(1.5) == tuple(colors[2].tolist())
+
+
+def test_dict_color_map():
+    colormap = ColorMap({0: "white", 1: "black"})
+
+    colors = colormap.map(np.array([1, 0, 1]))
+
+    assert colors.tolist() == [[0, 0, 0, 255], [255, 255, 255, 255], [0, 0, 0, 255]]
+    assert colormap(0) == (255, 255, 255, 255)
+
+    with pytest.raises(KeyError):
+        colormap.map([2])
+
+
+def test_dict_color_map_with_str_keys():
+    colormap = ColorMap({"a": "red", "b": "blue"})
+
+    colors = colormap.map(["b", "a"])
+
+    assert colors.tolist() == [[0, 0, 255, 255], [255, 0, 0, 255]]
@@ -0,0 +1,54 @@
+import time
+
+import numpy as np
+import pytest
+from mesa.examples.basic.schelling.model import Schelling
+
+from mesarcade.ensemble import Ensemble
+
+
+def count_agents(model):
+    return len(model.agents)
+
+
+def test_ensemble_bands():
+    ensemble = Ensemble(
+        model_class=Schelling,
+        parameters={"seed": 42},
+        metrics=["happy", count_agents],
+        num_replicates=3,
+        quantiles=(0.1, 0.9),
+        num_processes=2,
+    )
+    ensemble.set_target_tick(5)
+
+    ticks = []
+    deadline = time.perf_counter() + 60
+    while len(ticks) < 5 and time.perf_counter() < deadline:
+        result = ensemble.poll()
+        if result is not None:
+            new_ticks, mean, lower, upper = result
+            assert mean.shape == lower.shape == upper.shape == (len(new_ticks), 2)
+            assert np.all(lower <= mean + 1e-9) and np.all(mean <= upper + 1e-9)
+            ticks.extend(new_ticks)
+        time.sleep(0.05)
+    ensemble.stop()
+
+    # the replicates do not run ahead of the target tick
+    assert ticks == [1, 2, 3, 4, 5]
+
+
+def test_replicates_get_different_seeds():
+    parameter_dicts = Ensemble.get_parameter_dicts(Schelling, {"seed": 1, "width": 10}, 3)
+    assert len({parameters["seed"] for parameters in parameter_dicts}) == 3
+    assert all(parameters["width"] == 10 for parameters in parameter_dicts)
+
+
+def test_lambdas_are_rejected():
+    with pytest.raises(ValueError, match="pickled"):
+        Ensemble(
+            model_class=Schelling,
+            parameters={},
+            metrics=[lambda model: len(model.agents)],
+            num_replicates=2,
+        )
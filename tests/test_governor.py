@@ -0,0 +1,30 @@
+from mesarcade.governor import StepGovernor
+
+
+def test_cheap_steps_fill_the_frame():
+    governor = StepGovernor()
+    assert governor.get_num_steps(frame_budget=0.025) == 1
+
+    governor.record_steps(num_steps=1, duration=0.001)
+    governor.record_update(duration=0.002)
+    governor.record_draw(duration=0.005)
+    governor.advance(0.025)
+
+    # (0.025 * 0.9 - 0.005 - 0.002) / 0.001 steps fit into the frame
+    assert governor.get_num_steps(frame_budget=0.025) == 15
+    assert governor.update_due(frame_budget=0.025)
+
+
+def test_slow_updates_are_skipped():
+    governor = StepGovernor()
+    governor.record_steps(num_steps=1, duration=0.2)
+    governor.record_update(duration=0.05)
+    governor.record_draw(duration=0.005)
+
+    assert governor.get_num_steps(frame_budget=0.025) == 1
+
+    # updates may only take a quarter of the time, i.e. one every 0.2 seconds
+    governor.advance(0.1)
+    assert not governor.update_due(frame_budget=0.025)
+    governor.advance(0.1)
+    assert governor.update_due(frame_budget=0.025)
@@ -0,0 +1,33 @@
+import numpy as np
+
+from mesarcade.gpu import LineBatch, get_axis_transform
+
+
+def test_line_batch_uploads_only_changed_rows():
+    lines = LineBatch(colors=[(0, 0, 0, 255), (255, 0, 0, 255)], capacity=4)
+    lines.set_vertices(0, [[0, 0], [1, 1]])
+    lines.dirty_ranges.clear()
+
+    # appending keeps the uploaded rows
+    lines.set_vertices(0, [[0, 0], [1, 1], [2, 0], [3, 5]])
+    assert lines.dirty_ranges == [(2, 4)]
+    lines.dirty_ranges.clear()
+
+    # the second series lives in its own region
+    lines.set_vertices(1, [[0, 1], [1, 2]])
+    assert lines.dirty_ranges == [(4, 6)]
+    assert list(lines.vertices[:, 2]) == [0, 0, 0, 0, 1, 1, -1, -1]
+    lines.dirty_ranges.clear()
+
+    # growing a series moves all regions
+    lines.set_vertices(1, np.zeros((6, 2)))
+    assert lines.capacity == 8
+    assert lines.dirty_ranges[0] == (0, 16)
+    assert list(lines.sizes) == [4, 6]
+    np.testing.assert_array_equal(lines.vertices[:4, :2], [[0, 0], [1, 1], [2, 0], [3, 5]])
+
+
+def test_axis_transform():
+    scale, offset = get_axis_transform(old_min=10, old_max=20, new_min=100, new_max=200)
+    assert np.isclose(10 * scale + offset, 100)
+    assert np.isclose(20 * scale + offset, 200)
@@ -0,0 +1,301 @@
+import time
+
+import mesa
+import networkx as nx
+import numpy as np
+from mesa.discrete_space import CellAgent, Network, OrthogonalMooreGrid
+from mesa.examples.advanced.sugarscape_g1mt.model import SugarscapeG1mt
+from mesa.examples.basic.schelling.model import Schelling
+import mesarcade as mesar
+
+
+class ScriptedModel(mesa.Model):
+    """Agents in a row that only move, change their type or die when told to."""
+
+    def __init__(self, num_agents=10, seed=None):
+        super().__init__(seed=seed)
+        self.grid = OrthogonalMooreGrid((10, 10), torus=True, random=self.random)
+        for x in range(num_agents):
+            agent = CellAgent(self)
+            agent.type = 0
+            agent.cell = self.grid[(x, 0)]
+
+        # agents that are changed in the next step
+        self.to_move = []
+        self.to_recolor = []
+        self.to_remove = []
+
+    def step(self):
+        for agent in self.to_move:
+            x, y = agent.cell.coordinate
+            agent.cell = self.grid[(x, y + 1)]
+        for agent in self.to_recolor:
+            agent.type = 1 - agent.type
+        for agent in self.to_remove:
+            agent.remove()
+        self.to_move, self.to_recolor, self.to_remove = [], [], []
+
+
+def create_canvas(agents, model_class=Schelling):
+    space = mesar.GridSpacePlot(artists=[agents])
+    canvas = mesar.Canvas(
+        model_class=model_class,
+        plots=[space],
+        _visible=False,
+    )
+    canvas._setup()
+    return canvas
+
+
+def test_num_updated_sprites():
+    agents = mesar.CellAgentArtists(
+        color_attribute="type",
+        color_map={0: "blue", 1: "red"},
+    )
+    canvas = create_canvas(agents, model_class=ScriptedModel)
+    model = canvas.renderer.model
+    step_button = canvas.renderer.default_buttons.step_button
+
+    # all sprites are created during setup
+    assert agents.num_updated_sprites == 10
+
+    # nothing has changed since the setup
+    canvas.renderer.update_figures()
+    assert agents.num_updated_sprites == 0
+
+    # the third agent moves and changes its type, so 5 sprites are touched
+    agent_list = list(model.agents)
+    model.to_move = agent_list[:3]
+    model.to_recolor = agent_list[2:5]
+    step_button.on_click(None)
+    assert agents.num_updated_sprites == 5
+
+    # a step without any changes touches no sprite
+    step_button.on_click(None)
+    assert agents.num_updated_sprites == 0
+
+    canvas.window.close()
+
+
+def test_user_held_agent_set():
+    # the model holds an agent set that is changed with add() and discard()
+    agents = mesar.CellAgentArtists(
+        color_attribute="type",
+        color_map={0: "blue", 1: "red"},
+        get_population=lambda model: model.selected,
+    )
+
+    class SelectionModel(ScriptedModel):
+        def __init__(self, seed=None):
+            super().__init__(seed=seed)
+            self.selected = mesa.agent.AgentSet(list(self.agents)[:5], random=self.random)
+
+    canvas = create_canvas(agents, model_class=SelectionModel)
+    model = canvas.renderer.model
+    assert agents.population_changes is None
+    assert len(agents.sprite_dict) == 5
+
+    agent_list = list(model.agents)
+    model.selected.discard(agent_list[0])
+    model.selected.add(agent_list[7])
+    canvas.renderer.update_figures()
+
+    assert set(agents.sprite_dict) == set(model.selected)
+
+    canvas.window.close()
+
+
+def test_arrays_backend():
+    agents = mesar.CellAgentArtists(
+        color_attribute="type",
+        color_map={0: "blue", 1: "red"},
+        backend="arrays",
+    )
+    canvas = create_canvas(agents)
+    canvas.renderer.play = True
+
+    assert len(agents.sprite_list) == len(canvas.renderer.model.agents)
+
+    for _ in range(10):
+        canvas.renderer.on_update(1 / 40)
+        canvas.renderer.on_draw()
+
+    assert len(agents.sprite_list) == len(canvas.renderer.model.agents)
+    assert agents.num_updated_sprites <= len(canvas.renderer.model.agents)
+
+    canvas.window.close()
+
+
+def test_arrays_backend_removal():
+    agents = mesar.CellAgentArtists(
+        color_attribute="type",
+        color_map={0: "blue", 1: "red"},
+        backend="arrays",
+    )
+    canvas = create_canvas(agents, model_class=ScriptedModel)
+    model = canvas.renderer.model
+    figure = canvas.renderer.figures[0]
+
+    # remove an agent from the middle while the agent in the last row changes its type
+    agent_list = list(model.agents)
+    model.to_remove = [agent_list[3]]
+    model.to_recolor = [agent_list[-1]]
+    canvas.renderer.default_buttons.step_button.on_click(None)
+
+    remaining = agents.entity_list
+    assert len(remaining) == len(agents.sprite_list) == 9
+    assert set(remaining) == set(model.agents)
+    # the last agent has been moved into the gap
+    assert remaining[3] is agent_list[-1]
+
+    xy = np.array([agent.cell.coordinate for agent in remaining], dtype=np.float64)
+    expected_positions = np.column_stack(
+        (
+            xy[:, 0] * figure.cell_width + figure.x + figure.cell_width / 2,
+            xy[:, 1] * figure.cell_height + figure.y + figure.cell_height / 2,
+        )
+    )
+    expected_colors = np.array([agents.colormap(agent.type) for agent in remaining])
+    np.testing.assert_allclose(agents.sprite_list.positions[:9], expected_positions, rtol=1e-6)
+    np.testing.assert_array_equal(agents.sprite_list.colors[:9], expected_colors)
+
+    canvas.window.close()
+
+
+def test_raster_backend():
+    sugar = mesar.CellArtists(
+        color_attribute="sugar",
+        color_map="Greens",
+        color_vmin=0,
+        color_vmax=4,
+        filter_entities=lambda cell: cell.sugar > 0,
+        backend="raster",
+    )
+    space = mesar.GridSpacePlot(artists=[sugar])
+    canvas = mesar.Canvas(
+        model_class=SugarscapeG1mt,
+        plots=[space],
+        _visible=False,
+    )
+    canvas._setup()
+    canvas.renderer.play = True
+
+    grid = canvas.renderer.model.grid
+    assert sugar.sprite_list.image.shape == (grid.height, grid.width, 4)
+
+    for _ in range(10):
+        canvas.renderer.on_update(1 / 40)
+        canvas.renderer.on_draw()
+
+    # row y of the texture holds the cells with the y coordinate y
+    pixels = np.frombuffer(sugar.sprite_list.texture.read(), dtype=np.uint8)
+    pixels = pixels.reshape(grid.height, grid.width, 4)
+    for cell in grid.all_cells:
+        x, y = cell.coordinate
+        if cell.sugar > 0:
+            assert tuple(pixels[y, x]) == sugar.colormap(cell.sugar)
+        else:
+            assert tuple(pixels[y, x]) == (0, 0, 0, 0)
+
+    canvas.window.close()
+
+
+def test_static_raster_is_not_recomputed():
+    sugar = mesar.CellArtists(
+        color_attribute="sugar",
+        color_map="Greens",
+        color_vmin=0,
+        color_vmax=4,
+        dynamic_color=False,
+        backend="raster",
+    )
+    space = mesar.GridSpacePlot(artists=[sugar])
+    canvas = mesar.Canvas(
+        model_class=SugarscapeG1mt,
+        plots=[space],
+        _visible=False,
+    )
+    canvas._setup()
+    image = sugar.sprite_list.image.copy()
+
+    # the sugar changes, but neither the colors nor the filter are dynamic
+    for cell in canvas.renderer.model.grid.all_cells:
+        cell.sugar = 0
+    canvas.renderer.update_figures()
+    np.testing.assert_array_equal(sugar.sprite_list.image, image)
+
+    canvas.window.close()
+
+
+class RewiringModel(mesa.Model):
+    """A ring network whose edges are rewired when told to."""
+
+    def __init__(self, seed=None):
+        super().__init__(seed=seed)
+        self.grid = Network(nx.cycle_graph(10), random=self.random)
+        self.rewire = False
+
+    def step(self):
+        if self.rewire:
+            # an edge swap keeps the number of nodes and edges
+            self.grid.G.remove_edge(0, 1)
+            self.grid.G.add_edge(0, 5)
+            self.rewire = False
+
+
+def test_rewired_edges_are_rebuilt():
+    nodes = mesar.NetworkCellArtists(dynamic_graph=True)
+    space = mesar.NetworkPlot(artists=[nodes])
+    canvas = mesar.Canvas(model_class=RewiringModel, plots=[space], _visible=False)
+    canvas._setup()
+    model = canvas.renderer.model
+    step_button = canvas.renderer.default_buttons.step_button
+
+    # an unchanged graph keeps its edges
+    edge_nodes = nodes.edge_nodes
+    step_button.on_click(None)
+    assert nodes.edge_nodes is edge_nodes
+    assert len(nodes.edge_batch.vertices) == 6 * 10
+
+    model.rewire = True
+    step_button.on_click(None)
+    assert nodes.edge_nodes is not edge_nodes
+    assert nodes.graph_fingerprint == nodes.get_graph_fingerprint()
+    assert {0, 5} in [{nodes.nodes[i] for i in edge} for edge in nodes.edge_nodes]
+
+    canvas.window.close()
+
+
+def test_static_graph_is_not_compared():
+    nodes = mesar.NetworkCellArtists()
+    space = mesar.NetworkPlot(artists=[nodes])
+    canvas = mesar.Canvas(model_class=RewiringModel, plots=[space], _visible=False)
+    canvas._setup()
+
+    # the edges of a static graph are built once
+    edge_nodes = nodes.edge_nodes
+    canvas.renderer.model.rewire = True
+    canvas.renderer.default_buttons.step_button.on_click(None)
+    assert nodes.edge_nodes is edge_nodes
+
+    canvas.window.close()
+
+
+def test_background_layout_is_applied_outside_draw():
+    nodes = mesar.NetworkCellArtists(background_layout=True)
+    space = mesar.NetworkPlot(artists=[nodes])
+    canvas = mesar.Canvas(model_class=RewiringModel, plots=[space], _visible=False)
+    canvas._setup()
+
+    # the layout progresses while the simulation is paused
+    deadline = time.perf_counter() + 60
+    while nodes.layout_job is not None and time.perf_counter() < deadline:
+        canvas.renderer.on_update(1 / 40)
+        time.sleep(0.05)
+    assert nodes.layout_job is None
+
+    positions = {cell: cell._MESARCADE_NETWORK_POSITION for cell in canvas.renderer.model.grid}
+    canvas.renderer.on_draw()
+    assert all(cell._MESARCADE_NETWORK_POSITION is positions[cell] for cell in positions)
+
+    canvas.window.close()
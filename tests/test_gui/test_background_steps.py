@@ -0,0 +1,130 @@
+import threading
+import time
+
+import mesa
+from mesa.examples.basic.schelling.model import Schelling
+import mesarcade as mesar
+
+
+def test_model_is_stepped_in_background():
+    plot = mesar.ModelHistoryPlot(model_attributes=["happy"])
+    density = mesar.NumController("density", 0.8, 0.1, 0.9, 0.1)
+    canvas = mesar.Canvas(
+        model_class=Schelling,
+        plots=[plot],
+        controllers=[density],
+        step_in_background=True,
+        _visible=False,
+    )
+    canvas._setup()
+    renderer = canvas.renderer
+    renderer.play = True
+
+    deadline = time.perf_counter() + 30
+    while renderer.rendered_tick < 10 and time.perf_counter() < deadline:
+        renderer.on_update(1 / 40)
+        renderer.on_draw()
+        time.sleep(0.01)
+    assert renderer.rendered_tick >= 10
+
+    # the history is complete although the figures skipped ticks
+    ticks = plot.get_history()["happy"][:, 0]
+    assert list(ticks[:10]) == list(range(1, 11))
+
+    # a reset is queued and applied between two steps
+    renderer.play = False
+    renderer.default_buttons.reset_button.on_click(None)
+    deadline = time.perf_counter() + 30
+    while renderer.model_actions and time.perf_counter() < deadline:
+        renderer.on_update(1 / 40)
+        time.sleep(0.01)
+    assert renderer.tick == 0
+
+    renderer.on_hide_view()
+    canvas.window.close()
+
+
+class SlowModel(mesa.Model):
+    def __init__(self, speed=1, seed=None):
+        super().__init__(seed=seed)
+        self.speed = speed
+        self.value = 0
+
+    def step(self):
+        time.sleep(0.2)
+        self.value += self.speed
+
+
+def test_main_thread_does_not_wait_for_steps():
+    speed = mesar.NumController("speed", 1, 1, 10, 1)
+    value = mesar.ValueDisplay("value")
+    canvas = mesar.Canvas(
+        model_class=SlowModel,
+        controllers=[speed],
+        value_displays=[value],
+        step_in_background=True,
+        _visible=False,
+    )
+    canvas._setup()
+    renderer = canvas.renderer
+    renderer.play = True
+
+    # wait until the worker is inside a step
+    deadline = time.perf_counter() + 30
+    while renderer.rendered_tick < 1 and time.perf_counter() < deadline:
+        renderer.on_update(1 / 40)
+        time.sleep(0.01)
+
+    # neither the controller nor the play button wait for the running step
+    start = time.perf_counter()
+    speed.buttons.increase_button.on_click(None)
+    renderer.default_buttons.play_button.on_click(None)
+    renderer.on_update(1 / 40)
+    renderer.on_draw()
+    assert time.perf_counter() - start < 0.1
+
+    # the change is applied between two steps
+    deadline = time.perf_counter() + 30
+    while renderer.model_actions and time.perf_counter() < deadline:
+        renderer.on_update(1 / 40)
+        time.sleep(0.01)
+    assert renderer.model.speed == 2
+
+    renderer.on_hide_view()
+    canvas.window.close()
+
+
+def test_handshake_does_not_keep_a_stale_answer():
+    canvas = mesar.Canvas(model_class=SlowModel, step_in_background=True, _visible=False)
+    canvas._setup()
+    renderer = canvas.renderer
+
+    # the lock is held by another thread, as if the worker was inside a step
+    held = threading.Event()
+    release = threading.Event()
+
+    def hold_lock():
+        with renderer.model_lock:
+            held.set()
+            release.wait()
+
+    thread = threading.Thread(target=hold_lock)
+    thread.start()
+    held.wait()
+
+    # an answer of an earlier handshake that the worker never waited for
+    renderer.update_done.set()
+    renderer.model_actions.append(lambda: None)
+    renderer.update_from_background()
+    assert renderer.update_requested.is_set()
+    assert not renderer.update_done.is_set()
+
+    release.set()
+    thread.join()
+    renderer.update_from_background()
+    assert not renderer.model_actions
+    assert not renderer.update_requested.is_set()
+    assert renderer.update_done.is_set()
+
+    renderer.on_hide_view()
+    canvas.window.close()
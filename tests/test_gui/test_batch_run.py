@@ -0,0 +1,115 @@
+import numpy as np
+from mesa.examples.basic.schelling.model import Schelling
+import mesarcade as mesar
+from mesarcade.__main__ import main
+
+
+def test_canvas_run():
+    plot = mesar.ModelHistoryPlot(model_attributes=["happy"])
+    density = mesar.NumController("density", 0.8, 0.1, 0.9, 0.1)
+    canvas = mesar.Canvas(
+        model_class=Schelling,
+        plots=[plot],
+        controllers=[density],
+        _visible=False,
+    )
+
+    model = canvas.run(steps=20, render_every=5, params={"density": 0.5})
+
+    assert canvas.renderer.tick == 20
+    assert canvas.renderer.parameter_dict["density"] == 0.5
+    assert model is canvas.renderer.model
+    assert len(plot.get_history()["happy"]) == 20
+
+    canvas.window.close()
+
+
+class CountingSchelling(Schelling):
+    num_instances = 0
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        CountingSchelling.num_instances += 1
+
+
+def test_canvas_run_creates_one_model_and_no_worker():
+    plot = mesar.ModelHistoryPlot(model_attributes=["happy"])
+    canvas = mesar.Canvas(
+        model_class=CountingSchelling,
+        plots=[plot],
+        step_in_background=True,
+        _visible=False,
+    )
+
+    CountingSchelling.num_instances = 0
+    model = canvas.run(steps=5)
+
+    assert CountingSchelling.num_instances == 1
+    assert model is canvas.renderer.model
+    # the batch loop steps the model itself
+    assert canvas.renderer.worker is None
+    assert canvas.renderer.tick == 5
+
+    canvas.window.close()
+
+
+def test_repeated_runs_keep_the_controllers():
+    density = mesar.NumController("density", 0.8, 0.1, 0.9, 0.1)
+    canvas = mesar.Canvas(model_class=Schelling, controllers=[density], _visible=False)
+
+    canvas.run(steps=2)
+    canvas.run(steps=2, params={"density": 0.5})
+
+    names = [controller.parameter_name for controller in canvas.renderer.controllers]
+    assert names == ["density", "target_fps", "rendering_step"]
+    assert canvas.renderer.model.density == 0.5
+
+    canvas.window.close()
+
+
+def test_cli(tmp_path):
+    script = tmp_path / "script.py"
+    script.write_text(
+        "import mesarcade as mesar\n"
+        "from mesa.examples.basic.schelling.model import Schelling\n"
+        "plot = mesar.ModelHistoryPlot(model_attributes=['happy'])\n"
+        "canvas = mesar.Canvas(model_class=Schelling, plots=[plot])\n"
+        "canvas.show()\n"
+    )
+
+    main(["run", str(script), "--steps", "10", "--export-dir", str(tmp_path / "out")])
+
+    history = np.load(tmp_path / "out" / "canvas_0_plot_0.npz")
+    assert history["happy"].shape == (10, 2)
+
+
+def test_recorder(tmp_path):
+    recorder = mesar.FrameRecorder(tmp_path / "frames", every=2)
+    plot = mesar.ModelHistoryPlot(model_attributes=["happy"])
+    canvas = mesar.Canvas(model_class=Schelling, plots=[plot], recorder=recorder, _visible=False)
+
+    canvas.run(steps=8, render_every=1)
+
+    assert len(list((tmp_path / "frames").iterdir())) == 4
+
+    canvas.window.close()
+
+
+def test_profiler():
+    agents = mesar.CellAgentArtists(color_attribute="type", color_map={0: "red", 1: "blue"})
+    plot = mesar.GridSpacePlot(artists=[agents])
+    canvas = mesar.Canvas(model_class=Schelling, plots=[plot], profile=True, _visible=False)
+
+    canvas.run(steps=4, render_every=2)
+
+    timings = canvas.get_timings()
+    for name in [
+        "model.step",
+        "GridSpacePlot 1.update",
+        "GridSpacePlot 1 CellAgentArtists 1.draw",
+        "value displays.update",
+        "ui manager.draw",
+    ]:
+        assert timings[name]["mean"] >= 0
+
+    canvas.window.close()
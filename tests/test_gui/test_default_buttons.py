@@ -68,3 +68,18 @@ def test_step_button():
     assert canvas.renderer.tick == 15
 
     canvas.window.close()
+
+
+def test_adaptive_steps():
+    canvas = mesar.Canvas(model_class=Schelling, adaptive_steps=True, _visible=False)
+    canvas._setup()
+    canvas.renderer.play = True
+
+    for _ in range(5):
+        canvas.renderer.on_update(1 / 40)
+        canvas.renderer.on_draw()
+
+    assert canvas.renderer.tick >= 5
+    assert canvas.renderer.governor.step_time is not None
+
+    canvas.window.close()
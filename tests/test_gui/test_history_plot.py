@@ -0,0 +1,109 @@
+import numpy as np
+from mesa.examples.basic.schelling.model import Schelling
+import mesarcade as mesar
+
+
+def test_history_is_sampled_every_tick():
+    plot = mesar.ModelHistoryPlot(model_attributes=["happy"], rendering_step=4)
+    canvas = mesar.Canvas(
+        model_class=Schelling,
+        plots=[plot],
+        rendering_step=5,
+        _visible=False,
+    )
+    canvas._setup()
+    canvas.renderer.play = True
+
+    for _ in range(12):
+        canvas.renderer.on_update(1 / 40)
+        canvas.renderer.on_draw()
+
+    ticks = plot.get_history()["happy"][:, 0]
+    assert list(ticks) == list(range(1, 13))
+
+    canvas.window.close()
+
+
+def test_many_lines():
+    plot = mesar.ModelHistoryPlot(
+        model_attributes=[lambda model, i=i: model.happy + i for i in range(20)],
+    )
+    canvas = mesar.Canvas(model_class=Schelling, plots=[plot], _visible=False)
+    canvas._setup()
+    canvas.renderer.play = True
+
+    for _ in range(3):
+        canvas.renderer.on_update(1 / 40)
+        canvas.renderer.on_draw()
+
+    assert len(set(plot.components[0].colors)) == 20
+    assert len(plot.get_history()) == 20
+
+    canvas.window.close()
+
+
+def test_previous_runs_are_kept_after_reset():
+    plot = mesar.ModelHistoryPlot(model_attributes=["happy"], keep_runs=2)
+    canvas = mesar.Canvas(model_class=Schelling, plots=[plot], _visible=False)
+    canvas._setup()
+    history_plot = plot.components[0]
+
+    for _ in range(3):
+        canvas.renderer.play = True
+        for _ in range(5):
+            canvas.renderer.on_update(1 / 40)
+            canvas.renderer.on_draw()
+        canvas.renderer.default_buttons.reset_button.on_click(None)
+
+    assert len(history_plot.previous_runs) == 2
+    assert history_plot.previous_lines.num_series == 2
+    canvas.renderer.on_draw()
+
+    canvas.window.close()
+
+
+def test_history_dir_is_shared_by_plots(tmp_path):
+    plot_1 = mesar.ModelHistoryPlot(model_attributes=["happy"], history_dir=tmp_path)
+    plot_2 = mesar.ModelHistoryPlot(
+        model_attributes=[lambda model: -model.happy], history_dir=tmp_path
+    )
+    canvas = mesar.Canvas(model_class=Schelling, plots=[plot_1, plot_2], _visible=False)
+    canvas._setup()
+    canvas.renderer.play = True
+
+    for _ in range(5):
+        canvas.renderer.on_update(1 / 40)
+
+    happy = plot_1.get_history()["happy"]
+    unhappy = plot_2.get_history()["series_0"]
+    np.testing.assert_array_equal(happy[:, 1], -unhappy[:, 1])
+    assert (tmp_path / "plot_1" / "series_0" / "data.f64").exists()
+    assert (tmp_path / "plot_2" / "series_0" / "data.f64").exists()
+
+    # the history of a run stays valid after the files are reused by a reset
+    canvas.renderer.default_buttons.reset_button.on_click(None)
+    assert len(happy) == 5
+    assert len(plot_1.get_history()["happy"]) == 0
+
+    canvas.window.close()
+
+
+def test_export_memory_mapped_history(tmp_path):
+    plot = mesar.ModelHistoryPlot(model_attributes=["happy"], history_dir=tmp_path / "history")
+    canvas = mesar.Canvas(model_class=Schelling, plots=[plot], _visible=False)
+    canvas._setup()
+    canvas.renderer.play = True
+
+    for _ in range(5):
+        canvas.renderer.on_update(1 / 40)
+
+    # the export reads the memory-mapped file instead of a copy
+    history_plot = plot.components[0]
+    assert isinstance(history_plot.get_history(copy=False)["happy"], np.memmap)
+    plot.export_history(tmp_path / "history.npz")
+
+    exported = np.load(tmp_path / "history.npz")["happy"]
+    np.testing.assert_array_equal(exported, plot.get_history()["happy"])
+    assert exported.shape == (5, 2)
+
+    canvas.window.close()
@@ -1,4 +1,5 @@
 from mesa.examples.basic.boid_flockers.model import BoidFlockers
+from mesa.examples.basic.schelling.model import Schelling
 import mesarcade as mesar
 from dataclasses import dataclass
 
@@ -93,3 +94,26 @@ def test_increase_and_reset():
     assert len(canvas.renderer.model.agents) == 125
 
     canvas.window.close()
+
+
+def test_value_display_follows_controller_while_paused():
+    density = mesar.NumController("density", 0.5, 0.1, 0.9, 0.1)
+    display = mesar.ValueDisplay("density")
+    canvas = mesar.Canvas(
+        model_class=Schelling,
+        controllers=[density],
+        value_displays=[display],
+        _visible=False,
+    )
+    canvas._setup()
+
+    canvas.renderer.update_value_displays(force_update=True)
+    assert display.current_value == "0.5"
+
+    # the model is changed without a step, so the tick stays the same
+    density.buttons.increase_button.on_click(None)
+    canvas.renderer.update_value_displays(force_update=True)
+    assert canvas.renderer.tick == 0
+    assert display.current_value == "0.6"
+
+    canvas.window.close()
@@ -0,0 +1,104 @@
+import time
+
+import networkx as nx
+import numpy as np
+import pytest
+
+from mesarcade import layout
+
+num_layout_calls = 0
+
+
+def counting_layout(graph):
+    global num_layout_calls
+    num_layout_calls += 1
+    return nx.circular_layout(graph)
+
+
+def test_layout_is_shared():
+    global num_layout_calls
+    num_layout_calls = 0
+    graph = nx.path_graph(20)
+
+    positions_1 = layout.get_layout(graph, counting_layout)
+    positions_2 = layout.get_layout(graph, counting_layout)
+
+    assert num_layout_calls == 1
+    assert np.allclose(positions_1[3], positions_2[3])
+
+    # the returned positions are copies that can be modified safely
+    positions_1[3] /= 2
+    assert np.allclose(layout.get_layout(graph, counting_layout)[3], positions_2[3])
+
+
+def test_layout_is_persisted(tmp_path):
+    global num_layout_calls
+    num_layout_calls = 0
+    graph = nx.cycle_graph(30)
+
+    positions_1 = layout.get_layout(graph, counting_layout, cache_dir=tmp_path)
+    layout._layout_cache.clear()
+    positions_2 = layout.get_layout(graph, counting_layout, cache_dir=tmp_path)
+
+    assert num_layout_calls == 1
+    assert len(list(tmp_path.iterdir())) == 1
+    assert np.allclose(positions_1[7], positions_2[7])
+
+
+def test_background_layout_job():
+    layout._layout_cache.clear()
+    graph = nx.path_graph(50)
+
+    job = layout.start_layout_job(graph, nx.spring_layout)
+    assert job is not None
+    assert layout.start_layout_job(graph, nx.spring_layout) is job
+
+    # the initial placement is available right away
+    assert len(job.get_positions()) == 50
+
+    deadline = time.time() + 60
+    while not job.done and time.time() < deadline:
+        job.poll()
+        time.sleep(0.01)
+
+    assert job.done
+    assert job.version >= 1
+
+    # the converged layout is cached
+    assert layout.start_layout_job(graph, nx.spring_layout) is None
+
+
+def test_force_layout():
+    graph = nx.barbell_graph(20, 5)
+
+    positions = layout.force_layout(graph, seed=1)
+
+    assert set(positions) == set(graph.nodes())
+    array = np.array(list(positions.values()))
+    assert np.isfinite(array).all()
+    assert np.abs(array).max() <= 1 + 1e-9
+
+    # the two bells end up on different sides
+    bell_1 = array[:20].mean(axis=0)
+    bell_2 = array[-20:].mean(axis=0)
+    assert np.linalg.norm(bell_1 - bell_2) > 0.5
+
+
+def test_force_layout_updates_keep_cooling():
+    graph = nx.barbell_graph(20, 5)
+
+    updates = list(layout._iterate_force_layout(graph, seed=1, iterations_per_update=5))
+
+    # 50 iterations in updates of 5 iterations
+    assert len(updates) == 10
+    final_positions = layout.force_layout(graph, seed=1)
+    for node in graph.nodes():
+        assert np.allclose(updates[-1][node], final_positions[node])
+
+
+def test_background_layout_requires_picklable_layout():
+    layout._layout_cache.clear()
+    graph = nx.path_graph(10)
+
+    with pytest.raises(ValueError, match="pickled"):
+        layout.start_layout_job(graph, lambda graph: nx.circular_layout(graph))
@@ -0,0 +1,38 @@
+from types import SimpleNamespace
+
+from mesarcade.metrics import MetricSampler
+
+
+def test_metrics_are_evaluated_once_per_model_state():
+    calls = []
+
+    def expensive_metric(model):
+        calls.append(model.tick)
+        return model.tick * 2
+
+    model = SimpleNamespace(tick=0, nested=SimpleNamespace(value=5))
+    renderer = SimpleNamespace(tick=0, model=model)
+    metrics = MetricSampler(renderer=renderer)
+
+    assert metrics.get(expensive_metric) == 0
+    assert metrics.get(expensive_metric) == 0
+    assert metrics.get("nested.value") == 5
+    assert calls == [0]
+
+    # the values are kept until the model has changed
+    model.tick = 1
+    assert metrics.get(expensive_metric) == 0
+    metrics.clear()
+    assert metrics.get(expensive_metric) == 2
+    assert calls == [0, 1]
+
+
+def test_changed_attribute_without_step():
+    model = SimpleNamespace(nested=SimpleNamespace(value=5))
+    metrics = MetricSampler(renderer=SimpleNamespace(tick=0, model=model))
+    assert metrics.get("nested.value") == 5
+
+    # e.g. a controller changes the model while the tick stays the same
+    model.nested.value = 6
+    metrics.clear()
+    assert metrics.get("nested.value") == 6
@@ -0,0 +1,97 @@
+import copy
+import pickle
+
+import mesa
+
+from mesarcade.population import PopulationTracker
+
+
+class CountingModel(mesa.Model):
+    """Model that overrides the methods wrapped by the tracker."""
+
+    def __init__(self, seed=None):
+        super().__init__(seed=seed)
+        self.num_registered = 0
+        self.num_deregistered = 0
+
+    def register_agent(self, agent):
+        super().register_agent(agent)
+        self.num_registered += 1
+
+    def deregister_agent(self, agent):
+        super().deregister_agent(agent)
+        self.num_deregistered += 1
+
+
+def test_tracker_calls_overrides_of_subclass():
+    model = CountingModel()
+    old_agent = mesa.Agent(model)
+
+    tracker = PopulationTracker(model)
+    changes = tracker.subscribe()
+
+    new_agent = mesa.Agent(model)
+    old_agent.remove()
+
+    # the overrides still run and the model stays consistent
+    assert model.num_registered == 2
+    assert model.num_deregistered == 1
+    assert list(model.agents) == [new_agent]
+
+    assert changes.pop() == ([new_agent], [old_agent])
+    assert not changes
+
+
+def test_added_and_removed_agent_is_no_change():
+    model = mesa.Model()
+    changes = PopulationTracker(model).subscribe()
+
+    agent = mesa.Agent(model)
+    agent.remove()
+
+    assert not changes
+    assert changes.pop() == ([], [])
+
+
+def test_tracked_populations():
+    model = CountingModel()
+    mesa.Agent(model)
+    tracker = PopulationTracker(model)
+
+    assert tracker.tracks(model.agents)
+    assert tracker.tracks(model.agents_by_type[mesa.Agent])
+    # a user-held agent set is changed with add() and discard(), not by registration
+    assert not tracker.tracks(mesa.agent.AgentSet(list(model.agents), random=model.random))
+    assert not tracker.tracks(list(model.agents))
+
+
+def test_tracked_model_can_be_copied():
+    model = CountingModel()
+    mesa.Agent(model)
+    tracker = PopulationTracker(model)
+    changes = tracker.subscribe()
+
+    copied_model = pickle.loads(pickle.dumps(model))
+    deep_copied_model = copy.deepcopy(model)
+    assert len(copied_model.agents) == len(deep_copied_model.agents) == 1
+
+    # the copies track their own agents
+    mesa.Agent(copied_model)
+    assert len(copied_model.agents) == 2
+    assert copied_model.num_registered == 2
+    assert not changes
+
+
+def test_detach_restores_the_model():
+    model = CountingModel()
+    tracker = PopulationTracker(model)
+    changes = tracker.subscribe()
+
+    tracker.detach()
+    agent = mesa.Agent(model)
+
+    assert "register_agent" not in vars(model)
+    assert "deregister_agent" not in vars(model)
+    assert model.num_registered == 1
+    assert list(model.agents) == [agent]
+    assert not changes
@@ -0,0 +1,51 @@
+import threading
+
+from mesarcade.profiler import Profiler
+
+
+def test_rolling_timings():
+    profiler = Profiler(enabled=True, window=3)
+    for duration in [0.004, 0.001, 0.002, 0.003]:
+        profiler.record("model.step", duration)
+
+    timings = profiler.get_timings()["model.step"]
+    # only the last 3 durations are kept
+    assert round(timings["mean"], 6) == 2.0
+    assert round(timings["max"], 6) == 3.0
+    assert round(timings["last"], 6) == 3.0
+
+
+def test_disabled_profiler_measures_nothing():
+    profiler = Profiler()
+    with profiler.measure("model.step"):
+        pass
+    assert profiler.get_timings() == {}
+
+    profiler.enabled = True
+    with profiler.measure("model.step"):
+        pass
+    assert list(profiler.get_timings()) == ["model.step"]
+    assert "model.step" in profiler.format_timings()
+
+
+def test_timings_are_read_while_recorded():
+    profiler = Profiler(enabled=True, window=10)
+    stop = threading.Event()
+
+    def record_new_components():
+        i = 0
+        while not stop.is_set() or i < 500:
+            profiler.record(f"component {i % 500}.update", 0.001)
+            i += 1
+
+    thread = threading.Thread(target=record_new_components)
+    thread.start()
+    try:
+        # the dict and the deques grow while they are read
+        for _ in range(200):
+            profiler.format_timings()
+    finally:
+        stop.set()
+        thread.join()
+
+    assert len(profiler.get_timings()) == 500
@@ -0,0 +1,47 @@
+import queue
+
+import numpy as np
+from PIL import Image
+
+from mesarcade.recorder import _write_frames
+
+
+def get_frames(num_frames, width, height):
+    frames = queue.Queue()
+    for i in range(num_frames):
+        frame = np.zeros((height, width, 4), dtype=np.uint8)
+        # the bottom row is white, as frames are read bottom row first
+        frame[0] = 255
+        frame[:, :, 3] = 255
+        frames.put(frame.tobytes())
+    frames.put(None)
+    return frames
+
+
+def test_png_sequence(tmp_path):
+    _write_frames(get_frames(3, 4, 2), tmp_path / "frames", "png", 4, 2, 30)
+
+    files = sorted(path.name for path in (tmp_path / "frames").iterdir())
+    assert files == ["frame_000000.png", "frame_000001.png", "frame_000002.png"]
+
+    image = np.asarray(Image.open(tmp_path / "frames" / files[0]))
+    assert image.shape == (2, 4, 4)
+    assert (image[1, :, :3] == 255).all()
+    assert (image[0, :, :3] == 0).all()
+
+
+def test_y4m_video(tmp_path):
+    path = tmp_path / "video.y4m"
+    _write_frames(get_frames(2, 4, 2), path, "y4m", 4, 2, 25)
+
+    data = path.read_bytes()
+    header = b"YUV4MPEG2 W4 H2 F25:1 Ip A1:1 C444\n"
+    assert data.startswith(header)
+
+    frame_size = len(b"FRAME\n") + 3 * 4 * 2
+    assert len(data) == len(header) + 2 * frame_size
+
+    luma = np.frombuffer(data[len(header) + 6 : len(header) + 6 + 8], dtype=np.uint8)
+    # white is 235 and black is 16 in limited range
+    assert (luma[:4] == 16).all()
+    assert (luma[4:] == 235).all()
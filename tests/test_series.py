@@ -0,0 +1,91 @@
+import numpy as np
+
+from mesarcade.series import DecimatedSeries, SeriesBuffer, WindowedSeries
+
+
+def test_series_buffer_grows():
+    buffer = SeriesBuffer(capacity=2)
+    for x in range(5):
+        buffer.append(x, 2 * x)
+    buffer.extend(np.array([[5, 10], [6, 12]]))
+
+    assert len(buffer) == 7
+    assert buffer.values.shape == (7, 2)
+    np.testing.assert_array_equal(buffer.values[:, 1], 2 * np.arange(7))
+
+
+def test_decimated_series_keeps_extremes():
+    rng = np.random.default_rng(0)
+    y = rng.normal(size=10_001)
+    series = DecimatedSeries()
+    for x, value in enumerate(y):
+        series.append(x, value)
+
+    view = series.get_view(max_points=200)
+
+    assert len(view) <= 200 + 2 * len(series.levels) + 3
+    assert np.all(np.diff(view[:, 0]) > 0)
+    assert view[:, 1].max() == y.max()
+    assert view[:, 1].min() == y.min()
+    # the last point is always part of the view
+    assert view[-1, 0] == 10_000
+
+    # short series are not decimated
+    np.testing.assert_array_equal(series.get_view(max_points=20_000), series.values)
+
+
+def test_memory_mapped_series(tmp_path):
+    series = DecimatedSeries(directory=tmp_path / "series")
+    for x in range(5000):
+        series.append(x, np.sin(x))
+    series.data.flush()
+
+    raw = np.fromfile(tmp_path / "series" / "data.f64").reshape(-1, 2)
+    np.testing.assert_array_equal(raw[:5000], series.values)
+    assert (tmp_path / "series" / "level_0.f64").exists()
+    assert len(series.get_view(max_points=100)) < 150
+
+
+def test_memory_mapped_buffer_grows_and_closes(tmp_path):
+    path = tmp_path / "data.f64"
+    buffer = SeriesBuffer(capacity=2, path=path)
+    for x in range(5):
+        buffer.append(x, 2 * x)
+    values = np.array(buffer.values)
+    buffer.close()
+
+    # the file can be reused by a new buffer while the copy stays valid
+    new_buffer = SeriesBuffer(capacity=2, path=path)
+    new_buffer.append(0, -1)
+    np.testing.assert_array_equal(values[:, 1], 2 * np.arange(5))
+    np.testing.assert_array_equal(new_buffer.values, [[0, -1]])
+
+
+def test_windowed_series():
+    series = WindowedSeries(window=1000)
+    for x in range(2500):
+        series.append(x, x % 7)
+
+    assert len(series) == 1000
+    np.testing.assert_array_equal(series.values[:, 0], np.arange(1500, 2500))
+
+    view = series.get_view(max_points=100)
+    assert len(view) <= 100
+    assert series.first_x == 1500
+    assert view[0, 0] >= 1500
+    assert view[-1, 0] <= 2499
+    assert view[:, 1].min() == 0
+    assert view[:, 1].max() == 6
+    assert np.all(np.diff(view[:, 0]) >= 0)
+
+
+def test_windowed_series_with_few_points():
+    series = WindowedSeries(window=100)
+    for x in range(250):
+        series.append(x, x % 7)
+
+    # the smallest number of points the history plot asks for
+    view = series.get_view(max_points=4)
+    assert 0 < len(view) <= 8
+    assert view[:, 1].min() == 0
+    assert view[:, 1].max() == 6
@@ -0,0 +1,37 @@
+import numpy as np
+from mesa.examples.advanced.sugarscape_g1mt.model import SugarscapeG1mt
+
+from mesarcade.utils import get_attribute_array
+
+
+def test_get_attribute_array_of_agents():
+    model = SugarscapeG1mt(seed=1)
+    agents = list(model.agents)
+
+    np.testing.assert_array_equal(
+        get_attribute_array(model.agents, "sugar"),
+        np.array([agent.sugar for agent in agents]),
+    )
+    # nested attributes
+    np.testing.assert_array_equal(
+        get_attribute_array(model.agents, "cell.coordinate"),
+        np.array([agent.cell.coordinate for agent in agents]),
+    )
+    np.testing.assert_array_equal(
+        get_attribute_array(model.agents, "cell.sugar"),
+        np.array([agent.cell.sugar for agent in agents]),
+    )
+
+
+def test_get_attribute_array_of_cells():
+    model = SugarscapeG1mt(seed=1)
+    cells = list(model.grid.all_cells)
+
+    np.testing.assert_array_equal(
+        get_attribute_array(model.grid.all_cells, "sugar"),
+        np.array([cell.sugar for cell in cells]),
+    )
+    np.testing.assert_array_equal(
+        get_attribute_array(model.grid.all_cells, lambda cell: len(cell.agents)),
+        np.array([len(cell.agents) for cell in cells]),
+    )